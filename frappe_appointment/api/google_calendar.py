@@ -0,0 +1,33 @@
+import frappe
+
+from frappe_appointment.frappe_appointment.doctype.google_calendar_mirror.google_calendar_mirror import (
+    handle_push_notification,
+)
+from frappe_appointment.helpers.circuit_breaker import get_circuit_summary
+
+
+@frappe.whitelist(allow_guest=True, methods=["POST"])
+def receive_push_notification():
+    """Receive the change notifications Google sends on the watch channels of the calendars.
+
+    Google only expects a 2xx response, the notification itself is carried in the X-Goog-* headers.
+    """
+    handle_push_notification(dict(frappe.request.headers))
+
+
+@frappe.whitelist()
+def get_calendar_circuit_states(google_calendars: str | list) -> dict:
+    """Get the circuit breaker state of Google Calendars, so the forms can show which calendars are skipped.
+
+    Args:
+    google_calendars (str | list): Google Calendar names, JSON encoded when called from the client
+
+    Returns:
+    dict: Google Calendar name -> state, failures, last_error and retry_in, see get_circuit_summary
+    """
+    google_calendars = frappe.parse_json(google_calendars) or []
+
+    for google_calendar in google_calendars:
+        frappe.has_permission("Google Calendar", "read", google_calendar, throw=True)
+
+    return {google_calendar: get_circuit_summary(google_calendar) for google_calendar in google_calendars}
@@ -5,12 +5,13 @@ import frappe.utils
 from frappe import _
 
 from frappe_appointment.frappe_appointment.doctype.appointment_group.appointment_group import _get_time_slots_for_day
-from frappe_appointment.helpers.overrides import add_response_code
+from frappe_appointment.helpers.overrides import add_response_code, with_request_deadline
 from frappe_appointment.overrides.event_override import APPOINTMENT_GROUP, _create_event_for_appointment_group
 
 
 @frappe.whitelist(allow_guest=True)
 @add_response_code
+@with_request_deadline("group_time_slots_deadline")
 def get_time_slots(appointment_group_id: str, date: str, user_timezone_offset: str, **args):
     if not appointment_group_id:
         frappe.throw(_("Appointment Group ID is required"))
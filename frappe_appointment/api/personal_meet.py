@@ -5,8 +5,11 @@ import frappe
 import frappe.utils
 import pytz
 
-from frappe_appointment.frappe_appointment.doctype.appointment_group.appointment_group import _get_time_slots_for_day
-from frappe_appointment.helpers.overrides import add_response_code
+from frappe_appointment.frappe_appointment.doctype.appointment_group.appointment_group import (
+    _get_time_slots_for_day,
+    get_time_slots_for_date_range,
+)
+from frappe_appointment.helpers.overrides import add_response_code, with_request_deadline
 from frappe_appointment.helpers.utils import duration_to_string
 from frappe_appointment.overrides.event_override import _create_event_for_appointment_group
 
@@ -77,6 +80,7 @@ def get_meeting_windows(slug):
 
 @frappe.whitelist(allow_guest=True)
 @add_response_code
+@with_request_deadline("personal_time_slots_deadline")
 def get_time_slots(
     duration_id: str, date: str = None, user_timezone_offset: str = None, start_date: str = None, end_date: str = None
 ):
@@ -104,43 +108,7 @@ def get_time_slots(
     if date:
         data = _get_time_slots_for_day(appointment_group, date, user_timezone_offset)
     else:
-        data = {
-            "all_available_slots_for_data": [],
-            "dates": [],
-            "duration": None,
-            "starttime": None,
-            "endtime": None,
-            "total_slots": 0,
-            "available_days": [],
-        }
-
-        date = start_date
-        cache_dict = {}
-        while True:
-            datetime = frappe.utils.get_datetime(date)
-            enddatetime = frappe.utils.get_datetime(end_date)
-            if datetime > enddatetime:
-                break
-            _data = _get_time_slots_for_day(
-                appointment_group, date, user_timezone_offset, time_slot_cache_dict=cache_dict
-            )
-            if _data["is_invalid_date"]:
-                date = _data["next_valid_date"]
-                if not isinstance(_data["next_valid_date"], str):
-                    date = _data["next_valid_date"].strftime("%Y-%m-%d")
-            else:
-                data["all_available_slots_for_data"].extend(_data["all_available_slots_for_data"])
-                data["dates"].append(_data["date"])
-                data["duration"] = _data["duration"]
-                data["starttime"] = (
-                    min(_data["starttime"], data["starttime"]) if data["starttime"] else _data["starttime"]
-                )
-                data["endtime"] = max(_data["endtime"], data["endtime"]) if data["endtime"] else _data["endtime"]
-                data["total_slots"] += _data["total_slots_for_day"]
-                for available_day in _data["available_days"]:
-                    if available_day not in data["available_days"]:
-                        data["available_days"].append(available_day)
-                date = frappe.utils.add_days(date, 1)
+        data = get_time_slots_for_date_range(appointment_group, start_date, end_date, user_timezone_offset)
 
     if not data:
         return None
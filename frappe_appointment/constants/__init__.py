@@ -1,5 +1,7 @@
 # Doctypes
 APPOINTMENT_GROUP = "Appointment Group"
 APPOINTMENT_TIME_SLOT = "Appointment Time Slot"
+GOOGLE_CALENDAR_MIRROR = "Google Calendar Mirror"
+GOOGLE_CALENDAR_MIRROR_EVENT = "Google Calendar Mirror Event"
 
 USER_APPOINTMENT_AVAILABILITY = "User Appointment Availability"
@@ -9,26 +9,40 @@ import frappe.utils
 from frappe.model.document import Document
 from frappe.utils import (
     add_days,
-    add_to_date,
-    format_time,
     get_datetime,
     get_datetime_str,
-    get_time_str,
+    getdate,
 )
 
-from frappe_appointment.constants import APPOINTMENT_GROUP, APPOINTMENT_TIME_SLOT
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, it is only needed for the vectorized slot generation
+    np = None
+
+from frappe_appointment.constants import APPOINTMENT_GROUP
 from frappe_appointment.frappe_appointment.doctype.appointment_time_slot.appointment_time_slot import (
     GoogleBadRequest,
     get_all_unavailable_google_calendar_slots_for_day,
+    prefetch_calendar_events_for_range,
+)
+from frappe_appointment.helpers.availability_template import (
+    get_availability_templates,
+    get_available_weekdays,
+    get_shared_working_hours,
 )
+from frappe_appointment.helpers.busy_cache import is_busy_data_degraded, is_busy_data_stale
+from frappe_appointment.helpers.intervals import EpochIntervals, union_intervals
+from frappe_appointment.helpers.time_off import get_members_time_off, is_hrms_installed, is_member_off
 from frappe_appointment.helpers.utils import (
-    convert_timezone_to_utc,
-    get_utc_datatime_with_time,
+    datetime_to_epoch,
+    epoch_to_utc_datetime,
     get_weekday,
+    get_window_min_max_time,
     utc_to_given_time_zone,
 )
 
 ALL_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+SECONDS_IN_DAY = 24 * 60 * 60
 
 
 class AppointmentGroup(Document):
@@ -69,7 +83,11 @@ class AppointmentGroup(Document):
 
 
 def _get_time_slots_for_day(
-    appointment_group: object, date: str, user_timezone_offset: str, time_slot_cache_dict: dict = None
+    appointment_group: object,
+    date: str,
+    user_timezone_offset: str,
+    time_slot_cache_dict: dict = None,
+    calendar_events_cache: dict = None,
 ) -> object:
     try:
         datetime_today = get_datetime(date)
@@ -80,34 +98,47 @@ def _get_time_slots_for_day(
 
         if int(user_timezone_offset) > 0:
             all_time_slots_global_object = {
-                "yesterday": get_time_slots_for_given_date(appointment_group, datetime_yesterday, time_slot_cache_dict),
-                "today": get_time_slots_for_given_date(appointment_group, datetime_today, time_slot_cache_dict),
+                "yesterday": get_time_slots_for_given_date(
+                    appointment_group, datetime_yesterday, time_slot_cache_dict, calendar_events_cache
+                ),
+                "today": get_time_slots_for_given_date(
+                    appointment_group, datetime_today, time_slot_cache_dict, calendar_events_cache
+                ),
             }
         else:
             all_time_slots_global_object = {
-                "today": get_time_slots_for_given_date(appointment_group, datetime_today, time_slot_cache_dict),
-                "tomorrow": get_time_slots_for_given_date(appointment_group, datetime_tomorrow, time_slot_cache_dict),
+                "today": get_time_slots_for_given_date(
+                    appointment_group, datetime_today, time_slot_cache_dict, calendar_events_cache
+                ),
+                "tomorrow": get_time_slots_for_given_date(
+                    appointment_group, datetime_tomorrow, time_slot_cache_dict, calendar_events_cache
+                ),
             }
 
         user_time_slots = get_user_time_slots(all_time_slots_global_object, date, user_timezone_offset)
 
-        time_slots_today_object = all_time_slots_global_object["today"]
+        # Copy so that the slots cached in time_slot_cache_dict keep their compact form
+        time_slots_today_object = dict(all_time_slots_global_object["today"])
 
-        current_time = utc_to_given_time_zone(datetime.datetime.now(), user_timezone_offset)
+        offset_seconds = int(user_timezone_offset) * 60
+        current_time = datetime_to_epoch(datetime.datetime.now().astimezone())
+        current_day = (current_time + offset_seconds) // SECONDS_IN_DAY
 
-        filtered_slots = []
+        filtered_slots = EpochIntervals()
 
-        for slot in user_time_slots:
-            start_time = utc_to_given_time_zone(slot["start_time"], user_timezone_offset)
-            end_time = utc_to_given_time_zone(slot["end_time"], user_timezone_offset)
-
-            if current_time.date() == end_time.date() and (start_time < current_time and end_time < current_time):
+        for start_time, end_time in user_time_slots:
+            # Skip the slots of today (in the user's timezone) that are already over
+            if (end_time + offset_seconds) // SECONDS_IN_DAY == current_day and (
+                start_time < current_time and end_time < current_time
+            ):
                 continue
 
-            filtered_slots.append(slot)
+            filtered_slots.append(start_time, end_time)
 
-        time_slots_today_object["all_available_slots_for_data"] = filtered_slots
+        time_slots_today_object["all_available_slots_for_data"] = filtered_slots.to_slots()
         time_slots_today_object["total_slots_for_day"] = len(filtered_slots)
+        time_slots_today_object["stale"] = is_busy_data_stale()
+        time_slots_today_object["degraded"] = is_busy_data_degraded()
 
         return time_slots_today_object
     except GoogleBadRequest as e:
@@ -118,19 +149,153 @@ def _get_time_slots_for_day(
         return None
 
 
+def get_time_slots_for_date_range(
+    appointment_group: object, start_date: str, end_date: str, user_timezone_offset: str
+) -> object:
+    """Get the available time slots for every valid date in [start_date, end_date].
+
+    The calendars of all mandatory members are fetched once for the whole range, and the events are
+    sliced per day in memory.
+
+    Args:
+    appointment_group (object): Appointment Group
+    start_date (str): First date of the range (YYYY-MM-DD)
+    end_date (str): Last date of the range (YYYY-MM-DD)
+    user_timezone_offset (str): User's timezone offset
+
+    Returns:
+    Object: Available slots of all the dates in the range
+    """
+    data = {
+        "all_available_slots_for_data": [],
+        "dates": [],
+        "duration": None,
+        "starttime": None,
+        "endtime": None,
+        "total_slots": 0,
+        "available_days": [],
+    }
+
+    enddatetime = get_datetime(end_date)
+
+    if get_datetime(start_date) > enddatetime:
+        return data
+
+    # Build the leaves and holidays of the whole range at once, dates are evaluated along with the adjacent ones
+    if is_hrms_installed():
+        get_members_time_off(
+            [member.user for member in appointment_group.members if member.is_mandatory],
+            add_days(get_datetime(start_date), -1),
+            add_days(enddatetime, 1),
+        )
+
+    calendar_events_cache = prefetch_calendar_events_for_range(
+        appointment_group, get_fetch_windows_for_range(appointment_group, get_datetime(start_date), enddatetime)
+    )
+
+    date = start_date
+    time_slot_cache_dict = {}
+    while True:
+        if get_datetime(date) > enddatetime:
+            break
+        _data = _get_time_slots_for_day(
+            appointment_group,
+            date,
+            user_timezone_offset,
+            time_slot_cache_dict=time_slot_cache_dict,
+            calendar_events_cache=calendar_events_cache,
+        )
+        if _data["is_invalid_date"]:
+            date = _data["next_valid_date"]
+            if not isinstance(_data["next_valid_date"], str):
+                date = _data["next_valid_date"].strftime("%Y-%m-%d")
+        else:
+            data["all_available_slots_for_data"].extend(_data["all_available_slots_for_data"])
+            data["dates"].append(_data["date"])
+            data["duration"] = _data["duration"]
+            data["starttime"] = min(_data["starttime"], data["starttime"]) if data["starttime"] else _data["starttime"]
+            data["endtime"] = max(_data["endtime"], data["endtime"]) if data["endtime"] else _data["endtime"]
+            data["total_slots"] += _data["total_slots_for_day"]
+            for available_day in _data["available_days"]:
+                if available_day not in data["available_days"]:
+                    data["available_days"].append(available_day)
+            date = add_days(date, 1)
+
+    data["stale"] = is_busy_data_stale()
+    data["degraded"] = is_busy_data_degraded()
+
+    return data
+
+
+def get_fetch_windows_for_range(
+    appointment_group: object, start_date: datetime.datetime, end_date: datetime.datetime
+) -> list:
+    """Get the windows Google needs to be asked for to get the slots of every date in [start_date, end_date].
+
+    A window covers the working hours all mandatory members share on a date, plus the buffer on both sides.
+    Slots of a date are evaluated along with the adjacent dates for timezone shifts, so a date is added on both
+    sides, and overlapping windows are merged.
+
+    Args:
+    appointment_group (object): Appointment Group
+    start_date (datetime): First date of the range
+    end_date (datetime): Last date of the range
+
+    Returns:
+    list: Disjoint (time_min, time_max) tuples of ISO format times for Google API, in ascending order
+    """
+    mandatory_members = [member.user for member in appointment_group.members if member.is_mandatory]
+    minimum_buffer_time = int(appointment_group.minimum_buffer_time or 0)
+    duration = int(appointment_group.duration_for_event)
+
+    templates = get_availability_templates(mandatory_members)
+
+    windows = []
+    date = add_days(start_date, -1)
+
+    while date <= add_days(end_date, 1):
+        working_hours = get_shared_working_hours(templates, date, get_weekday(date))
+
+        # Dates on which a mandatory member does not work have no slots, see check_availability
+        if working_hours:
+            starttime, endtime = working_hours
+
+            if (endtime - starttime).total_seconds() >= duration:
+                windows.append(
+                    (
+                        datetime_to_epoch(starttime) - minimum_buffer_time,
+                        datetime_to_epoch(endtime) + minimum_buffer_time,
+                    )
+                )
+
+        date = add_days(date, 1)
+
+    fetch_windows = []
+
+    for window_start, window_end in union_intervals(sorted(windows)):
+        time_max, time_min = get_window_min_max_time(
+            epoch_to_utc_datetime(window_start), epoch_to_utc_datetime(window_end)
+        )
+        fetch_windows.append((time_min, time_max))
+
+    return fetch_windows
+
+
 def get_user_time_slots(all_time_slots_global_object: list, date: str, user_timezone_offset: str):
-    list_all_available_slots_for_data = []
+    list_all_available_slots_for_data = EpochIntervals()
 
-    today = int(date.split("-")[2])
+    # Bounds of the given date in the user's timezone, in epoch seconds
+    day_start = datetime_to_epoch(datetime.datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc))
+    day_start -= int(user_timezone_offset) * 60
+    day_end = day_start + SECONDS_IN_DAY
 
     for day in all_time_slots_global_object:
         day_slots_object = all_time_slots_global_object[day]
         all_available_slots_for_data = day_slots_object["all_available_slots_for_data"]
 
-        for time_slot in all_available_slots_for_data:
-            user_timezone_start_time_slot = utc_to_given_time_zone(time_slot["start_time"], user_timezone_offset)
-            if user_timezone_start_time_slot.day == today:
-                list_all_available_slots_for_data.append(time_slot)
+        for start_time, end_time in all_available_slots_for_data:
+            if day_start <= start_time < day_end:
+                list_all_available_slots_for_data.append(start_time, end_time)
 
     return list_all_available_slots_for_data
 
@@ -142,7 +307,13 @@ def is_valid_time_slots(
     start_time: str,
     end_time: str,
 ):
-    today_time_slots = _get_time_slots_for_day(appointment_group, date, user_timezone_offset)
+    # Never accept a booking based on expired busy times
+    frappe.flags.appointment_live_busy_data = True
+
+    try:
+        today_time_slots = _get_time_slots_for_day(appointment_group, date, user_timezone_offset)
+    finally:
+        frappe.flags.appointment_live_busy_data = False
 
     if not today_time_slots:
         return False
@@ -177,17 +348,19 @@ def hours_to_time_slot(start_time, user_timezone_offset, current_time=None) -> i
     return int((start_time - current_time).total_seconds() / 3600)
 
 
-def get_time_slots_for_given_date(appointment_group: object, datetime: datetime, time_slot_cache_dict=None):
+def get_time_slots_for_given_date(
+    appointment_group: object, datetime: datetime, time_slot_cache_dict=None, calendar_events_cache=None
+):
     if time_slot_cache_dict is not None:
         if datetime in time_slot_cache_dict:
             return time_slot_cache_dict[datetime]
-    data = _get_time_slots_for_given_date(appointment_group, datetime)
+    data = _get_time_slots_for_given_date(appointment_group, datetime, calendar_events_cache)
     if time_slot_cache_dict is not None:
         time_slot_cache_dict[datetime] = data
     return data
 
 
-def _get_time_slots_for_given_date(appointment_group: object, datetime: datetime):
+def _get_time_slots_for_given_date(appointment_group: object, datetime: datetime, calendar_events_cache=None):
     date = datetime.date()
     weekday = get_weekday(datetime)
 
@@ -225,33 +398,37 @@ def _get_time_slots_for_given_date(appointment_group: object, datetime: datetime
             date_validation_obj=date_validation_obj,
         )
 
-    members = appointment_group.members
-
-    member_time_slots = {}
-    max_start_time, min_end_time = "00:00:00", "24:00:00"
+    mandatory_members = [member.user for member in appointment_group.members if member.is_mandatory]
 
-    for member in members:
-        if not member.is_mandatory:
-            continue
+    member_time_slots = {member: [] for member in mandatory_members}
+    working_hours = get_shared_working_hours(get_availability_templates(mandatory_members), date, weekday)
 
-        appointment_time_slots = frappe.db.get_all(
-            APPOINTMENT_TIME_SLOT,
-            filters={"parent": member.user, "day": weekday},
-            fields="*",
+    if not working_hours:
+        return get_response_body(
+            avaiable_time_slot_for_day=[],
+            appointment_group=appointment_group,
+            date=date,
+            date_validation_obj=date_validation_obj,
         )
 
-        max_start_time, min_end_time = get_max_min_time_slot(appointment_time_slots, max_start_time, min_end_time)
+    starttime, endtime = working_hours
 
-        member_time_slots[member.user] = appointment_time_slots
-
-    starttime = get_utc_datatime_with_time(date, max_start_time)
-    endtime = get_utc_datatime_with_time(date, min_end_time)
+    # The working hours of the members leave no room for an appointment, so there is no need to ask Google
+    if (endtime - starttime).total_seconds() < int(appointment_group.duration_for_event):
+        return get_response_body(
+            avaiable_time_slot_for_day=[],
+            appointment_group=appointment_group,
+            starttime=starttime,
+            endtime=endtime,
+            date=date,
+            date_validation_obj=date_validation_obj,
+        )
 
     all_slots = get_all_unavailable_google_calendar_slots_for_day(
-        member_time_slots, starttime, endtime, date, appointment_group
+        member_time_slots, starttime, endtime, date, appointment_group, calendar_events_cache
     )
 
-    if not all_slots and all_slots != []:
+    if all_slots is False:
         return get_response_body(
             avaiable_time_slot_for_day=[],
             appointment_group=appointment_group,
@@ -259,9 +436,12 @@ def _get_time_slots_for_given_date(appointment_group: object, datetime: datetime
             date_validation_obj=date_validation_obj,
         )
 
-    all_slots = update_cal_slots_with_events(all_slots, booking_frequency_reached_obj["events"])
-
-    avaiable_time_slot_for_day = get_avaiable_time_slot_for_day(all_slots, starttime, endtime, appointment_group)
+    if use_vectorized_slot_generation():
+        avaiable_time_slot_for_day = get_avaiable_time_slot_for_day_vectorized(
+            all_slots, starttime, endtime, appointment_group
+        )
+    else:
+        avaiable_time_slot_for_day = get_avaiable_time_slot_for_day(all_slots, starttime, endtime, appointment_group)
 
     return get_response_body(
         avaiable_time_slot_for_day=avaiable_time_slot_for_day,
@@ -289,13 +469,11 @@ def check_availability(date_validation_obj: object, weekday: str, appointment_gr
         "date_validation_obj": date_validation_obj,
     }
 
-    mandatory_members = [member for member in appointment_group.members if member.is_mandatory]
+    mandatory_members = [member.user for member in appointment_group.members if member.is_mandatory]
     available_days = set(ALL_DAYS)
 
-    for member in mandatory_members:
-        availability = frappe.get_doc("User Appointment Availability", member.user)
-        user_available_days = [day.day for day in availability.appointment_time_slot]
-        available_days = available_days.intersection(set(user_available_days))
+    if mandatory_members:
+        available_days = get_available_weekdays(get_availability_templates(mandatory_members))
 
     res["available_days"] = available_days
 
@@ -383,7 +561,7 @@ def get_response_body(
         Generate the API Response object for the API endpoint: get_time_slots_for_day
 
         Args:
-    available_time_slots_for_day (list): List of available time slots for the user
+    available_time_slots_for_day (EpochIntervals): Available time slots for the user
     appointment_group (object): Appointment Group ID
     starttime (datetime, optional): Start Time for Events. Defaults to None.
     endtime (datetime, optional): End Time for Events. Defaults to None.
@@ -392,7 +570,7 @@ def get_response_body(
     is_invalid_date (bool, optional): Is the given date invalid or not. Defaults to False.
 
         Returns:
-        Object: API Response object
+        Object: API Response object, the available slots are kept as EpochIntervals until they are returned by the API
     """
     if not date_validation_obj:
         date_validation_obj = {"valid_start_date": None, "valid_end_date": None}
@@ -524,73 +702,46 @@ def vaild_date(date: datetime, appointment_group: object) -> object:
     }
 
 
-def update_cal_slots_with_events(all_slots: list, all_events: list) -> list:
-    """
-        Function to take all Frappe events and all Google Calendar available time slots and create a new list where each slot has updated `starts_on` and `ends_on` fields.
-
-        Args:
-    all_slots (list): List of all Google slots available
-    all_events (list): List of all Frappe Events
-
-        Returns:
-        List: List of all slots with the updated `starts_on` and `ends_on` fields
-    """
-    update_slots = []
-    for currernt_slot in all_slots:
-        updated_slot = {}
-        updated_slot["starts_on"] = convert_timezone_to_utc(
-            currernt_slot["start"]["dateTime"], currernt_slot["start"]["timeZone"]
-        )
-        updated_slot["ends_on"] = convert_timezone_to_utc(
-            currernt_slot["end"]["dateTime"], currernt_slot["end"]["timeZone"]
-        )
-
-        update_slots.append(updated_slot)
-
-    return update_slots
-
-
 def get_avaiable_time_slot_for_day(
-    all_slots: list, starttime: datetime, endtime: datetime, appointment_group: object
-) -> list:
+    all_slots: EpochIntervals, starttime: datetime, endtime: datetime, appointment_group: object
+) -> EpochIntervals:
     """Generate time available time slots for a given date based on Google slots within the range [starttime, endtime].
 
     Args:
-    all_slots (list): All Google slots
+    all_slots (EpochIntervals): All Google busy intervals, sorted by start (disjoint after union_intervals)
     starttime (datetime): Start time from which slots should be generated
     endtime (datetime): End time until which slots should be generated
     appointment_group (object): Appointment Group
 
     Returns:
-    list: List of available slots
+    EpochIntervals: Available slots
     """
-    available_slots = []
+    available_slots = EpochIntervals()
 
     index = 0
 
-    minimum_buffer_time = appointment_group.minimum_buffer_time
-
-    # Start time of event
-    current_start_time = get_next_round_value(minimum_buffer_time, starttime, False)
+    minimum_buffer_time = int(appointment_group.minimum_buffer_time or 0)
+    duration = int(appointment_group.duration_for_event)
 
-    minute, second = divmod(appointment_group.duration_for_event, 60)
-    hour, minute = divmod(minute, 60)
+    busy_starts, busy_ends = all_slots.starts, all_slots.ends
+    endtime = datetime_to_epoch(endtime)
 
-    current_end_time = add_to_date(current_start_time, hours=hour, minutes=minute, seconds=second)
+    # Start time of event
+    current_start_time = get_next_round_value(minimum_buffer_time, datetime_to_epoch(starttime), False)
+    current_end_time = current_start_time + duration
 
     # This will make sure that slots will be genrate even though we reach at end of all_slots
     while current_end_time <= endtime:
-        if index >= len(all_slots) and current_end_time <= endtime:
-            available_slots.append({"start_time": current_start_time, "end_time": current_end_time})
+        if index >= len(busy_starts) and current_end_time <= endtime:
+            available_slots.append(current_start_time, current_end_time)
 
             current_start_time = get_next_round_value(minimum_buffer_time, current_end_time, False)
-            current_end_time = add_to_date(current_start_time, hours=hour, minutes=minute, seconds=second)
+            current_end_time = current_start_time + duration
 
             continue
 
-        currernt_slot = all_slots[index]
-        currernt_slot_start_time = currernt_slot["starts_on"]
-        currernt_slot_end_time = currernt_slot["ends_on"]
+        currernt_slot_start_time = busy_starts[index]
+        currernt_slot_end_time = busy_ends[index]
 
         if current_end_time <= currernt_slot_start_time and is_valid_buffer_time(
             minimum_buffer_time,
@@ -598,33 +749,100 @@ def get_avaiable_time_slot_for_day(
             currernt_slot_start_time,
             True,
         ):
-            available_slots.append({"start_time": current_start_time, "end_time": current_end_time})
+            available_slots.append(current_start_time, current_end_time)
             current_start_time = get_next_round_value(minimum_buffer_time, current_end_time, False)
         else:
-            current_start_time = get_next_round_value(
-                minimum_buffer_time,
-                currernt_slot_end_time,
-                True,
+            # Never move back, a busy slot can end before an earlier (enclosing) one
+            current_start_time = max(
+                current_start_time,
+                get_next_round_value(
+                    minimum_buffer_time,
+                    currernt_slot_end_time,
+                    True,
+                ),
             )
             index += 1
 
-        current_end_time = add_to_date(current_start_time, hours=hour, minutes=minute, seconds=second)
+        current_end_time = current_start_time + duration
+
+    return available_slots
+
+
+def use_vectorized_slot_generation() -> bool:
+    """Check if slots should be generated with NumPy, enabled with `vectorized_slot_generation` in the
+    `frappe_appointments` site config."""
+    if np is None:
+        return False
+
+    return bool(frappe.conf.get("frappe_appointments", {}).get("vectorized_slot_generation", False))
+
+
+def get_avaiable_time_slot_for_day_vectorized(
+    all_slots: EpochIntervals, starttime: datetime, endtime: datetime, appointment_group: object
+) -> EpochIntervals:
+    """NumPy version of get_avaiable_time_slot_for_day, it returns exactly the same slots.
+
+    The free gaps between the busy slots are computed at once, and every slot is placed in its gap with
+    searchsorted over the running slot count of the gaps.
+
+    Args:
+    all_slots (EpochIntervals): All Google busy intervals, sorted by start
+    starttime (datetime): Start time from which slots should be generated
+    endtime (datetime): End time until which slots should be generated
+    appointment_group (object): Appointment Group
+
+    Returns:
+    EpochIntervals: Available slots
+    """
+    available_slots = EpochIntervals()
+
+    minimum_buffer_time = int(appointment_group.minimum_buffer_time or 0)
+    duration = int(appointment_group.duration_for_event)
+
+    if duration <= 0:
+        return available_slots
+
+    starttime, endtime = datetime_to_epoch(starttime), datetime_to_epoch(endtime)
+
+    busy_starts = np.frombuffer(all_slots.starts, dtype=np.int64)
+    busy_ends = np.frombuffer(all_slots.ends, dtype=np.int64)
+
+    # A gap opens after the latest busy end so far plus the buffer, and closes the buffer before the next busy
+    # start. The first gap opens at starttime and the last one closes at endtime, both without buffer.
+    gap_starts = np.maximum(
+        np.concatenate(([starttime], np.maximum.accumulate(busy_ends) + minimum_buffer_time)), starttime
+    )
+    gap_ends = np.minimum(np.concatenate((busy_starts - minimum_buffer_time, [endtime])), endtime)
+
+    slots_per_gap = np.maximum((gap_ends - gap_starts) // duration, 0)
+    slots_until_gap = np.cumsum(slots_per_gap)
+    total_slots = int(slots_until_gap[-1])
+
+    if not total_slots:
+        return available_slots
+
+    slot_index = np.arange(total_slots, dtype=np.int64)
+    gap_index = np.searchsorted(slots_until_gap, slot_index, side="right")
+    slot_starts = gap_starts[gap_index] + (slot_index - (slots_until_gap - slots_per_gap)[gap_index]) * duration
+
+    available_slots.starts.frombytes(slot_starts.astype(np.int64).tobytes())
+    available_slots.ends.frombytes((slot_starts + duration).astype(np.int64).tobytes())
 
     return available_slots
 
 
 def is_valid_buffer_time(
     minimum_buffer_time: int,
-    end: datetime,
-    next_start: datetime,
+    end: int,
+    next_start: int,
     is_add_buffer_in_event: bool = True,
 ):
     """Check if the time difference between the next time slot and the current time slot meets the minimum_buffer_time requirement.
 
     Args:
-    minimum_buffer_time (datetime): Minimum buffer time to maintain
-    end (datetime): End time of the current time slot
-    next_start (datetime): Start time of the next time slot
+    minimum_buffer_time (int): Minimum buffer time to maintain, in seconds
+    end (int): End time of the current time slot, in epoch seconds
+    next_start (int): Start time of the next time slot, in epoch seconds
     is_add_buffer_in_event (bool, optional): Whether to add buffer time in the current slot. Defaults to True.
 
     Returns:
@@ -633,52 +851,28 @@ def is_valid_buffer_time(
     if not minimum_buffer_time or not is_add_buffer_in_event:
         return True
 
-    return minimum_buffer_time <= (next_start - end).seconds
+    return minimum_buffer_time <= next_start - end
 
 
 def get_next_round_value(
     minimum_buffer_time: int,
-    current_end_time: datetime,
+    current_end_time: int,
     is_add_buffer_in_event: bool = True,
 ):
     """Generate the next possible start time for an event as per the buffer time value.
 
     Args:
-    minimum_buffer_time (datetime): Minimum buffer time to maintain
-    current_end_time (datetime): Start time of the current slot
+    minimum_buffer_time (int): Minimum buffer time to maintain, in seconds
+    current_end_time (int): Start time of the current slot, in epoch seconds
     is_add_buffer_in_event (bool, optional): Whether to add buffer time in the current slot. Defaults to True.
 
     Returns:
-    Datetime: Next slot possible start time
+    int: Next slot possible start time, in epoch seconds
     """
     if not minimum_buffer_time or not is_add_buffer_in_event:
         return current_end_time
 
-    minute, second = divmod(minimum_buffer_time, 60)
-    hour, minute = divmod(minute, 60)
-
-    min_start_time = add_to_date(current_end_time, hours=hour, minutes=minute, seconds=second)
-
-    return min_start_time
-
-
-def get_max_min_time_slot(appointmen_time_slots: list, max_start_time: str, min_end_time: str) -> list:
-    """Select the maximum between the given start time and appointment_time_slots start time, and the minimum between the given end time and appointment_time_slots end time.
-
-    Args:
-    appointment_time_slots (list): Appointment time slots
-    max_start_time (str): Max start time
-    min_end_time (str): Min end time
-
-    Returns:
-    list: Updated list of start time and min end time
-    """
-
-    for appointmen_time_slot in appointmen_time_slots:
-        max_start_time = max(max_start_time, format_time(get_time_str(appointmen_time_slot.start_time)))
-        min_end_time = min(min_end_time, format_time(get_time_str(appointmen_time_slot.end_time)))
-
-    return [max_start_time, min_end_time]
+    return current_end_time + minimum_buffer_time
 
 
 def is_member_on_leave_or_is_holiday(appointment_group, date):
@@ -693,41 +887,18 @@ def is_member_on_leave_or_is_holiday(appointment_group, date):
     bool: True if the date is invalid due to mandatory member leaves or holiday, False otherwise
     """
 
-    # check if erpnext and hrms are installed or not
-    installed_apps = frappe.get_installed_apps()
-    if "erpnext" not in installed_apps:
+    if not is_hrms_installed():
         return False
-    if "hrms" not in installed_apps:
-        return False
-
-    date_str = date.strftime("%Y-%m-%d")
 
-    for member in appointment_group.members:
-        if member.is_mandatory:  # Only check for mandatory members
-            employee = frappe.get_all(
-                "Employee", filters={"company_email": member.user}, fields=["name", "holiday_list"]
-            )
-            if not employee:
-                return False  # If we don't have the employee, we can't check for leaves or holidays
-
-            leaves = frappe.get_all(
-                "Leave Application",
-                filters={
-                    "employee": employee[0].name,
-                    "from_date": ["<=", date_str],
-                    "to_date": [">=", date_str],
-                    "status": "Approved",
-                },
-            )
+    mandatory_members = [member.user for member in appointment_group.members if member.is_mandatory]
+    time_off = get_members_time_off(mandatory_members, date, date)
 
-            if leaves:
-                return True
+    for member in mandatory_members:
+        if not time_off[member]["employee"]:
+            return False  # If we don't have the employee, we can't check for leaves or holidays
 
-            if employee and employee[0].holiday_list:
-                holidays = frappe.get_doc("Holiday List", employee[0].holiday_list)
-                for holiday in holidays.holidays:
-                    if holiday.holiday_date.strftime("%Y-%m-%d") == date_str:
-                        return True
+        if is_member_off(time_off[member], getdate(date)):
+            return True
 
     return False
 
@@ -1,9 +1,101 @@
 # Copyright (c) 2023, rtCamp and Contributors
 # See license.txt
 
-# import frappe
+import random
+import unittest
+from datetime import datetime, timedelta
+
+import frappe
+import pytz
 from frappe.tests.utils import FrappeTestCase
 
+from frappe_appointment.frappe_appointment.doctype.appointment_group.appointment_group import (
+    get_avaiable_time_slot_for_day,
+    get_avaiable_time_slot_for_day_vectorized,
+    np,
+)
+from frappe_appointment.helpers.intervals import EpochIntervals, largest_gap, union_intervals
+
+
+def get_random_busy_slots(rng: random.Random, starttime: datetime) -> list:
+    busy_slots = []
+    for _ in range(rng.randrange(0, 10)):
+        busy_start = int(starttime.timestamp()) + rng.randrange(-60, 600, 5) * 60
+        busy_slots.append((busy_start, busy_start + rng.randrange(0, 240, 5) * 60))
+    busy_slots.sort()
+    return busy_slots
+
 
 class TestAppointmentGroup(FrappeTestCase):
-    pass
+    def test_union_intervals(self):
+        self.assertEqual(
+            list(union_intervals([(0, 10), (2, 5), (10, 20), (25, 30), (40, 50)], max_gap=5)),
+            [(0, 30), (40, 50)],
+        )
+        self.assertEqual(list(union_intervals([])), [])
+
+    def test_union_does_not_change_slots(self):
+        rng = random.Random(7)
+        starttime = datetime(2024, 5, 1, 9, 0, tzinfo=pytz.utc)
+        endtime = starttime + timedelta(hours=9)
+
+        for _ in range(1000):
+            busy_slots = get_random_busy_slots(rng, starttime)
+            appointment_group = frappe._dict(
+                duration_for_event=rng.choice([900, 1800, 3600]),
+                minimum_buffer_time=rng.choice([None, 300, 900]),
+            )
+            merged_slots = union_intervals(busy_slots, max_gap=2 * int(appointment_group.minimum_buffer_time or 0))
+
+            self.assertEqual(
+                list(get_avaiable_time_slot_for_day(EpochIntervals(busy_slots), starttime, endtime, appointment_group)),
+                list(get_avaiable_time_slot_for_day(merged_slots, starttime, endtime, appointment_group)),
+                msg=f"busy: {busy_slots}",
+            )
+
+    def test_no_slots_when_largest_gap_is_too_small(self):
+        rng = random.Random(11)
+        starttime = datetime(2024, 5, 1, 9, 0, tzinfo=pytz.utc)
+        endtime = starttime + timedelta(hours=9)
+
+        for _ in range(1000):
+            appointment_group = frappe._dict(
+                duration_for_event=rng.choice([900, 1800, 3600]),
+                minimum_buffer_time=rng.choice([None, 300, 900]),
+            )
+            minimum_buffer_time = int(appointment_group.minimum_buffer_time or 0)
+            busy_slots = union_intervals(get_random_busy_slots(rng, starttime), max_gap=2 * minimum_buffer_time)
+
+            if (
+                largest_gap(busy_slots, int(starttime.timestamp()), int(endtime.timestamp()), minimum_buffer_time)
+                < appointment_group.duration_for_event
+            ):
+                self.assertEqual(
+                    len(get_avaiable_time_slot_for_day(busy_slots, starttime, endtime, appointment_group)), 0
+                )
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestVectorizedSlotGeneration(FrappeTestCase):
+    def test_vectorized_slots_match_walker(self):
+        rng = random.Random(42)
+        day_start = datetime(2024, 5, 1, 9, 0, tzinfo=pytz.utc)
+
+        for _ in range(2000):
+            starttime = day_start + timedelta(minutes=rng.randrange(0, 120, 5))
+            endtime = starttime + timedelta(minutes=rng.randrange(0, 600, 5))
+
+            busy_slots = get_random_busy_slots(rng, starttime)
+            appointment_group = frappe._dict(
+                duration_for_event=rng.choice([900, 1800, 2700, 3600]),
+                minimum_buffer_time=rng.choice([None, 0, 300, 600, 900]),
+            )
+
+            walker_slots = get_avaiable_time_slot_for_day(
+                EpochIntervals(busy_slots), starttime, endtime, appointment_group
+            )
+            vectorized_slots = get_avaiable_time_slot_for_day_vectorized(
+                EpochIntervals(busy_slots), starttime, endtime, appointment_group
+            )
+
+            self.assertEqual(list(walker_slots), list(vectorized_slots), msg=f"busy: {busy_slots}")
@@ -1,20 +1,56 @@
 # Copyright (c) 2023, rtCamp and contributors
 # For license information, please see license.txt
 
-from datetime import datetime
-from functools import cmp_to_key
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from heapq import merge
+from itertools import chain
+from operator import attrgetter
+from typing import NamedTuple
 
 import frappe
+import pytz
 from frappe import _
-from frappe.integrations.doctype.google_calendar.google_calendar import (
-    get_google_calendar_object,
-)
 from frappe.model.document import Document
-
+from frappe.utils import now_datetime
+
+from frappe_appointment.constants import GOOGLE_CALENDAR_MIRROR, GOOGLE_CALENDAR_MIRROR_EVENT
+from frappe_appointment.helpers.busy_cache import (
+    get_cached_calendar_events,
+    is_stale_busy_data_allowed,
+    mark_busy_data_degraded,
+    mark_busy_data_stale,
+    set_cached_calendar_events,
+)
+from frappe_appointment.helpers.calendar_fetch import (
+    execute_google_requests,
+    get_calendar_fetch_settings,
+    is_concurrent_fetch_enabled,
+)
+from frappe_appointment.helpers.circuit_breaker import (
+    allow_calendar_request,
+    record_calendar_failure,
+    record_calendar_success,
+)
+from frappe_appointment.helpers.google_api_quota import execute_google_request
+from frappe_appointment.helpers.google_calendar import get_google_calendar_object
+from frappe_appointment.helpers.intervals import EpochIntervals, largest_gap, union_intervals
+from frappe_appointment.helpers.request_deadline import (
+    LATE_CALENDAR_TREAT_AS_BUSY,
+    get_late_calendar_handling,
+    is_calendar_late,
+    is_deadline_error,
+    is_request_deadline_exceeded,
+    limit_to_deadline,
+    mark_calendar_late,
+)
+from frappe_appointment.helpers.single_flight import run_coalesced
 from frappe_appointment.helpers.utils import (
-    compare_end_time_slots,
+    convert_event_time_to_utc,
     convert_timezone_to_utc,
-    get_today_min_max_time,
+    datetime_to_epoch,
+    get_window_min_max_time,
+    parse_utc_datetime,
 )
 
 
@@ -22,55 +58,191 @@ class AppointmentTimeSlot(Document):
     pass
 
 
+# Google accepts at most 50 calendars in a single freebusy query
+FREE_BUSY_MAX_CALENDARS = 50
+
+# Mirrors that were not synced within this time are considered stale, and the calendar is read live instead
+GOOGLE_CALENDAR_MIRROR_MAX_AGE = timedelta(minutes=15)
+
+# Partial response of events().list with only the event fields the busy logic reads
+GOOGLE_EVENT_FIELDS = "id,iCalUID,start,end,creator(email),attendees(self,responseStatus),transparency,status"
+EVENTS_LIST_FIELDS = f"items({GOOGLE_EVENT_FIELDS}),nextPageToken"
+EVENTS_LIST_PAGE_SIZE = 500
+
+# With concurrent fetches, members after the busiest one are fetched this many at a time, so a few busy members
+# still settle a fully booked day without fetching the calendars of everyone else
+MEMBER_FETCH_BATCH_SIZE = 4
+
+# Redis hash with the share of the working window each member was busy for on their last fetched day
+MEMBER_BUSY_RATIO_CACHE_KEY = "appointment_member_busy_ratio"
+
+
 class GoogleBadRequest(Exception):
     pass
 
 
+class BusyInterval(NamedTuple):
+    """A busy period of a calendar, parsed once from a Google event or free/busy entry."""
+
+    # Epoch seconds
+    start_utc: int
+    end_utc: int
+    source_calendar: str
+    ical_uid: str | None = None
+
+
+class CalendarEvent(NamedTuple):
+    """A Google event reduced to the fields that decide whether, and when, it blocks a member.
+
+    Unlike busy intervals these do not depend on the member, so they can be shared and cached per calendar.
+    """
+
+    # Epoch seconds, None for all-day events that could not be converted
+    start_utc: int | None
+    end_utc: int | None
+    ical_uid: str | None
+    creator: str | None
+    # Response of the calendar owner, None if the owner is not an attendee
+    response_status: str | None
+
+
 def get_all_unavailable_google_calendar_slots_for_day(
     member_time_slots: object,
     starttime: datetime,
     endtime: datetime,
     date: datetime,
     appointment_group: object,
-) -> list:
+    calendar_events_cache: dict = None,
+) -> EpochIntervals:
     """Get all google time slots of the given memebers
 
+    Members are fetched busiest first, based on how busy they were on their last fetched day, and the
+    remaining members are skipped as soon as no gap in [starttime, endtime] can fit an appointment anymore.
+    Most fully booked days are then settled by a single member's calendars. With parallel or batched calendar
+    fetches enabled, the members after the busiest one are fetched in rounds of MEMBER_FETCH_BATCH_SIZE, busiest
+    first, and no further round is fetched once the day is settled.
+
     Args:
     member_time_slots (object): list  of members
     starttime (datetime): start time for slot
     endtime (datetime): end time for slot
     date (datetime): data for which need to fetch the data
     appointment_group (object): object
+    calendar_events_cache (dict, optional): Busy intervals prefetched for a date range, see prefetch_calendar_events_for_range
 
     Returns:
-    list: List of all google time slots of members
+    EpochIntervals: Disjoint busy intervals of the members, merged up to two buffers apart, or False if a primary
+    calendar could not be fetched
     """
-    cal_slots = []
+    minimum_buffer_time = int(appointment_group.minimum_buffer_time or 0)
+    duration = int(appointment_group.duration_for_event)
+    start_epoch, end_epoch = datetime_to_epoch(starttime), datetime_to_epoch(endtime)
 
-    for member in member_time_slots:
-        google_calendar_slots = get_google_calendar_slots_member(member, starttime, endtime, date, appointment_group)
+    busy_intervals = EpochIntervals()
+    busy_ratios = get_member_busy_ratios(list(member_time_slots))
 
-        if google_calendar_slots == False:  # noqa: E712
+    # Fetch the busy times up to a buffer outside the working hours too, the buffer itself is applied when the busy
+    # intervals are merged up to two buffers apart and their gaps are measured below
+    time_max, time_min = get_window_min_max_time(starttime, endtime, minimum_buffer_time)
+
+    if calendar_events_cache is None and get_busy_source() == "Free/Busy":
+        calendar_events_cache = get_free_busy_for_members(
+            list(member_time_slots), appointment_group.event_creator, time_min, time_max
+        )
+
+    members = sorted(member_time_slots, key=lambda member: busy_ratios.get(member, 0), reverse=True)
+    concurrent_fetch = is_concurrent_fetch_enabled()
+
+    for index, member in enumerate(members):
+        if concurrent_fetch and index % MEMBER_FETCH_BATCH_SIZE == 1:
+            calendar_events_cache = {
+                **(calendar_events_cache or {}),
+                **fetch_calendar_events_for_members(
+                    members[index : index + MEMBER_FETCH_BATCH_SIZE], [(time_min, time_max)], calendar_events_cache
+                ),
+            }
+
+        member_busy_streams = get_member_busy_streams(
+            member, starttime, endtime, date, appointment_group, calendar_events_cache
+        )
+
+        if member_busy_streams is False:
             return False
 
-        cal_slots = cal_slots + google_calendar_slots
+        member_busy_intervals = union_intervals(
+            (busy_interval.start_utc, busy_interval.end_utc)
+            for busy_interval in merge_busy_streams(member_busy_streams)
+        )
+        set_member_busy_ratio(member, member_busy_intervals, start_epoch, end_epoch)
+
+        # No slot fits between two busy intervals that are less than two buffers apart, so they can be merged
+        busy_intervals = union_intervals(merge(busy_intervals, member_busy_intervals), max_gap=2 * minimum_buffer_time)
 
-    cal_slots.sort(key=cmp_to_key(compare_end_time_slots))
+        if largest_gap(busy_intervals, start_epoch, end_epoch, minimum_buffer_time) < duration:
+            break
 
-    return remove_duplicate_slots(cal_slots)
+    return busy_intervals
 
 
-def get_google_calendar_slots_member(
+def get_member_busy_ratios(members: list) -> dict:
+    """Get the cached share of the working window each of the given members was busy for on their last fetched day.
+
+    Args:
+    members (list): User Appointment Availability names
+
+    Returns:
+    dict: member -> busy ratio between 0 and 1, members without a cached ratio are left out
+    """
+    busy_ratios = {}
+
+    for member in members:
+        busy_ratio = frappe.cache.hget(MEMBER_BUSY_RATIO_CACHE_KEY, member)
+        if busy_ratio is not None:
+            busy_ratios[member] = busy_ratio
+
+    return busy_ratios
+
+
+def set_member_busy_ratio(member: str, busy_intervals: EpochIntervals, start_epoch: int, end_epoch: int):
+    """Cache the share of [start_epoch, end_epoch] the member is busy for, used to fetch busy members first.
+
+    Args:
+    member (str): User Appointment Availability name
+    busy_intervals (EpochIntervals): Disjoint busy intervals of the member
+    start_epoch (int): Start of the working window in epoch seconds
+    end_epoch (int): End of the working window in epoch seconds
+    """
+    if end_epoch <= start_epoch:
+        return
+
+    busy_seconds = sum(
+        max(0, min(busy_end, end_epoch) - max(busy_start, start_epoch)) for busy_start, busy_end in busy_intervals
+    )
+
+    frappe.cache.hset(MEMBER_BUSY_RATIO_CACHE_KEY, member, busy_seconds / (end_epoch - start_epoch))
+
+
+def merge_busy_streams(busy_streams: list) -> Iterator[BusyInterval]:
+    """K-way merge of busy interval streams that are each sorted by start, without building the concatenated list.
+
+    Args:
+    busy_streams (list): Iterables of busy intervals, each sorted by start
+
+    Returns:
+    Iterator[BusyInterval]: Busy intervals of all streams ordered by start
+    """
+    return merge(*busy_streams, key=attrgetter("start_utc"))
+
+
+def get_member_busy_streams(
     member: str,
     starttime: datetime,
     endtime: datetime,
     date: datetime,
     appointment_group: object,
+    calendar_events_cache: dict = None,
 ) -> list:
-    """Fetch the google slots data for given member/user from all their calendars.
-
-    This includes the primary calendar and any linked calendars that have
-    'check_for_conflicts' enabled.
+    """Fetch the busy intervals of the given member, one stream per calendar.
 
     Args:
     member (str): User Appointment Availability name
@@ -78,34 +250,29 @@ def get_google_calendar_slots_member(
     endtime (datetime): end time
     date (datetime): date
     appointment_group (object): object
+    calendar_events_cache (dict, optional): Busy intervals prefetched for a date range
 
     Returns:
-    list: list of busy slots from all user's calendars
+    list: Lists of busy intervals sorted by start, one per calendar, or False if the primary calendar failed.
+    Linked calendars that missed the deadline of the request block the whole window or are left out, see
+    get_late_calendar_handling
     """
+    calendars_to_check = get_member_calendars(member)
 
-    if not member:
-        return []
-
-    # Get the User Appointment Availability document to access all calendars
-    try:
-        user_availability = frappe.get_doc("User Appointment Availability", member)
-    except frappe.DoesNotExistError:
-        return []
-
-    if not user_availability.google_calendar:
+    if not calendars_to_check:
         return []
 
-    # Collect all calendars to check: primary + linked calendars with check_for_conflicts enabled
-    calendars_to_check = [user_availability.google_calendar]
+    busy_streams = []
+    time_max, time_min = get_window_min_max_time(starttime, endtime, int(appointment_group.minimum_buffer_time or 0))
 
-    if user_availability.linked_calendars:
-        for linked_cal in user_availability.linked_calendars:
-            if linked_cal.check_for_conflicts and linked_cal.calendar:
-                calendars_to_check.append(linked_cal.calendar)
-
-    # Aggregate events from all calendars
-    all_range_events = []
-    time_max, time_min = get_today_min_max_time(date)
+    # Fetch the calendars that are not prefetched yet together, so that they can run in parallel
+    if calendar_events_cache is None or any(
+        (member, calendar_id) not in calendar_events_cache for calendar_id in calendars_to_check
+    ):
+        calendar_events_cache = {
+            **(calendar_events_cache or {}),
+            **fetch_calendar_events_for_members([member], [(time_min, time_max)], calendar_events_cache),
+        }
 
     for idx, calendar_id in enumerate(calendars_to_check):
         is_primary = (idx == 0)  # First calendar in the list is the primary
@@ -117,30 +284,549 @@ def get_google_calendar_slots_member(
             time_min=time_min,
             time_max=time_max,
             is_primary=is_primary,
+            calendar_events_cache=calendar_events_cache,
         )
 
         if calendar_events is False:
             if is_primary:
                 # Primary calendar fetch failed - this is critical, must return False
                 # to prevent showing false availability (could cause double-bookings)
-                frappe.log_error(
-                    title="Primary calendar fetch failed",
-                    message=f"Could not fetch events from primary calendar {calendar_id} for member {member}",
-                )
                 return False
             else:
-                # Linked calendar fetch failed - log and continue with others
+                # Linked calendar fetch failed - continue with others, the failure is counted by its circuit
                 # Linked calendars are secondary; their failure is less critical
-                frappe.log_error(
-                    title="Linked calendar fetch failed",
-                    message=f"Could not fetch events from linked calendar {calendar_id} for member {member}",
-                )
+                if is_calendar_late(calendar_id):
+                    # It did not answer within the deadline of the request, so its busy times are unknown
+                    mark_busy_data_degraded()
+
+                    if get_late_calendar_handling() == LATE_CALENDAR_TREAT_AS_BUSY:
+                        busy_streams.append(
+                            [BusyInterval(datetime_to_epoch(starttime), datetime_to_epoch(endtime), calendar_id)]
+                        )
+
                 continue
 
         if calendar_events:
-            all_range_events.extend(calendar_events)
+            busy_streams.append(calendar_events)
+
+    return busy_streams
+
+
+def get_member_calendars(member: str) -> list:
+    """Get the Google Calendars that block availability for the given member.
+
+    Args:
+    member (str): User Appointment Availability name
+
+    Returns:
+    list: Google Calendar names, the primary calendar first followed by linked calendars with
+    'check_for_conflicts' enabled
+    """
+    if not member:
+        return []
+
+    # Get the User Appointment Availability document to access all calendars
+    try:
+        user_availability = frappe.get_doc("User Appointment Availability", member)
+    except frappe.DoesNotExistError:
+        return []
+
+    if not user_availability.google_calendar:
+        return []
+
+    # Collect all calendars to check: primary + linked calendars with check_for_conflicts enabled
+    calendars_to_check = [user_availability.google_calendar]
+
+    if user_availability.linked_calendars:
+        for linked_cal in user_availability.linked_calendars:
+            if linked_cal.check_for_conflicts and linked_cal.calendar:
+                calendars_to_check.append(linked_cal.calendar)
+
+    return calendars_to_check
+
+
+def get_busy_source() -> str:
+    """Get the configured source of busy times: "Events" (events.list), "Free/Busy" (freebusy.query) or
+    "Local Mirror" (Google Calendar Mirror Event). Booking validation always lists the events from Google."""
+    if frappe.flags.appointment_live_busy_data:
+        return "Events"
+
+    return frappe.db.get_single_value("Appointment Settings", "busy_source") or "Events"
+
+
+def prefetch_calendar_events_for_range(appointment_group: object, time_windows: list) -> dict:
+    """Fetch the events of all calendars of the mandatory members for the working hours of a whole date range.
+
+    The result can be passed as `calendar_events_cache` to the day wise slot functions, which then slice
+    the busy intervals for each day in memory instead of calling Google again.
+
+    Args:
+    appointment_group (object): Appointment Group
+    time_windows (list): Disjoint (time_min, time_max) tuples in ascending order, see get_fetch_windows_for_range
+
+    Returns:
+    dict: (member, Google Calendar name) -> list of busy intervals, or False if the fetch failed
+    """
+    if not time_windows:
+        return {}
+
+    members = [member.user for member in appointment_group.members if member.is_mandatory]
+    calendar_events_cache = {}
+
+    if get_busy_source() == "Free/Busy":
+        # A free/busy query covers a single window, the nights in between are small in its response anyway
+        calendar_events_cache = get_free_busy_for_members(
+            members, appointment_group.event_creator, time_windows[0][0], time_windows[-1][1]
+        )
+
+    calendar_events_cache.update(fetch_calendar_events_for_members(members, time_windows, calendar_events_cache))
+
+    return calendar_events_cache
+
+
+def fetch_calendar_events_for_members(members: list, time_windows: list, calendar_events_cache: dict = None) -> dict:
+    """Fetch the busy intervals of all calendars of the given members that are not in the cache yet.
+
+    Every calendar is listed once even if it is shared by several members, and the Google requests run in
+    parallel when configured in Appointment Settings.
+
+    Args:
+    members (list): User Appointment Availability names
+    time_windows (list): Disjoint (time_min, time_max) tuples of ISO format times for Google API, in ascending order
+    calendar_events_cache (dict, optional): Busy intervals that are already fetched
+
+    Returns:
+    dict: (member, Google Calendar name) -> list of busy intervals, or False if the fetch failed
+    """
+    calendar_events_cache = calendar_events_cache or {}
+
+    member_calendars = [
+        (member, calendar_id, idx == 0)
+        for member in members
+        for idx, calendar_id in enumerate(get_member_calendars(member))
+        if (member, calendar_id) not in calendar_events_cache
+    ]
+
+    google_calendars = {}
+
+    for _member, calendar_id, _is_primary in member_calendars:
+        if calendar_id in google_calendars:
+            continue
+
+        try:
+            google_calendars[calendar_id] = frappe.get_doc("Google Calendar", calendar_id)
+        except frappe.DoesNotExistError:
+            google_calendars[calendar_id] = None
+
+    calendar_events = {}
+
+    if get_busy_source() == "Local Mirror":
+        calendar_events.update(
+            get_mirrored_calendar_events(
+                [calendar_id for calendar_id, google_calendar in google_calendars.items() if google_calendar],
+                time_windows[0][0],
+                time_windows[-1][1],
+            )
+        )
+
+    allow_stale = is_stale_busy_data_allowed()
+
+    for calendar_id, google_calendar in google_calendars.items():
+        # Booking validation always asks Google
+        if not google_calendar or calendar_id in calendar_events or frappe.flags.appointment_live_busy_data:
+            continue
+
+        cached_events = get_cached_calendar_events(calendar_id, time_windows)
+
+        if cached_events is None and allow_stale:
+            cached_events = get_cached_calendar_events(calendar_id, time_windows, allow_stale=True)
+
+            if cached_events is not None:
+                mark_busy_data_stale()
+                enqueue_busy_cache_refresh(calendar_id, time_windows)
+
+        if cached_events is not None:
+            calendar_events[calendar_id] = cached_events
+
+    # Concurrent requests for the same calendar and windows share a single fetch
+    windows_key = ",".join(f"{time_min}/{time_max}" for time_min, time_max in time_windows)
+    flight_calendars = {
+        f"{calendar_id}|{windows_key}": google_calendar
+        for calendar_id, google_calendar in google_calendars.items()
+        if google_calendar and calendar_id not in calendar_events
+    }
+
+    def fetch(keys: list) -> dict:
+        fetched_events = fetch_and_cache_calendar_events([flight_calendars[key] for key in keys], time_windows)
+        return {key: fetched_events[flight_calendars[key].name] for key in keys}
+
+    _workers, timeout = get_calendar_fetch_settings()
+
+    if frappe.flags.appointment_live_busy_data:
+        # A shared fetch may have started before the latest change of the calendar
+        fetched_events = fetch(list(flight_calendars))
+    else:
+        fetched_events = run_coalesced(list(flight_calendars), fetch, limit_to_deadline(timeout))
+
+    for key, events in fetched_events.items():
+        calendar_events[flight_calendars[key].name] = events
+
+    return {
+        (member, calendar_id): get_member_busy_intervals(calendar_events[calendar_id], calendar_id, member, is_primary)
+        if google_calendars[calendar_id]
+        else False
+        for member, calendar_id, is_primary in member_calendars
+    }
+
+
+def fetch_and_cache_calendar_events(google_calendars: list, time_windows: list) -> dict:
+    """List the events of the given calendars from Google, normalize and cache them.
+
+    Args:
+    google_calendars (list): Google Calendar documents
+    time_windows (list): (time_min, time_max) tuples of ISO format times for Google API
+
+    Returns:
+    dict: Google Calendar name -> list of calendar events, or False if the fetch failed
+    """
+    calendar_events = {}
+    google_calendars_by_name = {google_calendar.name: google_calendar for google_calendar in google_calendars}
+
+    for calendar_id, events in list_events_for_calendars(google_calendars, time_windows).items():
+        calendar_events[calendar_id] = normalize_calendar_events(events, google_calendars_by_name[calendar_id])
+        cache_calendar_events(calendar_id, time_windows, calendar_events[calendar_id])
+
+    return calendar_events
+
+
+def cache_calendar_events(calendar_id: str, time_windows: list, calendar_events: list):
+    """Cache freshly fetched calendar events, unless the fetch failed or an event could not be converted.
+
+    Args:
+    calendar_id (str): Google Calendar name
+    time_windows (list): (time_min, time_max) tuples the events were fetched for
+    calendar_events (list): Calendar events, or False if the fetch failed
+    """
+    if calendar_events is not False and all(calendar_event.start_utc is not None for calendar_event in calendar_events):
+        set_cached_calendar_events(calendar_id, time_windows, calendar_events)
+
+
+def enqueue_busy_cache_refresh(calendar_id: str, time_windows: list):
+    """Refresh the cached events of a calendar in the background, after expired ones were served.
+
+    Args:
+    calendar_id (str): Google Calendar name
+    time_windows (list): (time_min, time_max) tuples of ISO format times for Google API
+    """
+    frappe.enqueue(
+        refresh_busy_cache,
+        queue="short",
+        calendar_id=calendar_id,
+        time_windows=time_windows,
+        job_id=f"refresh_busy_cache|{calendar_id}|{time_windows[0][0]}|{time_windows[-1][1]}",
+        deduplicate=True,
+    )
+
+
+def refresh_busy_cache(calendar_id: str, time_windows: list):
+    """Fetch the events of a calendar from Google and cache them.
+
+    Args:
+    calendar_id (str): Google Calendar name
+    time_windows (list): (time_min, time_max) tuples of ISO format times for Google API
+    """
+    fetch_and_cache_calendar_events([frappe.get_doc("Google Calendar", calendar_id)], time_windows)
+
+
+def get_mirrored_calendar_events(calendar_ids: list, time_min: str, time_max: str) -> dict:
+    """Read the calendar events of the given calendars from their local mirror.
+
+    Args:
+    calendar_ids (list): Google Calendar names
+    time_min (str): ISO format time min
+    time_max (str): ISO format time max
+
+    Returns:
+    dict: Google Calendar name -> list of calendar events, only for calendars with a recently synced mirror
+    """
+    if not calendar_ids:
+        return {}
+
+    synced_calendar_ids = frappe.get_all(
+        GOOGLE_CALENDAR_MIRROR,
+        filters={
+            "name": ["in", calendar_ids],
+            "sync_token": ["is", "set"],
+            "last_synced_on": [">=", now_datetime() - GOOGLE_CALENDAR_MIRROR_MAX_AGE],
+        },
+        pluck="name",
+    )
+
+    if not synced_calendar_ids:
+        return {}
+
+    calendar_events = {calendar_id: [] for calendar_id in synced_calendar_ids}
+
+    # The mirror keeps times as naive UTC datetimes
+    mirrored_events = frappe.get_all(
+        GOOGLE_CALENDAR_MIRROR_EVENT,
+        filters={
+            "google_calendar": ["in", synced_calendar_ids],
+            "start": ["<", parse_utc_datetime(time_max).replace(tzinfo=None)],
+            "end": [">", parse_utc_datetime(time_min).replace(tzinfo=None)],
+        },
+        fields=["google_calendar", "start", "end", "all_day", "ical_uid", "creator", "response_status"],
+        order_by="start asc",
+    )
+
+    for mirrored_event in mirrored_events:
+        calendar_events[mirrored_event.google_calendar].append(
+            CalendarEvent(
+                None if mirrored_event.all_day else datetime_to_epoch(pytz.utc.localize(mirrored_event.start)),
+                None if mirrored_event.all_day else datetime_to_epoch(pytz.utc.localize(mirrored_event.end)),
+                mirrored_event.ical_uid,
+                mirrored_event.creator,
+                mirrored_event.response_status or None,
+            )
+        )
+
+    return calendar_events
+
+
+def get_free_busy_for_members(members: list, event_creator: str, time_min: str, time_max: str) -> dict:
+    """Query the busy intervals of all calendars of the given members with a single freebusy request.
+
+    The query runs with the credentials of the event creator, so it only covers the calendars that are
+    visible to that account. Google leaves out transparent events and invites the calendar owner has
+    declined.
+
+    Args:
+    members (list): User Appointment Availability names
+    event_creator (str): Google Calendar name whose credentials are used for the query
+    time_min (str): ISO format time min for Google API
+    time_max (str): ISO format time max for Google API
+
+    Returns:
+    dict: (member, Google Calendar name) -> list of busy intervals. Calendars for which Google returned an
+    error are left out, so that they fall back to events.list.
+    """
+    if not event_creator:
+        return {}
+
+    google_calendar_ids = {}
+
+    for member in members:
+        for calendar_id in get_member_calendars(member):
+            if calendar_id not in google_calendar_ids:
+                google_calendar_ids[calendar_id] = frappe.db.get_value(
+                    "Google Calendar", calendar_id, "google_calendar_id"
+                )
+
+    query_ids = list({google_calendar_id for google_calendar_id in google_calendar_ids.values() if google_calendar_id})
+
+    if not query_ids or not allow_calendar_request(event_creator):
+        return {}
+
+    try:
+        google_calendar_api_obj, _account = get_google_calendar_object(event_creator)
+    except Exception as err:
+        record_calendar_failure(event_creator, f"Could not create Google Calendar API object: {err}")
+        return {}
+
+    busy_slots = {}
+
+    google_requests = {
+        index: google_calendar_api_obj.freebusy().query(
+            body={
+                "timeMin": time_min,
+                "timeMax": time_max,
+                "timeZone": "UTC",
+                "items": [{"id": query_id} for query_id in query_ids[index : index + FREE_BUSY_MAX_CALENDARS]],
+            }
+        )
+        for index in range(0, len(query_ids), FREE_BUSY_MAX_CALENDARS)
+    }
+
+    for availability, err in execute_google_requests(
+        google_requests, {index: event_creator for index in google_requests}
+    ).values():
+        if err:
+            record_calendar_failure(event_creator, f"Free/busy query failed, error: {get_error_status(err)}")
+            continue
+
+        record_calendar_success(event_creator)
+
+        for google_calendar_id, calendar_availability in availability.get("calendars", {}).items():
+            if calendar_availability.get("errors"):
+                continue
+
+            busy_slots[google_calendar_id] = sorted(
+                (
+                    datetime_to_epoch(parse_utc_datetime(busy["start"])),
+                    datetime_to_epoch(parse_utc_datetime(busy["end"])),
+                )
+                for busy in calendar_availability.get("busy", [])
+            )
 
-    return all_range_events
+    return {
+        (member, calendar_id): [BusyInterval(start, end, calendar_id) for start, end in busy_slots[google_calendar_id]]
+        for member in members
+        for calendar_id in get_member_calendars(member)
+        if google_calendar_ids.get(calendar_id) in busy_slots
+    }
+
+
+def list_events_for_calendars(google_calendars: list, time_windows: list) -> dict:
+    """Call the Google Calendar API to list the events of the given calendars in the given windows.
+
+    Args:
+    google_calendars (list): Google Calendar documents
+    time_windows (list): (time_min, time_max) tuples of ISO format times for Google API, in ascending order
+
+    Returns:
+    dict: Google Calendar name -> iterator over the raw Google events, or False on error. The first page of all
+    calendars and windows is fetched here, further pages are fetched while iterating.
+    """
+    raw_events = {}
+    events_apis = {}
+    google_requests = {}
+
+    for google_calendar in google_calendars:
+        # Once the deadline of the request passed, Google is not asked anymore
+        if is_request_deadline_exceeded():
+            mark_calendar_late(google_calendar.name)
+            raw_events[google_calendar.name] = False
+            continue
+
+        # Calendars that keep failing are skipped until their circuit lets a trial request through
+        if not allow_calendar_request(google_calendar.name):
+            raw_events[google_calendar.name] = False
+            continue
+
+        events_list_requests = _build_events_list_requests(google_calendar, time_windows)
+
+        if events_list_requests is False:
+            raw_events[google_calendar.name] = False
+            continue
+
+        events_apis[google_calendar.name], window_requests = events_list_requests
+
+        for index, google_request in enumerate(window_requests):
+            google_requests[(google_calendar.name, index)] = google_request
+
+    window_events = {}
+
+    for (calendar_id, index), (response, err) in execute_google_requests(
+        google_requests, {key: key[0] for key in google_requests}
+    ).items():
+        if raw_events.get(calendar_id) is False:
+            continue
+
+        if err:
+            if is_deadline_error(err):
+                # Being too slow for the deadline of a request does not count against the calendar's circuit
+                mark_calendar_late(calendar_id)
+            else:
+                record_events_fetch_failure(calendar_id, err)
+
+            raw_events[calendar_id] = False
+        else:
+            window_events.setdefault(calendar_id, {})[index] = _iter_events_pages(
+                calendar_id, events_apis[calendar_id], google_requests[(calendar_id, index)], response
+            )
+
+    for calendar_id, events in window_events.items():
+        if calendar_id not in raw_events:
+            record_calendar_success(calendar_id)
+            # An event spanning several windows is listed once per window
+            raw_events[calendar_id] = chain.from_iterable([events[index] for index in sorted(events)])
+
+    return raw_events
+
+
+def _iter_events_pages(calendar_id: str, events_api: object, google_request: object, response: dict) -> Iterator:
+    """Yield the raw Google events of a listing page by page, so only one page is held in memory at a time.
+
+    Args:
+    calendar_id (str): Google Calendar name
+    events_api (object): events() resource the request was built from
+    google_request (object): events().list request of the first page
+    response (dict): Response of the first page
+
+    Raises:
+    GoogleBadRequest: If a further page could not be fetched
+    """
+    while True:
+        yield from response.get("items", [])
+
+        google_request = events_api.list_next(google_request, response)
+
+        if google_request is None:
+            return
+
+        _workers, timeout = get_calendar_fetch_settings()
+
+        try:
+            response = execute_google_request(google_request, calendar_id, timeout)
+        except Exception as err:
+            record_events_fetch_failure(calendar_id, err)
+            raise GoogleBadRequest(calendar_id) from err
+
+
+def record_events_fetch_failure(calendar_id: str, err: Exception):
+    record_calendar_failure(calendar_id, f"Could not fetch events, error: {get_error_status(err)}")
+
+
+def get_error_status(err: Exception) -> str:
+    """Get the HTTP status of a failed Google API request, or the kind of error if it has none."""
+    return str(getattr(getattr(err, "resp", None), "status", None) or type(err).__name__)
+
+
+def _list_calendar_events(google_calendar: object, time_min: str, time_max: str) -> list:
+    """Call the Google Calendar API to list the events of a calendar in the given window.
+
+    Args:
+    google_calendar (object): Google Calendar document
+    time_min (str): ISO format time min for Google API
+    time_max (str): ISO format time max for Google API
+
+    Returns:
+    Iterator: Raw Google events, or False on error
+    """
+    return list_events_for_calendars([google_calendar], [(time_min, time_max)])[google_calendar.name]
+
+
+def _build_events_list_requests(google_calendar: object, time_windows: list) -> object:
+    """Build the events().list requests of a calendar for the given windows without executing them.
+
+    Args:
+    google_calendar (object): Google Calendar document
+    time_windows (list): (time_min, time_max) tuples of ISO format times for Google API
+
+    Returns:
+    tuple: (events() resource, googleapiclient HttpRequests in the order of the windows), or False if the API
+    object could not be created
+    """
+    try:
+        google_calendar_api_obj, _account = get_google_calendar_object(google_calendar.name)
+    except Exception as err:
+        record_calendar_failure(google_calendar.name, f"Could not create Google Calendar API object: {err}")
+        return False
+
+    events_api = google_calendar_api_obj.events()
+
+    return events_api, [
+        events_api.list(
+            calendarId=google_calendar.google_calendar_id,
+            maxResults=EVENTS_LIST_PAGE_SIZE,
+            singleEvents=True,
+            timeMax=time_max,
+            timeMin=time_min,
+            orderBy="startTime",
+            fields=EVENTS_LIST_FIELDS,
+        )
+        for time_min, time_max in time_windows
+    ]
 
 
 def _fetch_events_from_calendar(
@@ -151,6 +837,7 @@ def _fetch_events_from_calendar(
     time_min: str,
     time_max: str,
     is_primary: bool = True,
+    calendar_events_cache: dict = None,
 ) -> list:
     """Fetch events from a single Google Calendar.
 
@@ -162,124 +849,174 @@ def _fetch_events_from_calendar(
     time_min (str): ISO format time min for Google API
     time_max (str): ISO format time max for Google API
     is_primary (bool): True if this is the primary calendar (applies stricter event filtering)
+    calendar_events_cache (dict, optional): Busy intervals prefetched for a date range
 
     Returns:
-    list: List of events in range, or False on error
+    list: List of busy intervals in range, or False on error
     """
-    try:
-        google_calendar = frappe.get_doc("Google Calendar", calendar_id)
-    except frappe.DoesNotExistError:
-        return False
+    if calendar_events_cache is not None and (member, calendar_id) in calendar_events_cache:
+        busy_intervals = calendar_events_cache[(member, calendar_id)]
+    else:
+        try:
+            google_calendar = frappe.get_doc("Google Calendar", calendar_id)
+        except frappe.DoesNotExistError:
+            return False
 
-    try:
-        google_calendar_api_obj, account = get_google_calendar_object(google_calendar.name)
-    except Exception:
-        frappe.log_error(
-            title="Google Calendar API Error",
-            message=f"Could not create Google Calendar API object for {calendar_id}",
+        busy_intervals = ingest_calendar_events(
+            _list_calendar_events(google_calendar, time_min, time_max), google_calendar, member, is_primary
         )
+
+    if busy_intervals is False:
+        return False
+
+    start_epoch, end_epoch = datetime_to_epoch(starttime), datetime_to_epoch(endtime)
+
+    return [
+        busy_interval
+        for busy_interval in busy_intervals
+        if check_if_datetime_in_range(busy_interval.start_utc, busy_interval.end_utc, start_epoch, end_epoch)
+    ]
+
+
+def ingest_calendar_events(events: list, google_calendar: object, member: str, is_primary: bool = True) -> list:
+    """Convert raw Google events into busy intervals, parsing the RFC3339 times of every event exactly once.
+
+    Args:
+    events (list): Raw Google events, or False if the fetch failed
+    google_calendar (object): Google Calendar document the events belong to
+    member (str): User Appointment Availability name (for filtering events)
+    is_primary (bool): True if this is the primary calendar (applies stricter event filtering)
+
+    Returns:
+    list: List of busy intervals sorted by start, or False on error
+    """
+    return get_member_busy_intervals(
+        normalize_calendar_events(events, google_calendar), google_calendar.name, member, is_primary
+    )
+
+
+def normalize_calendar_events(events: list, google_calendar: object) -> list:
+    """Reduce raw Google events to calendar events, independent of the member the calendar belongs to.
+
+    Args:
+    events (Iterable): Raw Google events, or False if the fetch failed
+    google_calendar (object): Google Calendar document the events belong to
+
+    Returns:
+    list: List of calendar events, or False if the fetch failed
+    """
+    if events is False:
         return False
 
+    calendar_events = []
+
     try:
-        events = (
-            google_calendar_api_obj.events()
-            .list(
-                calendarId=google_calendar.google_calendar_id,
-                maxResults=2000,
-                singleEvents=True,
-                timeMax=time_max,
-                timeMin=time_min,
-                orderBy="startTime",
-            )
-            .execute()
-        )
-    except Exception as err:
-        error_status = getattr(getattr(err, "resp", None), "status", "unknown")
-        frappe.log_error(
-            title="Google Calendar Fetch Error",
-            message=f"Could not fetch events from {calendar_id}, error: {error_status}",
-        )
+        for event in events:
+            calendar_event = normalize_calendar_event(event, google_calendar)
+
+            if calendar_event is not None:
+                calendar_events.append(calendar_event)
+    except GoogleBadRequest:
+        # A later page of the listing could not be fetched
         return False
 
-    events_items = events.get("items", [])
-    range_events = []
+    return calendar_events
 
-    for event in events_items:
-        try:
-            # For the primary calendar, apply strict attendee filtering (original behavior):
-            # - Skip events where user is not the creator AND not an attendee
-            # For linked/external calendars, include all events as busy
-            creator = event.get("creator", {}).get("email")
-            if creator != member:
-                attendees = event.get("attendees", [])
-                filtered_attendees = [attendee for attendee in attendees if attendee.get("self", False)]
-
-                if len(filtered_attendees) > 0:
-                    attendee = filtered_attendees[0]
-
-                    if attendee.get("responseStatus") == "declined":
-                        continue
-                else:
-                    # For primary calendar: skip if not creator and not an attendee (original behavior)
-                    # For linked calendars: include all events (they block availability)
-                    if is_primary:
-                        continue
-
-            if check_if_datetime_in_range(
-                convert_timezone_to_utc(event["start"]["dateTime"], event["start"]["timeZone"]),
-                convert_timezone_to_utc(event["end"]["dateTime"], event["end"]["timeZone"]),
-                starttime,
-                endtime,
-            ):
-                range_events.append(event)
-        except Exception:
-            # Handle all-day events which don't have timeZone
-            if "timeZone" not in event.get("start", {}) and google_calendar.custom_ignore_all_day_events:
-                pass
-            else:
-                return False
 
-    return range_events
+def normalize_calendar_event(event: dict, google_calendar: object) -> CalendarEvent | None:
+    """Reduce a raw Google event to a calendar event.
+
+    Args:
+    event (dict): Raw Google event
+    google_calendar (object): Google Calendar document the event belongs to
+
+    Returns:
+    CalendarEvent: Calendar event, or None if the event is ignored
+    """
+    # Events shown as free never block anyone, like in a freebusy query
+    if event.get("transparency") == "transparent":
+        return None
+
+    filtered_attendees = [attendee for attendee in event.get("attendees", []) if attendee.get("self", False)]
+    response_status = (filtered_attendees[0].get("responseStatus") or "needsAction") if filtered_attendees else None
+
+    try:
+        start_utc = datetime_to_epoch(convert_event_time_to_utc(event["start"]))
+        end_utc = datetime_to_epoch(convert_event_time_to_utc(event["end"]))
+    except Exception:
+        # Handle all-day events which don't have timeZone
+        if "timeZone" not in event.get("start", {}) and google_calendar.custom_ignore_all_day_events:
+            return None
+
+        # Only fails the fetch if the event turns out to block the member
+        start_utc = end_utc = None
+
+    return CalendarEvent(
+        start_utc,
+        end_utc,
+        event.get("iCalUID"),
+        event.get("creator", {}).get("email"),
+        response_status,
+    )
+
 
+def is_member_busy(creator: str, response_status: str, member: str, is_primary: bool) -> bool:
+    """Check if an event blocks the member.
 
-def remove_duplicate_slots(cal_slots: list):
-    """Remove duplicate from google slots
+    For the primary calendar, apply strict attendee filtering (original behavior): skip events where the user is not
+    the creator and not an attendee. For linked/external calendars, include all events as busy. Declined invites
+    never block.
 
     Args:
-    cal_slots (list): List of time slots
+    creator (str): Email of the event creator
+    response_status (str): Response of the calendar owner, None if the owner is not an attendee
+    member (str): User Appointment Availability name
+    is_primary (bool): True if the event is from the primary calendar of the member
 
     Returns:
-    _type_: List of time slots
+    bool: True if the event blocks the member
     """
-    if len(cal_slots) <= 1:
-        return cal_slots
+    if creator == member:
+        return True
 
-    current = 1
-    last = 0
-    remove_duplicate_time_slots = []
+    if response_status is None:
+        return not is_primary
 
-    remove_duplicate_time_slots.append(cal_slots[last])
+    return response_status != "declined"
 
-    while current < len(cal_slots):
-        last_start = convert_timezone_to_utc(cal_slots[last]["start"]["dateTime"], cal_slots[last]["start"]["timeZone"])
-        last_end = convert_timezone_to_utc(cal_slots[last]["end"]["dateTime"], cal_slots[last]["end"]["timeZone"])
-        current_start = convert_timezone_to_utc(
-            cal_slots[current]["start"]["dateTime"],
-            cal_slots[current]["start"]["timeZone"],
-        )
-        current_end = convert_timezone_to_utc(
-            cal_slots[current]["end"]["dateTime"], cal_slots[current]["end"]["timeZone"]
-        )
 
-        if current_start == last_start and current_end == last_end:
-            current += 1
+def get_member_busy_intervals(calendar_events: list, calendar_id: str, member: str, is_primary: bool = True) -> list:
+    """Select the calendar events that block the member as busy intervals.
+
+    Args:
+    calendar_events (list): Calendar events, or False if the fetch failed
+    calendar_id (str): Google Calendar name the events belong to
+    member (str): User Appointment Availability name
+    is_primary (bool): True if this is the primary calendar (applies stricter event filtering)
+
+    Returns:
+    list: List of busy intervals sorted by start, or False on error
+    """
+    if calendar_events is False:
+        return False
+
+    busy_intervals = []
+
+    for calendar_event in calendar_events:
+        if not is_member_busy(calendar_event.creator, calendar_event.response_status, member, is_primary):
             continue
 
-        remove_duplicate_time_slots.append(cal_slots[current])
-        last = current
-        current += 1
+        if calendar_event.start_utc is None:
+            return False
+
+        busy_intervals.append(
+            BusyInterval(calendar_event.start_utc, calendar_event.end_utc, calendar_id, calendar_event.ical_uid)
+        )
+
+    # Events are listed by start time already, so this is a linear pass that only guards the merge order
+    busy_intervals.sort(key=attrgetter("start_utc"))
 
-    return remove_duplicate_time_slots
+    return busy_intervals
 
 
 def is_busy_event(event: object, availability: object, user: str):
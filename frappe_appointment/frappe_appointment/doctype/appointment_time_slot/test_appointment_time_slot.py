@@ -0,0 +1,130 @@
+# Copyright (c) 2026, rtCamp and Contributors
+# See license.txt
+
+from datetime import datetime
+from unittest.mock import patch
+
+import frappe
+import pytz
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_appointment.frappe_appointment.doctype.appointment_time_slot.appointment_time_slot import (
+    MEMBER_FETCH_BATCH_SIZE,
+    BusyInterval,
+    fetch_calendar_events_for_members,
+    get_all_unavailable_google_calendar_slots_for_day,
+    get_busy_source,
+)
+from frappe_appointment.helpers.utils import datetime_to_epoch
+
+TEST_CALENDAR = "_Test Live Busy Data Calendar"
+APPOINTMENT_TIME_SLOT_MODULE = (
+    "frappe_appointment.frappe_appointment.doctype.appointment_time_slot.appointment_time_slot"
+)
+
+
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.get_calendar_fetch_settings", return_value=(1, 10))
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.get_member_calendars", return_value=[TEST_CALENDAR])
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.frappe.get_doc", return_value=frappe._dict(name=TEST_CALENDAR))
+@patch(
+    f"{APPOINTMENT_TIME_SLOT_MODULE}.frappe.db.get_single_value",
+    side_effect=lambda doctype, fieldname: {"busy_source": "Local Mirror", "busy_stale_ttl": 300}.get(fieldname),
+)
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.fetch_and_cache_calendar_events", return_value={TEST_CALENDAR: []})
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.run_coalesced", return_value={})
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.get_cached_calendar_events", return_value=None)
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.get_mirrored_calendar_events", return_value={})
+class TestLiveBusyData(FrappeTestCase):
+    def tearDown(self):
+        frappe.flags.appointment_live_busy_data = False
+
+    def test_booking_validation_reads_google(
+        self, get_mirrored_calendar_events, get_cached_calendar_events, run_coalesced, fetch_and_cache, *_mocks
+    ):
+        frappe.flags.appointment_live_busy_data = True
+        busy_intervals = fetch_calendar_events_for_members(
+            ["member@example.com"], [("2024-05-06T09:00:00Z", "2024-05-06T17:00:00Z")]
+        )
+
+        self.assertEqual(busy_intervals, {("member@example.com", TEST_CALENDAR): []})
+        self.assertEqual(get_busy_source(), "Events")
+
+        # Neither the mirror, the busy cache nor a fetch shared with other requests can be out of date
+        get_mirrored_calendar_events.assert_not_called()
+        get_cached_calendar_events.assert_not_called()
+        run_coalesced.assert_not_called()
+        fetch_and_cache.assert_called_once()
+
+    def test_slot_listing_uses_the_configured_source(
+        self, get_mirrored_calendar_events, _get_cached_calendar_events, _run_coalesced, fetch_and_cache, *_mocks
+    ):
+        get_mirrored_calendar_events.return_value = {TEST_CALENDAR: []}
+        fetch_calendar_events_for_members(["member@example.com"], [("2024-05-06T09:00:00Z", "2024-05-06T17:00:00Z")])
+
+        self.assertEqual(get_busy_source(), "Local Mirror")
+        get_mirrored_calendar_events.assert_called_once()
+        fetch_and_cache.assert_not_called()
+
+
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.set_member_busy_ratio")
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.get_busy_source", return_value="Google Calendar")
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.is_concurrent_fetch_enabled", return_value=True)
+@patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.fetch_calendar_events_for_members", return_value={})
+class TestBusiestFirstFetch(FrappeTestCase):
+    def setUp(self):
+        self.starttime = datetime(2024, 5, 6, 9, tzinfo=pytz.utc)
+        self.endtime = datetime(2024, 5, 6, 17, tzinfo=pytz.utc)
+        self.members = [f"_test_busiest_first_{index}@example.com" for index in range(10)]
+        self.busy_members = set()
+        self.fetched_members = []
+
+        patcher = patch(
+            f"{APPOINTMENT_TIME_SLOT_MODULE}.get_member_busy_ratios",
+            return_value={member: 1 - index / 10 for index, member in enumerate(self.members)},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch(f"{APPOINTMENT_TIME_SLOT_MODULE}.get_member_busy_streams", side_effect=self.get_busy_streams)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_busy_streams(self, member, *args) -> list:
+        self.fetched_members.append(member)
+
+        if member not in self.busy_members:
+            return []
+
+        return [[BusyInterval(datetime_to_epoch(self.starttime), datetime_to_epoch(self.endtime), member)]]
+
+    def get_busy_intervals(self):
+        return get_all_unavailable_google_calendar_slots_for_day(
+            dict.fromkeys(reversed(self.members)),
+            self.starttime,
+            self.endtime,
+            self.starttime,
+            frappe._dict(duration_for_event=1800, minimum_buffer_time=0),
+        )
+
+    def test_settled_day_stops_fetching_further_batches(self, fetch_calendar_events_for_members, *_mocks):
+        self.busy_members.add(self.members[2])
+
+        self.assertTrue(self.get_busy_intervals())
+
+        self.assertEqual(self.fetched_members, self.members[:3])
+        self.assertEqual(
+            [call.args[0] for call in fetch_calendar_events_for_members.call_args_list],
+            [self.members[1 : 1 + MEMBER_FETCH_BATCH_SIZE]],
+        )
+
+    def test_free_members_are_fetched_in_batches_busiest_first(self, fetch_calendar_events_for_members, *_mocks):
+        self.get_busy_intervals()
+
+        self.assertEqual(self.fetched_members, self.members)
+        self.assertEqual(
+            [call.args[0] for call in fetch_calendar_events_for_members.call_args_list],
+            [
+                self.members[index : index + MEMBER_FETCH_BATCH_SIZE]
+                for index in range(1, len(self.members), MEMBER_FETCH_BATCH_SIZE)
+            ],
+        )
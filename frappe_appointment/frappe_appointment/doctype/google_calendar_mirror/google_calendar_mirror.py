@@ -0,0 +1,448 @@
+# Copyright (c) 2026, rtCamp and contributors
+# For license information, please see license.txt
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import get_datetime, get_url, now_datetime
+from googleapiclient.errors import HttpError
+
+from frappe_appointment.constants import (
+    APPOINTMENT_GROUP,
+    GOOGLE_CALENDAR_MIRROR,
+    GOOGLE_CALENDAR_MIRROR_EVENT,
+    USER_APPOINTMENT_AVAILABILITY,
+)
+from frappe_appointment.frappe_appointment.doctype.appointment_time_slot.appointment_time_slot import (
+    GOOGLE_EVENT_FIELDS,
+    get_busy_source,
+    normalize_calendar_event,
+)
+from frappe_appointment.helpers.busy_cache import invalidate_calendar_busy_cache
+from frappe_appointment.helpers.google_api_quota import execute_google_request
+from frappe_appointment.helpers.google_calendar import get_google_calendar_object
+from frappe_appointment.helpers.utils import epoch_to_utc_datetime
+
+# A full sync mirrors events from this long ago onwards, and older events are pruned from the mirror
+GOOGLE_CALENDAR_MIRROR_HISTORY = timedelta(days=1)
+
+# Google keeps a watch channel open for at most a week, channels are renewed when they expire within a day
+GOOGLE_CALENDAR_CHANNEL_TTL = timedelta(days=7)
+GOOGLE_CALENDAR_CHANNEL_RENEW_BEFORE = timedelta(days=1)
+
+PUSH_NOTIFICATION_ENDPOINT = "/api/method/frappe_appointment.api.google_calendar.receive_push_notification"
+
+MIRROR_EVENT_FIELDS = [
+    "name",
+    "google_calendar",
+    "event_id",
+    "ical_uid",
+    "start",
+    "end",
+    "all_day",
+    "creator",
+    "response_status",
+]
+
+
+class GoogleCalendarMirror(Document):
+    pass
+
+
+def sync_google_calendar_mirrors():
+    """Scheduler job that queues an incremental sync for every calendar used by a User Appointment Availability."""
+    if get_busy_source() != "Local Mirror":
+        return
+
+    for google_calendar in get_mirrored_google_calendars():
+        frappe.enqueue(
+            sync_google_calendar_mirror,
+            queue="long",
+            job_id=f"sync_google_calendar_mirror::{google_calendar}",
+            deduplicate=True,
+            google_calendar=google_calendar,
+        )
+
+
+def get_mirrored_google_calendars() -> list:
+    """Get the primary calendars and the linked calendars with 'check_for_conflicts' of all users.
+
+    Returns:
+    list: Google Calendar names
+    """
+    google_calendars = frappe.get_all(
+        USER_APPOINTMENT_AVAILABILITY, filters={"google_calendar": ["is", "set"]}, pluck="google_calendar"
+    )
+    google_calendars += frappe.get_all(
+        "Linked Calendar",
+        filters={"parenttype": USER_APPOINTMENT_AVAILABILITY, "check_for_conflicts": 1, "calendar": ["is", "set"]},
+        pluck="calendar",
+    )
+
+    return list(dict.fromkeys(google_calendars))
+
+
+def sync_google_calendar_mirror(google_calendar: str):
+    """Bring the mirror of a Google Calendar up to date.
+
+    The first sync lists all upcoming events, every later sync only asks Google for the events that changed since
+    the previous one with its sync token. When Google expires the token, the mirror is rebuilt with a full sync.
+
+    Args:
+    google_calendar (str): Google Calendar name
+    """
+    google_calendar = frappe.get_doc("Google Calendar", google_calendar)
+
+    mirror = get_google_calendar_mirror(google_calendar.name)
+
+    try:
+        google_calendar_api_obj, _account = get_google_calendar_object(google_calendar.name)
+    except Exception:
+        frappe.log_error(
+            title="Google Calendar API Error",
+            message=f"Could not create Google Calendar API object for {google_calendar.name}",
+        )
+        return
+
+    try:
+        events, next_sync_token = list_changed_events(google_calendar_api_obj, google_calendar, mirror.sync_token)
+    except HttpError as err:
+        if err.resp.status != 410 or not mirror.sync_token:
+            frappe.log_error(
+                title="Google Calendar Sync Error",
+                message=f"Could not sync events of {google_calendar.name}, error: {err.resp.status}",
+            )
+            return
+
+        # The sync token expired, start over with a full sync
+        mirror.sync_token = None
+        events, next_sync_token = list_changed_events(google_calendar_api_obj, google_calendar, None)
+
+    if not mirror.sync_token:
+        frappe.db.delete(GOOGLE_CALENDAR_MIRROR_EVENT, {"google_calendar": google_calendar.name})
+
+    apply_changed_events(google_calendar, events)
+
+    frappe.db.delete(
+        GOOGLE_CALENDAR_MIRROR_EVENT,
+        {"google_calendar": google_calendar.name, "end": ["<", now_datetime_utc() - GOOGLE_CALENDAR_MIRROR_HISTORY]},
+    )
+
+    mirror.sync_token = next_sync_token
+    mirror.last_synced_on = now_datetime()
+    mirror.save(ignore_permissions=True)
+
+
+def get_google_calendar_mirror(google_calendar: str) -> Document:
+    """Get the mirror of a Google Calendar, or a new unsaved one if the calendar has none yet."""
+    if frappe.db.exists(GOOGLE_CALENDAR_MIRROR, google_calendar):
+        return frappe.get_doc(GOOGLE_CALENDAR_MIRROR, google_calendar)
+
+    return frappe.get_doc({"doctype": GOOGLE_CALENDAR_MIRROR, "google_calendar": google_calendar})
+
+
+def list_changed_events(google_calendar_api_obj: object, google_calendar: object, sync_token: str | None) -> tuple:
+    """List the events of a calendar that changed since the sync token, or all upcoming events without one.
+
+    Args:
+    google_calendar_api_obj (object): Google Calendar API object
+    google_calendar (object): Google Calendar document
+    sync_token (str | None): Sync token of the previous sync
+
+    Returns:
+    tuple: (raw Google events including cancelled ones, sync token for the next sync)
+    """
+    params = {
+        "calendarId": google_calendar.google_calendar_id,
+        "singleEvents": True,
+        "maxResults": 2500,
+        "fields": f"items({GOOGLE_EVENT_FIELDS}),nextPageToken,nextSyncToken",
+    }
+
+    if sync_token:
+        params["syncToken"] = sync_token
+    else:
+        params["timeMin"] = (now_datetime_utc() - GOOGLE_CALENDAR_MIRROR_HISTORY).isoformat() + "Z"
+
+    events = []
+    next_sync_token = None
+    events_api = google_calendar_api_obj.events()
+    request = events_api.list(**params)
+
+    while request is not None:
+        response = execute_google_request(request, google_calendar.name)
+        events.extend(response.get("items", []))
+        next_sync_token = response.get("nextSyncToken") or next_sync_token
+        request = events_api.list_next(request, response)
+
+    return events, next_sync_token
+
+
+def apply_changed_events(google_calendar: object, events: list):
+    """Replace the mirrored rows of the given events, dropping the ones that were cancelled.
+
+    Args:
+    google_calendar (object): Google Calendar document
+    events (list): Raw Google events
+    """
+    if not events:
+        return
+
+    frappe.db.delete(
+        GOOGLE_CALENDAR_MIRROR_EVENT,
+        {"google_calendar": google_calendar.name, "event_id": ["in", [event["id"] for event in events]]},
+    )
+
+    now = now_datetime()
+    values = []
+
+    for event in events:
+        if event.get("status") == "cancelled":
+            continue
+
+        calendar_event = normalize_calendar_event(event, google_calendar)
+
+        if calendar_event is None:
+            continue
+
+        all_day = calendar_event.start_utc is None
+
+        if all_day:
+            start = get_datetime(event["start"]["date"])
+            end = get_datetime(event["end"]["date"])
+        else:
+            start = epoch_to_utc_datetime(calendar_event.start_utc).replace(tzinfo=None)
+            end = epoch_to_utc_datetime(calendar_event.end_utc).replace(tzinfo=None)
+
+        values.append(
+            (
+                frappe.generate_hash(length=10),
+                google_calendar.name,
+                event["id"],
+                calendar_event.ical_uid,
+                start,
+                end,
+                int(all_day),
+                calendar_event.creator,
+                calendar_event.response_status,
+                now,
+                now,
+                "Administrator",
+                "Administrator",
+            )
+        )
+
+    frappe.db.bulk_insert(
+        GOOGLE_CALENDAR_MIRROR_EVENT,
+        [*MIRROR_EVENT_FIELDS, "creation", "modified", "owner", "modified_by"],
+        values,
+    )
+
+
+def now_datetime_utc():
+    """Get the current time as a naive UTC datetime, the format the mirror keeps its times in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def manage_google_calendar_watch_channels():
+    """Scheduler job that opens a watch channel for every calendar used by a User Appointment Availability, renews
+    channels before Google expires them and stops the channels of calendars that are no longer used.
+    """
+    enabled = frappe.db.get_single_value("Appointment Settings", "enable_push_notifications")
+    google_calendars = get_mirrored_google_calendars() if enabled else []
+    renew_before = now_datetime_utc() + GOOGLE_CALENDAR_CHANNEL_RENEW_BEFORE
+
+    for google_calendar in google_calendars:
+        mirror = get_google_calendar_mirror(google_calendar)
+
+        if mirror.channel_id and mirror.channel_expiration and get_datetime(mirror.channel_expiration) > renew_before:
+            continue
+
+        try:
+            watch_google_calendar(mirror)
+        except Exception:
+            frappe.log_error(
+                title="Google Calendar Watch Error",
+                message=f"Could not watch {google_calendar} for changes\n{frappe.get_traceback()}",
+            )
+
+    for mirror in frappe.get_all(
+        GOOGLE_CALENDAR_MIRROR,
+        filters={"channel_id": ["is", "set"], "name": ["not in", google_calendars or [""]]},
+        pluck="name",
+    ):
+        try:
+            stop_google_calendar_channel(frappe.get_doc(GOOGLE_CALENDAR_MIRROR, mirror))
+        except Exception:
+            frappe.log_error(
+                title="Google Calendar Watch Error",
+                message=f"Could not stop watching {mirror}\n{frappe.get_traceback()}",
+            )
+
+
+def watch_google_calendar(mirror: Document):
+    """Open a new watch channel for the calendar of the mirror, replacing the current one.
+
+    Args:
+    mirror (Document): Google Calendar Mirror
+    """
+    google_calendar = frappe.get_doc("Google Calendar", mirror.google_calendar)
+    google_calendar_api_obj, _account = get_google_calendar_object(google_calendar.name)
+
+    channel_token = frappe.generate_hash()
+    channel = execute_google_request(
+        google_calendar_api_obj.events().watch(
+            calendarId=google_calendar.google_calendar_id,
+            body={
+                "id": str(uuid4()),
+                "type": "web_hook",
+                "address": get_url(PUSH_NOTIFICATION_ENDPOINT),
+                "token": channel_token,
+                "params": {"ttl": str(int(GOOGLE_CALENDAR_CHANNEL_TTL.total_seconds()))},
+            },
+        ),
+        google_calendar.name,
+    )
+
+    # Notifications of the old channel are ignored once the new one is saved, so stop it afterwards
+    old_channel = (mirror.channel_id, mirror.channel_resource_id)
+
+    mirror.channel_id = channel["id"]
+    mirror.channel_resource_id = channel["resourceId"]
+    mirror.channel_token = channel_token
+    mirror.channel_expiration = epoch_to_utc_datetime(int(channel["expiration"]) // 1000).replace(tzinfo=None)
+    mirror.save(ignore_permissions=True)
+
+    if all(old_channel):
+        stop_channel(google_calendar_api_obj, google_calendar.name, *old_channel)
+
+
+def stop_google_calendar_channel(mirror: Document):
+    """Stop the watch channel of the mirror.
+
+    Args:
+    mirror (Document): Google Calendar Mirror
+    """
+    channel = (mirror.channel_id, mirror.channel_resource_id)
+
+    mirror.channel_id = mirror.channel_resource_id = mirror.channel_token = mirror.channel_expiration = None
+    mirror.save(ignore_permissions=True)
+
+    if frappe.db.exists("Google Calendar", mirror.google_calendar):
+        google_calendar_api_obj, _account = get_google_calendar_object(mirror.google_calendar)
+        stop_channel(google_calendar_api_obj, mirror.google_calendar, *channel)
+
+
+def stop_channel(google_calendar_api_obj: object, google_calendar: str, channel_id: str, resource_id: str):
+    try:
+        execute_google_request(
+            google_calendar_api_obj.channels().stop(body={"id": channel_id, "resourceId": resource_id}),
+            google_calendar,
+        )
+    except HttpError as err:
+        # The channel is gone already
+        if err.resp.status != 404:
+            raise
+
+
+def handle_push_notification(headers: dict) -> bool:
+    """Handle a push notification Google sent on a watch channel.
+
+    Records a new change generation for the calendar, drops its cached busy intervals and queues the refresh of
+    its local mirror and of the availability of the appointment groups it blocks.
+
+    Args:
+    headers (dict): Request headers, Google sends the notification details as X-Goog-* headers
+
+    Returns:
+    bool: True if the notification belongs to a known channel that has not expired, False if it was ignored
+    """
+    headers = {key.lower(): value for key, value in headers.items()}
+    channel_id = headers.get("x-goog-channel-id")
+
+    if not channel_id:
+        return False
+
+    mirror = frappe.db.get_value(
+        GOOGLE_CALENDAR_MIRROR,
+        {"channel_id": channel_id},
+        ["name", "channel_resource_id", "channel_token", "channel_expiration", "change_generation"],
+        as_dict=True,
+    )
+
+    if (
+        not mirror
+        or mirror.channel_token != headers.get("x-goog-channel-token")
+        or mirror.channel_resource_id != headers.get("x-goog-resource-id")
+    ):
+        return False
+
+    # Google stops sending on a channel once it expires, anything arriving later is not trusted
+    if mirror.channel_expiration and get_datetime(mirror.channel_expiration) <= now_datetime_utc():
+        return False
+
+    # Google confirms a new channel with a sync message, it does not mean anything changed
+    if headers.get("x-goog-resource-state") == "sync":
+        return True
+
+    frappe.db.set_value(
+        GOOGLE_CALENDAR_MIRROR,
+        mirror.name,
+        "change_generation",
+        (mirror.change_generation or 0) + 1,
+        update_modified=False,
+    )
+
+    invalidate_calendar_busy_cache(mirror.name)
+
+    if get_busy_source() == "Local Mirror":
+        frappe.enqueue(
+            sync_google_calendar_mirror,
+            queue="long",
+            job_id=f"sync_google_calendar_mirror::{mirror.name}",
+            deduplicate=True,
+            enqueue_after_commit=True,
+            google_calendar=mirror.name,
+        )
+
+    for appointment_group in get_appointment_groups_for_calendar(mirror.name):
+        frappe.enqueue(
+            "frappe_appointment.tasks.verify_availability.get_availability_status_for_appointment_group",
+            queue="long",
+            job_id=f"appointment_group_availability::{appointment_group}",
+            deduplicate=True,
+            enqueue_after_commit=True,
+            appointment_group=frappe.get_doc(APPOINTMENT_GROUP, appointment_group),
+        )
+
+    return True
+
+
+def get_appointment_groups_for_calendar(google_calendar: str) -> list:
+    """Get the Appointment Groups with a member whose primary or conflict checked linked calendar is the given one.
+
+    Args:
+    google_calendar (str): Google Calendar name
+
+    Returns:
+    list: Appointment Group names
+    """
+    members = frappe.get_all(
+        USER_APPOINTMENT_AVAILABILITY, filters={"google_calendar": google_calendar}, pluck="name"
+    ) + frappe.get_all(
+        "Linked Calendar",
+        filters={"parenttype": USER_APPOINTMENT_AVAILABILITY, "check_for_conflicts": 1, "calendar": google_calendar},
+        pluck="parent",
+    )
+
+    if not members:
+        return []
+
+    return frappe.get_all(
+        "Members",
+        filters={"parenttype": APPOINTMENT_GROUP, "user": ["in", members]},
+        pluck="parent",
+        distinct=True,
+    )
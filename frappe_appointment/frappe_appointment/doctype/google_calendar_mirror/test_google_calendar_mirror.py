@@ -0,0 +1,202 @@
+# Copyright (c) 2026, rtCamp and Contributors
+# See license.txt
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from googleapiclient.errors import HttpError
+
+from frappe_appointment.constants import GOOGLE_CALENDAR_MIRROR, GOOGLE_CALENDAR_MIRROR_EVENT
+from frappe_appointment.frappe_appointment.doctype.google_calendar_mirror.google_calendar_mirror import (
+    handle_push_notification,
+    now_datetime_utc,
+    sync_google_calendar_mirror,
+)
+from frappe_appointment.tests.fake_google import FakeEventsAPI
+
+TEST_CALENDAR = "_Test Mirror Sync Calendar"
+
+
+class TestGoogleCalendarMirror(FrappeTestCase):
+    def setUp(self):
+        self.mirror = frappe.get_doc(
+            {
+                "doctype": GOOGLE_CALENDAR_MIRROR,
+                "google_calendar": "_Test Push Notification Calendar",
+                "channel_id": "_test-channel",
+                "channel_resource_id": "_test-resource",
+                "channel_token": "_test-token",
+            }
+        ).insert(ignore_permissions=True)
+
+    def tearDown(self):
+        frappe.db.rollback()
+
+    def get_headers(self, resource_state="exists", **overrides):
+        headers = {
+            "X-Goog-Channel-ID": "_test-channel",
+            "X-Goog-Channel-Token": "_test-token",
+            "X-Goog-Resource-ID": "_test-resource",
+            "X-Goog-Resource-State": resource_state,
+            "X-Goog-Message-Number": "2",
+        }
+        headers.update(overrides)
+        return headers
+
+    def get_change_generation(self):
+        return frappe.db.get_value(GOOGLE_CALENDAR_MIRROR, self.mirror.name, "change_generation")
+
+    def test_change_notification_increases_generation(self):
+        self.assertTrue(handle_push_notification(self.get_headers()))
+        self.assertTrue(handle_push_notification(self.get_headers("not_exists")))
+        self.assertEqual(self.get_change_generation(), 2)
+
+    def test_sync_notification_is_not_a_change(self):
+        self.assertTrue(handle_push_notification(self.get_headers("sync")))
+        self.assertEqual(self.get_change_generation(), 0)
+
+    def test_unknown_channel_or_token_is_ignored(self):
+        self.assertFalse(handle_push_notification(self.get_headers(**{"X-Goog-Channel-ID": "_unknown"})))
+        self.assertFalse(handle_push_notification(self.get_headers(**{"X-Goog-Channel-Token": "_wrong"})))
+        self.assertFalse(handle_push_notification({}))
+        self.assertEqual(self.get_change_generation(), 0)
+
+    def test_replaced_channel_is_ignored(self):
+        self.mirror.channel_id = "_test-renewed-channel"
+        self.mirror.save(ignore_permissions=True)
+
+        self.assertFalse(handle_push_notification(self.get_headers()))
+        self.assertEqual(self.get_change_generation(), 0)
+
+    def test_expired_channel_is_ignored(self):
+        self.mirror.channel_expiration = now_datetime_utc() - timedelta(minutes=1)
+        self.mirror.save(ignore_permissions=True)
+
+        self.assertFalse(handle_push_notification(self.get_headers()))
+        self.assertEqual(self.get_change_generation(), 0)
+
+
+def get_google_event(event_id: str, start_hours: int, status: str = "confirmed") -> dict:
+    start = now_datetime_utc().replace(minute=0, second=0, microsecond=0) + timedelta(hours=start_hours)
+    return {
+        "id": event_id,
+        "iCalUID": f"{event_id}@google.com",
+        "status": status,
+        "start": {"dateTime": start.isoformat() + "Z"},
+        "end": {"dateTime": (start + timedelta(hours=1)).isoformat() + "Z"},
+        "creator": {"email": "owner@example.com"},
+    }
+
+
+class TestGoogleCalendarMirrorSync(FrappeTestCase):
+    def tearDown(self):
+        frappe.db.rollback()
+
+    def sync(self, events_api: FakeEventsAPI):
+        google_calendar = frappe._dict(
+            name=TEST_CALENDAR, google_calendar_id="test@group.calendar.google.com", custom_ignore_all_day_events=0
+        )
+        get_doc = frappe.get_doc
+
+        def get_test_doc(*args, **kwargs):
+            if args and args[0] == "Google Calendar":
+                return google_calendar
+            return get_doc(*args, **kwargs)
+
+        module = "frappe_appointment.frappe_appointment.doctype.google_calendar_mirror.google_calendar_mirror"
+
+        with (
+            patch(f"{module}.frappe.get_doc", side_effect=get_test_doc),
+            patch(f"{module}.get_google_calendar_object", return_value=(events_api, google_calendar)),
+            patch(f"{module}.execute_google_request", side_effect=lambda request, *args: request.execute()),
+        ):
+            sync_google_calendar_mirror(TEST_CALENDAR)
+
+    def get_mirrored_events(self) -> dict:
+        return {
+            event.event_id: event
+            for event in frappe.get_all(
+                GOOGLE_CALENDAR_MIRROR_EVENT,
+                filters={"google_calendar": TEST_CALENDAR},
+                fields=["event_id", "start", "end"],
+            )
+        }
+
+    def test_full_then_incremental_sync(self):
+        moved_event = get_google_event("moved", 5)
+        events_api = FakeEventsAPI(
+            {
+                None: {
+                    "items": [
+                        get_google_event("moved", 2),
+                        get_google_event("cancelled", 3),
+                        get_google_event("kept", 4),
+                    ],
+                    "nextSyncToken": "token-1",
+                },
+                "token-1": {
+                    "items": [moved_event, get_google_event("cancelled", 3, "cancelled"), get_google_event("new", 6)],
+                    "nextSyncToken": "token-2",
+                },
+            }
+        )
+
+        self.sync(events_api)
+        self.assertEqual(set(self.get_mirrored_events()), {"moved", "cancelled", "kept"})
+        self.assertIn("timeMin", events_api.calls[0])
+        self.assertEqual(frappe.db.get_value(GOOGLE_CALENDAR_MIRROR, TEST_CALENDAR, "sync_token"), "token-1")
+
+        self.sync(events_api)
+        mirrored_events = self.get_mirrored_events()
+
+        # Only the changes are asked for, and they are applied on top of the mirror
+        self.assertEqual(events_api.calls[1]["syncToken"], "token-1")
+        self.assertNotIn("timeMin", events_api.calls[1])
+        self.assertEqual(set(mirrored_events), {"moved", "kept", "new"})
+        self.assertEqual(mirrored_events["moved"].start.isoformat() + "Z", moved_event["start"]["dateTime"])
+        self.assertEqual(frappe.db.get_value(GOOGLE_CALENDAR_MIRROR, TEST_CALENDAR, "sync_token"), "token-2")
+
+    def test_transparent_events_are_not_mirrored(self):
+        events_api = FakeEventsAPI(
+            {
+                None: {
+                    "items": [
+                        get_google_event("busy", 2),
+                        {**get_google_event("free", 3), "transparency": "transparent"},
+                        get_google_event("marked_free", 4),
+                    ],
+                    "nextSyncToken": "token-1",
+                },
+                "token-1": {
+                    "items": [{**get_google_event("marked_free", 4), "transparency": "transparent"}],
+                    "nextSyncToken": "token-2",
+                },
+            }
+        )
+
+        self.sync(events_api)
+        self.assertEqual(set(self.get_mirrored_events()), {"busy", "marked_free"})
+
+        # An event that is switched to free stops blocking
+        self.sync(events_api)
+        self.assertEqual(set(self.get_mirrored_events()), {"busy"})
+
+    def test_expired_sync_token_starts_over(self):
+        events_api = FakeEventsAPI(
+            {
+                None: {"items": [get_google_event("first", 2)], "nextSyncToken": "token-1"},
+                "token-1": HttpError(frappe._dict(status=410, reason="Gone"), b""),
+            }
+        )
+
+        self.sync(events_api)
+
+        # The mirror is rebuilt from what Google lists now, events only known from before are dropped
+        events_api.responses[None] = {"items": [get_google_event("second", 3)], "nextSyncToken": "token-2"}
+        self.sync(events_api)
+
+        self.assertEqual([call.get("syncToken") for call in events_api.calls], [None, "token-1", None])
+        self.assertEqual(set(self.get_mirrored_events()), {"second"})
+        self.assertEqual(frappe.db.get_value(GOOGLE_CALENDAR_MIRROR, TEST_CALENDAR, "sync_token"), "token-2")
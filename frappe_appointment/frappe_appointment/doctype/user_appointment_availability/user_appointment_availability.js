@@ -17,6 +17,8 @@ frappe.ui.form.on("User Appointment Availability", {
           }
         },
       });
+    } else {
+      show_calendar_circuit_states(frm);
     }
   },
   slug(frm) {
@@ -70,3 +72,40 @@ frappe.ui.form.on("User Appointment Availability", {
     }
   },
 });
+
+function show_calendar_circuit_states(frm) {
+  const google_calendars = [
+    frm.doc.google_calendar,
+    ...(frm.doc.linked_calendars || []).filter((row) => row.check_for_conflicts).map((row) => row.calendar),
+  ].filter(Boolean);
+
+  if (!google_calendars.length) {
+    return;
+  }
+
+  frappe.call({
+    method: "frappe_appointment.api.google_calendar.get_calendar_circuit_states",
+    args: {
+      google_calendars: google_calendars,
+    },
+    callback: function (r) {
+      const failing = Object.entries(r.message || {}).filter(([_, circuit]) => circuit.state !== "Closed");
+      if (!failing.length) {
+        return;
+      }
+
+      frm.dashboard.set_headline_alert(
+        failing
+          .map(([google_calendar, circuit]) =>
+            __("Requests to Google Calendar {0} are failing and are skipped ({1}), next attempt in {2} seconds.", [
+              google_calendar,
+              circuit.state,
+              circuit.retry_in || 0,
+            ])
+          )
+          .join("<br>"),
+        "red"
+      );
+    },
+  });
+}
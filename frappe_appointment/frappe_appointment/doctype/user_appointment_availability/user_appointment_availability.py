@@ -7,16 +7,15 @@ from datetime import datetime
 import frappe
 import frappe.utils
 from frappe.model.document import Document
-from frappe.utils.data import add_to_date
+from frappe.utils.data import add_to_date, get_system_timezone
 
-from frappe_appointment.constants import APPOINTMENT_TIME_SLOT
-from frappe_appointment.helpers.intervals import find_intersection_interval
-from frappe_appointment.helpers.utils import (
-    convert_datetime_to_utc,
-    convert_utc_datetime_to_timezone,
-    get_weekday,
-    update_time_of_datetime,
+from frappe_appointment.helpers.availability_template import (
+    clear_availability_template,
+    get_availability_templates,
+    get_working_hours,
 )
+from frappe_appointment.helpers.intervals import find_intersection_interval
+from frappe_appointment.helpers.utils import convert_utc_datetime_to_timezone, get_weekday
 
 SLUG_REGEX = re.compile(r"^[a-z0-9_]+(?:-[a-z0-9_]+)*$")
 
@@ -29,6 +28,12 @@ class UserAppointmentAvailability(Document):
         self.validate_slug()
         self.validate_zoom_settings()
 
+    def on_update(self):
+        clear_availability_template(self.name)
+
+    def on_trash(self):
+        clear_availability_template(self.name)
+
     def validate_time_slots(self):
         """Validate time slots: start time < end time, and weekdays are unique."""
         if self.appointment_time_slot:
@@ -148,52 +153,30 @@ def get_user_appointment_availability_slots(
         "end_time": utc_end_time,
     }
 
-    for member in members:
-        if not member.is_mandatory:
-            continue
+    templates = get_availability_templates([member.user for member in members if member.is_mandatory])
 
-        user_timezone = frappe.get_value("User", member.user, "time_zone")
+    for member, template in templates.items():
+        user_timezone = frappe.get_value("User", member, "time_zone") or get_system_timezone()
+        member_time_slots[member] = []
 
         current_date = utc_start_time
 
         while current_date.date() <= utc_end_time.date():
             current_date_time = convert_utc_datetime_to_timezone(current_date, user_timezone)
-            weekday = get_weekday(current_date_time)
+            working_hours = get_working_hours(template, current_date_time, get_weekday(current_date_time))
 
-            appointment_time_slots = frappe.db.get_all(
-                APPOINTMENT_TIME_SLOT,
-                filters={"parent": member.user, "day": weekday},
-                fields="*",
+            interval = working_hours and find_intersection_interval(
+                {"start_time": working_hours[0], "end_time": working_hours[1]}, global_interval
             )
 
-            user_appointment_time_slots_utc = []
-
-            for slot in appointment_time_slots:
-                interval = {
-                    "start_time": convert_datetime_to_utc(update_time_of_datetime(current_date_time, slot.start_time)),
-                    "end_time": convert_datetime_to_utc(
-                        update_time_of_datetime(
-                            current_date_time,
-                            slot.end_time,
-                        )
-                    ),
-                }
-
-                interval = find_intersection_interval(interval, global_interval)
-
-                if interval:
-                    user_appointment_time_slots_utc.append(
-                        {
-                            "start_time": interval[0],
-                            "end_time": interval[1],
-                            "is_available": True,
-                        }
-                    )
-
-            if member.user in member_time_slots:
-                member_time_slots[member.user] += user_appointment_time_slots_utc
-            else:
-                member_time_slots[member.user] = user_appointment_time_slots_utc
+            if interval:
+                member_time_slots[member].append(
+                    {
+                        "start_time": interval[0],
+                        "end_time": interval[1],
+                        "is_available": True,
+                    }
+                )
 
             current_date = add_to_date(current_date, days=1)
 
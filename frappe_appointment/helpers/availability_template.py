@@ -0,0 +1,138 @@
+from datetime import date, datetime, timedelta
+
+import frappe
+import pytz
+from frappe.utils import getdate, to_timedelta
+from frappe.utils.data import get_system_timezone
+
+from frappe_appointment.constants import APPOINTMENT_TIME_SLOT
+
+AVAILABILITY_TEMPLATE_CACHE_KEY_PREFIX = "appointment_availability_template"
+
+# Templates are dropped when the availability is saved, the expiry only bounds how long a missed change is served
+AVAILABILITY_TEMPLATE_CACHE_TTL = 24 * 60 * 60
+
+
+def get_availability_template_cache_key(member: str) -> str:
+    return f"{AVAILABILITY_TEMPLATE_CACHE_KEY_PREFIX}|{member}"
+
+
+def get_availability_templates(members: list) -> dict:
+    """Get the weekly working hours of the given users, compiled from their User Appointment Availability.
+
+    A template holds, for every weekday the user works on, the start and end of their working hours in seconds
+    after local midnight. The hours are entered in the system timezone, so compiled templates have no timezone of
+    their own. Templates are cached until the availability changes, and the missing ones are compiled together in
+    one query.
+
+    Args:
+    members (list): User names
+
+    Returns:
+    dict: User -> {"time_zone": str | None, "days": {weekday: (start seconds, end seconds)}}
+    """
+    templates = {}
+
+    for member in set(members):
+        template = frappe.cache.get_value(get_availability_template_cache_key(member))
+
+        if template is not None:
+            templates[member] = template
+
+    missing_members = [member for member in set(members) if member not in templates]
+
+    if not missing_members:
+        return templates
+
+    for member in missing_members:
+        templates[member] = {"time_zone": None, "days": {}}
+
+    for appointment_time_slot in frappe.db.get_all(
+        APPOINTMENT_TIME_SLOT,
+        filters={"parent": ["in", missing_members]},
+        fields=["parent", "day", "start_time", "end_time"],
+    ):
+        templates[appointment_time_slot.parent]["days"][appointment_time_slot.day] = (
+            int(to_timedelta(appointment_time_slot.start_time).total_seconds()),
+            int(to_timedelta(appointment_time_slot.end_time).total_seconds()),
+        )
+
+    for member in missing_members:
+        frappe.cache.set_value(
+            get_availability_template_cache_key(member),
+            templates[member],
+            expires_in_sec=AVAILABILITY_TEMPLATE_CACHE_TTL,
+        )
+
+    return templates
+
+
+def clear_availability_template(member: str):
+    """Drop the cached working hours of a user, see get_availability_templates."""
+    frappe.cache.delete_value(get_availability_template_cache_key(member))
+
+
+def get_working_hours(template: dict, day: date | datetime, weekday: str) -> tuple | None:
+    """Get the working hours of a user on a date, in UTC.
+
+    The hours are read in the timezone of the template, or in the system timezone when it has none. The offset is
+    looked up for the date itself, so the hours follow daylight saving time.
+
+    Args:
+    template (dict): Template of the user, see get_availability_templates
+    day (date | datetime): Date
+    weekday (str): Weekday of the date
+
+    Returns:
+    tuple | None: (start, end) timezone aware UTC datetimes, None if the user does not work on that weekday
+    """
+    if weekday not in template["days"]:
+        return None
+
+    start_seconds, end_seconds = template["days"][weekday]
+    time_zone = pytz.timezone(template["time_zone"] or get_system_timezone())
+    midnight = datetime.combine(getdate(day), datetime.min.time())
+
+    return (
+        time_zone.localize(midnight + timedelta(seconds=start_seconds)).astimezone(pytz.utc),
+        time_zone.localize(midnight + timedelta(seconds=end_seconds)).astimezone(pytz.utc),
+    )
+
+
+def get_shared_working_hours(templates: dict, day: date | datetime, weekday: str) -> tuple | None:
+    """Get the working hours all the given users share on a date, in UTC.
+
+    Args:
+    templates (dict): User -> template, see get_availability_templates
+    day (date | datetime): Date
+    weekday (str): Weekday of the date
+
+    Returns:
+    tuple | None: (latest start, earliest end) timezone aware UTC datetimes, the start can be after the end if the
+    hours do not overlap. None if any of the users does not work on that weekday
+    """
+    starttime, endtime = None, None
+
+    for template in templates.values():
+        working_hours = get_working_hours(template, day, weekday)
+
+        if working_hours is None:
+            return None
+
+        starttime = max(starttime, working_hours[0]) if starttime else working_hours[0]
+        endtime = min(endtime, working_hours[1]) if endtime else working_hours[1]
+
+    if starttime is None:
+        return None
+
+    return starttime, endtime
+
+
+def get_available_weekdays(templates: dict) -> set:
+    """Get the weekdays on which all the given users work."""
+    available_days = None
+
+    for template in templates.values():
+        available_days = set(template["days"]) if available_days is None else available_days & set(template["days"])
+
+    return available_days or set()
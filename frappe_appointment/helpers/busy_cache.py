@@ -0,0 +1,183 @@
+import time
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+
+import frappe
+from frappe.utils import getdate
+
+from frappe_appointment.helpers.intervals import union_intervals
+from frappe_appointment.helpers.utils import datetime_to_epoch, epoch_to_utc_datetime, parse_utc_datetime
+
+BUSY_CACHE_KEY_PREFIX = "appointment_busy_intervals"
+
+SECONDS_IN_DAY = 24 * 60 * 60
+
+
+def get_busy_cache_ttl() -> int:
+    """Get the number of seconds the busy intervals of a calendar day are cached, 0 if the cache is disabled."""
+    return int(frappe.db.get_single_value("Appointment Settings", "busy_cache_ttl") or 0)
+
+
+def get_busy_stale_ttl() -> int:
+    """Get the number of seconds expired busy intervals are still served while they are refreshed, 0 if disabled."""
+    return int(frappe.db.get_single_value("Appointment Settings", "busy_stale_ttl") or 0)
+
+
+def is_stale_busy_data_allowed() -> bool:
+    """Check if expired busy intervals may be served, which is never the case while a booking is validated."""
+    return bool(get_busy_stale_ttl()) and not frappe.flags.appointment_live_busy_data
+
+
+def mark_busy_data_stale():
+    """Remember that the current request was answered with expired busy intervals."""
+    frappe.flags.appointment_busy_data_stale = True
+
+
+def is_busy_data_stale() -> bool:
+    return bool(frappe.flags.appointment_busy_data_stale)
+
+
+def mark_busy_data_degraded():
+    """Remember that the current request was answered without the busy times of a calendar that was too slow."""
+    frappe.flags.appointment_busy_data_degraded = True
+
+
+def is_busy_data_degraded() -> bool:
+    return bool(frappe.flags.appointment_busy_data_degraded)
+
+
+def get_busy_cache_key(calendar_id: str, day: date) -> str:
+    return f"{BUSY_CACHE_KEY_PREFIX}|{calendar_id}|{day.isoformat()}"
+
+
+def get_utc_day_pieces(time_windows: list) -> dict:
+    """Split Google API time windows at UTC midnight.
+
+    Args:
+    time_windows (list): (time_min, time_max) tuples of ISO format times for Google API
+
+    Returns:
+    dict: UTC date -> list of (start, end) epoch seconds of the windows within that day
+    """
+    day_pieces = {}
+
+    for time_min, time_max in time_windows:
+        start = datetime_to_epoch(parse_utc_datetime(time_min))
+        end = datetime_to_epoch(parse_utc_datetime(time_max))
+
+        while start < end:
+            day_end = (start // SECONDS_IN_DAY + 1) * SECONDS_IN_DAY
+            day = epoch_to_utc_datetime(start).date()
+            day_pieces.setdefault(day, []).append((start, min(end, day_end)))
+            start = day_end
+
+    return day_pieces
+
+
+def get_cached_calendar_events(calendar_id: str, time_windows: list, allow_stale: bool = False) -> list | None:
+    """Get the cached calendar events of a calendar for the given time windows.
+
+    Args:
+    calendar_id (str): Google Calendar name
+    time_windows (list): (time_min, time_max) tuples of ISO format times for Google API
+    allow_stale (bool, optional): Also return events that expired, as long as they are within busy_stale_ttl
+
+    Returns:
+    list: Calendar events overlapping the windows sorted by start, or None if any part of the windows is not cached
+    """
+    if not allow_stale and not get_busy_cache_ttl():
+        return None
+
+    now = int(time.time())
+    calendar_events = set()
+
+    for day, pieces in get_utc_day_pieces(time_windows).items():
+        cached_day = frappe.cache.get_value(get_busy_cache_key(calendar_id, day))
+
+        # Expired days are kept for busy_stale_ttl longer, the cache drops them after that
+        if cached_day is None or (not allow_stale and cached_day["expires_at"] <= now):
+            return None
+
+        for start, end in pieces:
+            if not any(
+                covered_start <= start and end <= covered_end for covered_start, covered_end in cached_day["coverage"]
+            ):
+                return None
+
+        calendar_events.update(
+            calendar_event for calendar_event in cached_day["events"] if overlaps_any(calendar_event, pieces)
+        )
+
+    return sorted(calendar_events, key=itemgetter(0))
+
+
+def set_cached_calendar_events(calendar_id: str, time_windows: list, calendar_events: list):
+    """Cache the calendar events of a calendar that were fetched for exactly the given time windows.
+
+    Every UTC day keeps the parts of the day it has events for, so windows fetched at different times (e.g. the
+    working hours of different days in another timezone) add up. Events of earlier fetches that overlap the new
+    windows are replaced, and the day still expires with its first fetch, so no part is served for longer than the
+    configured time. Expired days stay in the cache for busy_stale_ttl longer, see get_cached_calendar_events.
+
+    Args:
+    calendar_id (str): Google Calendar name
+    time_windows (list): (time_min, time_max) tuples the events were fetched for
+    calendar_events (list): Calendar events with known start and end, see normalize_calendar_events
+    """
+    ttl = get_busy_cache_ttl()
+    stale_ttl = get_busy_stale_ttl()
+
+    if not ttl and not stale_ttl:
+        return
+
+    now = int(time.time())
+
+    for day, pieces in get_utc_day_pieces(time_windows).items():
+        key = get_busy_cache_key(calendar_id, day)
+        cached_day = frappe.cache.get_value(key)
+
+        if cached_day is None or cached_day["expires_at"] <= now:
+            cached_day = {"coverage": [], "events": [], "expires_at": now + ttl}
+
+        cached_day["coverage"] = list(union_intervals(sorted([*map(tuple, cached_day["coverage"]), *pieces])))
+        cached_day["events"] = [
+            *(calendar_event for calendar_event in cached_day["events"] if not overlaps_any(calendar_event, pieces)),
+            *(calendar_event for calendar_event in calendar_events if overlaps_any(calendar_event, pieces)),
+        ]
+
+        frappe.cache.set_value(key, cached_day, expires_in_sec=cached_day["expires_at"] - now + stale_ttl)
+
+
+def overlaps_any(calendar_event: tuple, pieces: list) -> bool:
+    return any(calendar_event[0] < end and calendar_event[1] > start for start, end in pieces)
+
+
+def invalidate_busy_cache(calendar_ids: list, start: datetime | date, end: datetime | date):
+    """Drop the cached busy intervals of the given calendars for all days between start and end.
+
+    A day is added on both sides, since the given times can be in any timezone while the cache is kept per UTC day.
+
+    Args:
+    calendar_ids (list): Google Calendar names
+    start (datetime | date): Start of the changed period
+    end (datetime | date): End of the changed period
+    """
+    calendar_ids = {calendar_id for calendar_id in calendar_ids if calendar_id}
+
+    if not calendar_ids or not start:
+        return
+
+    first_day = getdate(start) - timedelta(days=1)
+    last_day = getdate(end or start) + timedelta(days=1)
+    days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+    frappe.cache.delete_value([get_busy_cache_key(calendar_id, day) for calendar_id in calendar_ids for day in days])
+
+
+def invalidate_calendar_busy_cache(calendar_id: str):
+    """Drop the cached busy intervals of a calendar for all days.
+
+    Args:
+    calendar_id (str): Google Calendar name
+    """
+    frappe.cache.delete_keys(f"{BUSY_CACHE_KEY_PREFIX}|{calendar_id}|")
@@ -0,0 +1,218 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import frappe
+from googleapiclient.http import DEFAULT_HTTP_TIMEOUT_SEC, BatchHttpRequest
+
+from frappe_appointment.helpers.google_api_quota import (
+    GoogleAPIQuotaExceeded,
+    acquire_google_api_quota,
+    get_google_api_deadline,
+    get_google_api_quota_settings,
+    get_retry_delay,
+    is_retryable_google_error,
+)
+from frappe_appointment.helpers.hedged_requests import (
+    build_duplicate_http,
+    execute_hedged,
+    execute_request,
+    get_current_http,
+    get_hedge_delays,
+    get_hedge_executor,
+    record_latencies,
+    set_http_timeout,
+)
+from frappe_appointment.helpers.request_deadline import limit_to_deadline
+
+# Google Calendar accepts at most 50 calls in a single batch request
+GOOGLE_CALENDAR_BATCH_URI = "https://www.googleapis.com/batch/calendar/v3"
+GOOGLE_CALENDAR_BATCH_MAX_REQUESTS = 50
+
+# Executor shared by all requests of a worker process, recreated when the configured size changes
+_executor = None
+_executor_workers = 0
+
+
+def get_calendar_fetch_settings() -> tuple:
+    """Get the number of parallel calendar fetches and the timeout of a single fetch from Appointment Settings.
+
+    Returns:
+    tuple: (workers, timeout in seconds)
+    """
+    workers = frappe.db.get_single_value("Appointment Settings", "calendar_fetch_workers")
+    timeout = frappe.db.get_single_value("Appointment Settings", "calendar_fetch_timeout")
+
+    return max(int(workers or 1), 1), int(timeout or 0) or None
+
+
+def get_calendar_fetch_mode() -> str:
+    """Get how the calendar fetches of a request are sent: "Parallel" (thread pool) or "Batch" (batch requests)."""
+    return frappe.db.get_single_value("Appointment Settings", "calendar_fetch_mode") or "Parallel"
+
+
+def is_concurrent_fetch_enabled() -> bool:
+    """Check if several calendar fetches cost about one round trip, either through batching or the thread pool."""
+    workers, _timeout = get_calendar_fetch_settings()
+    return get_calendar_fetch_mode() == "Batch" or workers > 1
+
+
+def execute_google_requests(google_requests: dict, google_calendars: dict | None = None) -> dict:
+    """Execute prepared Google API requests, as batch requests or in parallel when configured so.
+
+    Only `execute()` runs in the worker threads, the requests must be built in the calling thread and the
+    results must be handled there too, since frappe's request locals are not available in other threads.
+
+    The requests are sent within the Google API quota, and the ones that hit a rate limit or a temporary error
+    are sent again after a backoff, see google_api_quota.
+
+    Args:
+    google_requests (dict): key -> googleapiclient HttpRequest
+    google_calendars (dict, optional): key -> Google Calendar name whose credentials the request uses
+
+    Returns:
+    dict: key -> (response, error). The error is the raised exception, or a TimeoutError if the request did
+    not finish in time, in which case the response is None.
+    """
+    google_calendars = google_calendars or {}
+    _project_quota, _user_quota, max_retries = get_google_api_quota_settings()
+    deadline = get_google_api_deadline()
+
+    results = {}
+    pending = google_requests
+
+    for attempt in range(max_retries + 1):
+        try:
+            acquire_google_api_quota([google_calendars.get(key) for key in pending], deadline)
+        except GoogleAPIQuotaExceeded as err:
+            results.update({key: (None, err) for key in pending})
+            break
+
+        results.update(_execute_google_requests(pending))
+        pending = {key: pending[key] for key in pending if is_retryable_google_error(results[key][1])}
+
+        if not pending or attempt == max_retries:
+            break
+
+        delay = max(get_retry_delay(results[key][1], attempt) for key in pending)
+
+        if time.time() + delay > deadline:
+            break
+
+        time.sleep(delay)
+
+    return results
+
+
+def _execute_google_requests(google_requests: dict) -> dict:
+    workers, timeout = get_calendar_fetch_settings()
+    timeout = limit_to_deadline(timeout)
+
+    # Every call sets the timeout of its own requests, since pooled connections keep the one of their last request
+    for google_request in google_requests.values():
+        google_request.http = get_current_http(google_request.http)
+        set_http_timeout(google_request.http, timeout or DEFAULT_HTTP_TIMEOUT_SEC)
+
+    if len(google_requests) > 1 and get_calendar_fetch_mode() == "Batch":
+        return _execute_batch(google_requests)
+
+    # Interactive requests send a duplicate of slow reads, see hedged_requests
+    hedge_delays = get_hedge_delays(google_requests)
+    hedge_executor = get_hedge_executor(workers) if hedge_delays else None
+    latencies = []
+
+    if workers == 1 or len(google_requests) < 2:
+        results = _execute_all(google_requests, hedge_delays, latencies, hedge_executor)
+        record_latencies(latencies)
+        return results
+
+    # Pooled clients share one http connection per calendar, which is not thread safe, so the requests of a
+    # connection run one after another in the same worker
+    connections = {}
+    for key, google_request in google_requests.items():
+        connections.setdefault(id(google_request.http), {})[key] = google_request
+
+    futures = {
+        tuple(connection_requests): get_executor(workers).submit(
+            _execute_all, connection_requests, hedge_delays, latencies, hedge_executor
+        )
+        for connection_requests in connections.values()
+    }
+
+    # Requests beyond the pool size wait for a free worker, so the deadline grows with the number of rounds
+    rounds = -(-len(google_requests) // min(workers, len(connections)))
+    wait(futures.values(), timeout=limit_to_deadline(timeout * rounds if timeout else None))
+
+    results = {}
+    for keys, future in futures.items():
+        if future.done():
+            results.update(future.result())
+            continue
+
+        results.update({key: (None, TimeoutError("Google Calendar request timed out")) for key in keys})
+
+        # The worker is still busy with the request on the connection, so the calendar continues on a new one,
+        # like after a hedged request, see hedged_requests
+        http = get_current_http(google_requests[keys[0]].http)
+        http.replaced_by = build_duplicate_http(http)
+
+    # Requests that did not finish may still add their latency, which is left for the next time
+    record_latencies(list(latencies))
+
+    return results
+
+
+def get_executor(workers: int) -> ThreadPoolExecutor:
+    global _executor, _executor_workers
+
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="google_calendar_fetch")
+        _executor_workers = workers
+
+    return _executor
+
+
+def _execute_batch(google_requests: dict) -> dict:
+    """Execute the requests as Google batch requests. Every request keeps the credentials of its own calendar,
+    the batch only shares the connection and the round trip.
+    """
+    results = {}
+    keys = list(google_requests)
+
+    for index in range(0, len(keys), GOOGLE_CALENDAR_BATCH_MAX_REQUESTS):
+        chunk = keys[index : index + GOOGLE_CALENDAR_BATCH_MAX_REQUESTS]
+
+        def callback(request_id, response, exception, chunk=chunk):
+            results[chunk[int(request_id)]] = (response, exception)
+
+        batch = BatchHttpRequest(callback=callback, batch_uri=GOOGLE_CALENDAR_BATCH_URI)
+
+        for request_id, key in enumerate(chunk):
+            batch.add(google_requests[key], request_id=str(request_id))
+
+        try:
+            batch.execute()
+        except Exception as err:
+            for key in chunk:
+                results.setdefault(key, (None, err))
+
+    return results
+
+
+def _execute_all(
+    google_requests: dict, hedge_delays: dict, latencies: list, hedge_executor: ThreadPoolExecutor | None
+) -> dict:
+    results = {}
+
+    for key, google_request in google_requests.items():
+        # A duplicate that won an earlier request of the connection moved the calendar to a new connection
+        google_request.http = get_current_http(google_request.http)
+
+        if key in hedge_delays:
+            results[key] = execute_hedged(google_request, hedge_delays[key], latencies, hedge_executor)
+        else:
+            results[key] = execute_request(google_request)
+
+    return results
@@ -0,0 +1,150 @@
+import time
+
+import frappe
+
+CIRCUIT_CACHE_KEY_PREFIX = "appointment_calendar_circuit"
+
+# Consecutive failures that open the circuit of a calendar, failures are forgotten after the window without one
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_FAILURE_WINDOW = 10 * 60
+
+# An open circuit lets requests through again after this long, doubled every time the trial request fails
+CIRCUIT_OPEN_SECONDS = 60
+CIRCUIT_MAX_OPEN_SECONDS = 60 * 60
+
+# A half-open circuit lets one trial request through, the others fail fast until it finished or this passed
+CIRCUIT_TRIAL_SECONDS = 30
+
+CIRCUIT_CLOSED = "Closed"
+CIRCUIT_OPEN = "Open"
+CIRCUIT_HALF_OPEN = "Half-Open"
+
+
+def get_circuit_key(calendar_id: str) -> str:
+    return f"{CIRCUIT_CACHE_KEY_PREFIX}|{calendar_id}"
+
+
+def get_circuit(calendar_id: str) -> dict | None:
+    """Get the failure record of a calendar, None if its last request succeeded.
+
+    Args:
+    calendar_id (str): Google Calendar name
+
+    Returns:
+    dict: failures, last_error, opened_at, retry_at, open_seconds and trial_at, times in epoch seconds
+    """
+    return frappe.cache.get_value(get_circuit_key(calendar_id))
+
+
+def get_circuit_state(circuit: dict | None) -> str:
+    """Get the state of a circuit: requests pass when closed, fail fast when open and probe when half-open."""
+    if not circuit or not circuit.get("opened_at"):
+        return CIRCUIT_CLOSED
+
+    if time.time() < circuit["retry_at"]:
+        return CIRCUIT_OPEN
+
+    return CIRCUIT_HALF_OPEN
+
+
+def allow_calendar_request(calendar_id: str) -> bool:
+    """Check if a request to Google may be sent for a calendar, or if it should fail fast.
+
+    Args:
+    calendar_id (str): Google Calendar name
+
+    Returns:
+    bool: True if the circuit is closed, or if it is half-open and this request is the trial request
+    """
+    circuit = get_circuit(calendar_id)
+    state = get_circuit_state(circuit)
+
+    if state == CIRCUIT_CLOSED:
+        return True
+
+    if state == CIRCUIT_OPEN:
+        return False
+
+    now = int(time.time())
+
+    if circuit.get("trial_at") and now - circuit["trial_at"] < CIRCUIT_TRIAL_SECONDS:
+        return False
+
+    circuit["trial_at"] = now
+    set_circuit(calendar_id, circuit)
+
+    return True
+
+
+def record_calendar_success(calendar_id: str):
+    """Close the circuit of a calendar after a successful request."""
+    if get_circuit(calendar_id):
+        frappe.cache.delete_value(get_circuit_key(calendar_id))
+
+
+def record_calendar_failure(calendar_id: str, error: str):
+    """Count a failed request of a calendar, and open its circuit once it keeps failing.
+
+    Instead of an error log per failed request, a single summarized error is logged every time the circuit opens.
+
+    Args:
+    calendar_id (str): Google Calendar name
+    error (str): Description of the failure
+    """
+    circuit = get_circuit(calendar_id) or {"failures": 0, "opened_at": None, "open_seconds": 0}
+    state = get_circuit_state(circuit)
+
+    circuit["failures"] += 1
+    circuit["last_error"] = error
+
+    if state == CIRCUIT_HALF_OPEN:
+        # The trial request failed, so the calendar stays cut off for twice as long
+        open_circuit(calendar_id, circuit, min(circuit["open_seconds"] * 2, CIRCUIT_MAX_OPEN_SECONDS))
+    elif state == CIRCUIT_CLOSED and circuit["failures"] >= CIRCUIT_FAILURE_THRESHOLD:
+        open_circuit(calendar_id, circuit, CIRCUIT_OPEN_SECONDS)
+
+    set_circuit(calendar_id, circuit)
+
+
+def open_circuit(calendar_id: str, circuit: dict, open_seconds: int):
+    now = int(time.time())
+
+    circuit.update(opened_at=now, retry_at=now + open_seconds, open_seconds=open_seconds, trial_at=None)
+
+    frappe.log_error(
+        title="Google Calendar Circuit Opened",
+        message=(
+            f"Requests to Google Calendar {calendar_id} failed {circuit['failures']} times in a row and are skipped"
+            f" for the next {open_seconds} seconds.\nLast error: {circuit['last_error']}"
+        ),
+        reference_doctype="Google Calendar",
+        reference_name=calendar_id,
+    )
+
+
+def set_circuit(calendar_id: str, circuit: dict):
+    expires_in_sec = CIRCUIT_FAILURE_WINDOW
+
+    if circuit.get("opened_at"):
+        expires_in_sec += max(circuit["retry_at"] - int(time.time()), 0)
+
+    frappe.cache.set_value(get_circuit_key(calendar_id), circuit, expires_in_sec=expires_in_sec)
+
+
+def get_circuit_summary(calendar_id: str) -> dict:
+    """Get the circuit of a calendar as shown on the Google Calendar and User Appointment Availability forms.
+
+    Args:
+    calendar_id (str): Google Calendar name
+
+    Returns:
+    dict: state, failures, last_error and retry_in (seconds until the next trial request)
+    """
+    circuit = get_circuit(calendar_id) or {}
+
+    return {
+        "state": get_circuit_state(circuit),
+        "failures": circuit.get("failures", 0),
+        "last_error": circuit.get("last_error"),
+        "retry_in": max(int(circuit["retry_at"] - time.time()), 0) if circuit.get("opened_at") else None,
+    }
@@ -0,0 +1,151 @@
+import time
+
+import frappe
+import requests
+from frappe import _
+
+GOOGLE_TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+ACCESS_TOKEN_CACHE_KEY_PREFIX = "google_calendar_access_token"
+
+# A cached token is only handed out while it is valid for at least this long, so requests never use a token
+# that lapses on the way to Google
+ACCESS_TOKEN_MIN_VALIDITY = 5 * 60
+
+ACCESS_TOKEN_REQUEST_TIMEOUT = 10
+
+# Token endpoint errors that mean the refresh token was revoked or expired, see RFC 6749 section 5.2
+INVALID_REFRESH_TOKEN_ERRORS = ("invalid_grant", "unauthorized_client")
+
+
+def get_access_token_cache_key(google_calendar: str) -> str:
+    return f"{ACCESS_TOKEN_CACHE_KEY_PREFIX}|{google_calendar}"
+
+
+def get_cached_access_token(google_calendar: str) -> dict | None:
+    """Get the cached access token of a Google Calendar.
+
+    Args:
+    google_calendar (str): Google Calendar name
+
+    Returns:
+    dict: {"access_token": str, "expires_at": epoch seconds}, or None if no token is cached
+    """
+    return frappe.cache.get_value(get_access_token_cache_key(google_calendar))
+
+
+def get_access_token(account: object) -> dict:
+    """Get a valid access token of a Google Calendar, from the cache or from Google if none is cached.
+
+    Tokens are refreshed in the background before they expire, see refresh_expiring_access_tokens, so Google
+    is only asked here the first time a calendar is used or if the background job is behind.
+
+    Args:
+    account (Document): Google Calendar doc
+
+    Returns:
+    dict: {"access_token": str, "expires_at": epoch seconds}
+    """
+    access_token = get_cached_access_token(account.name)
+
+    if access_token and access_token["expires_at"] - ACCESS_TOKEN_MIN_VALIDITY > time.time():
+        return access_token
+
+    return refresh_access_token(account)
+
+
+def refresh_access_token(account: object) -> dict:
+    """Get a new access token of a Google Calendar from Google and cache it until it expires.
+
+    If Google rejects the refresh token, the Google Calendar is marked as not authorized right away. Tokens that
+    Google returns without a lifetime are not cached.
+
+    Args:
+    account (Document): Google Calendar doc
+
+    Returns:
+    dict: {"access_token": str, "expires_at": epoch seconds}
+    """
+    google_settings = frappe.get_cached_doc("Google Settings")
+
+    if not google_settings.enable:
+        frappe.throw(_("Google Calendar Integration is disabled."))
+
+    refresh_token = account.get_password(fieldname="refresh_token", raise_exception=False)
+
+    if not refresh_token:
+        mark_google_calendar_unauthorized(account.name)
+        frappe.throw(_("Google Calendar - Refresh token is missing for {0}.").format(account.name))
+
+    response = requests.post(
+        GOOGLE_TOKEN_URI,
+        data={
+            "client_id": google_settings.client_id,
+            "client_secret": google_settings.get_password(fieldname="client_secret", raise_exception=False),
+            "refresh_token": refresh_token,
+            "grant_type": "refresh_token",
+        },
+        timeout=ACCESS_TOKEN_REQUEST_TIMEOUT,
+    )
+
+    try:
+        token_response = response.json()
+    except ValueError:
+        token_response = {}
+
+    if token_response.get("error") in INVALID_REFRESH_TOKEN_ERRORS:
+        mark_google_calendar_unauthorized(account.name)
+        frappe.throw(
+            _("Google Calendar - Could not refresh the access token of {0}, please authorize again.").format(
+                account.name
+            )
+        )
+
+    response.raise_for_status()
+
+    if not token_response.get("access_token"):
+        frappe.throw(_("Google Calendar - Google did not return an access token for {0}.").format(account.name))
+
+    expires_in = int(token_response.get("expires_in") or 0)
+    access_token = {
+        "access_token": token_response["access_token"],
+        "expires_at": int(time.time()) + expires_in,
+    }
+
+    # A token without a lifetime is used for this request only, the cache would keep it forever
+    if expires_in > 0:
+        frappe.cache.set_value(get_access_token_cache_key(account.name), access_token, expires_in_sec=expires_in)
+
+    return access_token
+
+
+def clear_access_token(google_calendar: str):
+    """Drop the cached access token of a Google Calendar, e.g. after it was authorized again.
+
+    Args:
+    google_calendar (str): Google Calendar name
+    """
+    frappe.cache.delete_value(get_access_token_cache_key(google_calendar))
+
+
+def mark_google_calendar_unauthorized(google_calendar: str):
+    """Mark a Google Calendar as not authorized and drop its cached access token.
+
+    The flag is set in its own job, since the transaction of the caller is rolled back by the error that follows.
+
+    Args:
+    google_calendar (str): Google Calendar name
+    """
+    clear_access_token(google_calendar)
+    frappe.enqueue(
+        set_google_calendar_unauthorized,
+        google_calendar=google_calendar,
+        job_id=f"set_google_calendar_unauthorized|{google_calendar}",
+        deduplicate=True,
+    )
+
+
+def set_google_calendar_unauthorized(google_calendar: str):
+    frappe.db.set_value(
+        "Google Calendar", google_calendar, "custom_is_google_calendar_authorized", False, update_modified=False
+    )
@@ -0,0 +1,273 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import frappe
+from googleapiclient.errors import HttpError
+from googleapiclient.http import DEFAULT_HTTP_TIMEOUT_SEC
+
+from frappe_appointment.helpers.hedged_requests import get_current_http, set_http_timeout
+from frappe_appointment.helpers.request_deadline import get_remaining_time, is_interactive_request, limit_to_deadline
+
+GOOGLE_API_QUOTA_KEY_PREFIX = "appointment_google_api_quota"
+
+# A bucket holds this many seconds worth of its budget, so short bursts pass without waiting
+GOOGLE_API_BURST_SECONDS = 10
+
+# Share of every bucket background jobs leave to interactive requests, e.g. guests on the booking page
+GOOGLE_API_INTERACTIVE_RESERVE = 0.2
+
+# Seconds a call may spend waiting for quota and backing off before it gives up
+GOOGLE_API_INTERACTIVE_MAX_WAIT = 5
+GOOGLE_API_BACKGROUND_MAX_WAIT = 60
+
+GOOGLE_API_BACKOFF_BASE = 1
+GOOGLE_API_BACKOFF_MAX = 32
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+# Takes `count` tokens from every bucket in KEYS, or none if any of them runs short. ARGV holds the current time
+# and count, followed by rate, capacity and reserve of every bucket. Returns the seconds to wait before enough
+# tokens are available, "0" if they were taken.
+TAKE_TOKENS_SCRIPT = """
+local now = tonumber(ARGV[1])
+local count = tonumber(ARGV[2])
+local wait = 0
+local tokens = {}
+
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[3 * i])
+    local capacity = tonumber(ARGV[3 * i + 1])
+    local reserve = tonumber(ARGV[3 * i + 2])
+    local bucket = redis.call("HMGET", key, "tokens", "at")
+    local available = tonumber(bucket[1]) or capacity
+
+    available = math.min(capacity, available + math.max(now - (tonumber(bucket[2]) or now), 0) * rate)
+    tokens[i] = available
+
+    if available - reserve < count then
+        wait = math.max(wait, (count + reserve - available) / rate)
+    end
+end
+
+if wait > 0 then
+    return tostring(wait)
+end
+
+for i, key in ipairs(KEYS) do
+    redis.call("HSET", key, "tokens", tostring(tokens[i] - count), "at", tostring(now))
+    redis.call("EXPIRE", key, math.ceil(tonumber(ARGV[3 * i + 1]) / tonumber(ARGV[3 * i])) + 1)
+end
+
+return "0"
+"""
+
+_take_tokens_script = None
+
+
+class GoogleAPIQuotaExceeded(Exception):
+    pass
+
+
+def get_google_api_quota_settings() -> tuple:
+    """Get the request budgets per minute of the Google project and of a single calendar account, and the
+    number of retries, from Appointment Settings. A budget of 0 disables that limit.
+
+    Returns:
+    tuple: (project budget, account budget, max retries)
+    """
+    settings = frappe.db.get_value(
+        "Appointment Settings",
+        None,
+        ["google_api_project_quota", "google_api_user_quota", "google_api_max_retries"],
+        as_dict=True,
+    )
+
+    return (
+        int(settings.google_api_project_quota or 0),
+        int(settings.google_api_user_quota or 0),
+        int(settings.google_api_max_retries or 0),
+    )
+
+
+def get_google_api_deadline() -> float:
+    """Get the time until which the current call may wait for quota and retries, in epoch seconds. Never later
+    than the deadline of the current request.
+    """
+    max_wait = GOOGLE_API_INTERACTIVE_MAX_WAIT if is_interactive_request() else GOOGLE_API_BACKGROUND_MAX_WAIT
+    remaining_time = get_remaining_time()
+
+    if remaining_time is not None:
+        max_wait = min(max_wait, remaining_time)
+
+    return time.time() + max_wait
+
+
+def get_quota_buckets(google_calendar: str | None, project_quota: int, user_quota: int) -> list:
+    """Get the token buckets a request of a calendar account draws from.
+
+    The project bucket is shared by all sites that use the same Google client, since Google counts the quota
+    per project. The account bucket is kept per site.
+
+    Returns:
+    list: (Redis key, tokens per second, capacity) tuples
+    """
+    buckets = []
+
+    if project_quota:
+        client_id = frappe.db.get_single_value("Google Settings", "client_id")
+        buckets.append(
+            (
+                frappe.cache.make_key(f"{GOOGLE_API_QUOTA_KEY_PREFIX}|project|{client_id}", shared=True),
+                project_quota / 60,
+                project_quota / 60 * GOOGLE_API_BURST_SECONDS,
+            )
+        )
+
+    if user_quota and google_calendar:
+        buckets.append(
+            (
+                frappe.cache.make_key(f"{GOOGLE_API_QUOTA_KEY_PREFIX}|user|{google_calendar}"),
+                user_quota / 60,
+                user_quota / 60 * GOOGLE_API_BURST_SECONDS,
+            )
+        )
+
+    return buckets
+
+
+def acquire_google_api_quota(google_calendars: list, deadline: float):
+    """Wait until the budgets allow the given requests, and take them from the budgets.
+
+    Args:
+    google_calendars (list): Google Calendar name whose credentials are used, for every request to be sent.
+    None for requests that only count against the project budget
+    deadline (float): Epoch seconds after which to stop waiting
+
+    Raises:
+    GoogleAPIQuotaExceeded: If the budgets do not allow the requests before the deadline
+    """
+    global _take_tokens_script
+
+    project_quota, user_quota, _max_retries = get_google_api_quota_settings()
+
+    if not project_quota and not user_quota:
+        return
+
+    if _take_tokens_script is None:
+        _take_tokens_script = frappe.cache.register_script(TAKE_TOKENS_SCRIPT)
+
+    reserve_share = 0 if is_interactive_request() else GOOGLE_API_INTERACTIVE_RESERVE
+    counts = {}
+
+    for google_calendar in google_calendars:
+        counts[google_calendar] = counts.get(google_calendar, 0) + 1
+
+    for google_calendar, count in counts.items():
+        buckets = get_quota_buckets(google_calendar, project_quota, user_quota)
+
+        if not buckets:
+            continue
+
+        args = [0, count]
+        for _key, rate, capacity in buckets:
+            # A bucket must be able to hold the requests at all, however small its budget
+            capacity = max(capacity, count + capacity * reserve_share)
+            args.extend((rate, capacity, capacity * reserve_share))
+
+        while True:
+            args[0] = time.time()
+            wait = float(_take_tokens_script(keys=[key for key, _rate, _capacity in buckets], args=args))
+
+            if not wait:
+                break
+
+            if time.time() + wait > deadline:
+                raise GoogleAPIQuotaExceeded(f"Google API quota of {google_calendar or 'the project'} is used up")
+
+            time.sleep(wait)
+
+
+def is_retryable_google_error(err: Exception) -> bool:
+    """Check if a failed Google API request may succeed when it is sent again later, i.e. it hit a rate limit
+    or a temporary server error.
+    """
+    if not isinstance(err, HttpError):
+        return False
+
+    if err.resp.status in RETRYABLE_STATUSES:
+        return True
+
+    if err.resp.status == 403:
+        error_details = err.error_details if isinstance(err.error_details, list) else []
+        return any(isinstance(detail, dict) and detail.get("reason") in RATE_LIMIT_REASONS for detail in error_details)
+
+    return False
+
+
+def get_retry_delay(err: Exception, attempt: int) -> float:
+    """Get the seconds to wait before a failed request is sent again, honoring the Retry-After header.
+
+    Args:
+    err (Exception): Error of the failed request
+    attempt (int): Number of the retry, starting at 0
+
+    Returns:
+    float: Exponential backoff with full jitter, at least as long as Google asked for
+    """
+    delay = random.uniform(0, min(GOOGLE_API_BACKOFF_MAX, GOOGLE_API_BACKOFF_BASE * 2**attempt))
+    retry_after = getattr(err, "resp", None) and err.resp.get("retry-after")
+
+    if not retry_after:
+        return delay
+
+    try:
+        return max(delay, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        return max(delay, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return delay
+
+
+def execute_google_request(
+    google_request: object, google_calendar: str | None = None, timeout: int | None = None
+) -> dict:
+    """Execute a single Google API request within the configured quota, retrying it on rate limits and
+    temporary errors.
+
+    Args:
+    google_request (object): googleapiclient HttpRequest
+    google_calendar (str | None, optional): Google Calendar name whose credentials the request uses
+    timeout (int | None, optional): Socket timeout in seconds, defaults to the one of googleapiclient
+
+    Returns:
+    dict: Response of the request
+
+    Raises:
+    GoogleAPIQuotaExceeded: If the quota does not allow the request in time
+    """
+    _project_quota, _user_quota, max_retries = get_google_api_quota_settings()
+    deadline = get_google_api_deadline()
+
+    for attempt in range(max_retries + 1):
+        acquire_google_api_quota([google_calendar], deadline)
+
+        google_request.http = get_current_http(google_request.http)
+        set_http_timeout(google_request.http, limit_to_deadline(timeout or DEFAULT_HTTP_TIMEOUT_SEC))
+
+        try:
+            return google_request.execute()
+        except Exception as err:
+            if attempt == max_retries or not is_retryable_google_error(err):
+                raise
+
+            delay = get_retry_delay(err, attempt)
+
+            if time.time() + delay > deadline:
+                raise
+
+            time.sleep(delay)
@@ -1,4 +1,7 @@
 import json
+import threading
+import time
+from datetime import datetime, timezone
 
 import frappe
 from frappe import _
@@ -6,13 +9,102 @@ from frappe.integrations.doctype.google_calendar.google_calendar import (
     format_date_according_to_google_calendar,
     get_attendees,
     get_conference_data,
-    get_google_calendar_object,
     repeat_on_to_google_calendar_recurrence_rule,
 )
+from frappe.integrations.doctype.google_calendar.google_calendar import (
+    get_google_calendar_object as create_google_calendar_object,
+)
 from frappe.utils.data import get_datetime
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from frappe_appointment.helpers import api_urls
+from frappe_appointment.helpers.google_access_token import ACCESS_TOKEN_MIN_VALIDITY, GOOGLE_TOKEN_URI, get_access_token
+from frappe_appointment.helpers.google_api_quota import execute_google_request
+from frappe_appointment.helpers.hedged_requests import get_current_http
+
+GOOGLE_CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+# API clients and their http connections are not thread safe, so every thread of a worker keeps its own pool
+_client_pool = threading.local()
+
+
+def get_google_calendar_object(google_calendar: str) -> tuple:
+    """Get the Google Calendar API client and the Google Calendar doc, like frappe's get_google_calendar_object.
+
+    Clients are pooled per thread and reused across requests until the Google Calendar doc is modified (e.g. on
+    re-authorization). They are built from the discovery document bundled with googleapiclient and use the
+    access token cached in Redis, which is refreshed in the background before it expires.
+
+    Args:
+    google_calendar (str): Google Calendar name
+
+    Returns:
+    tuple: (Google Calendar API client, Google Calendar doc)
+    """
+    account = frappe.get_doc("Google Calendar", google_calendar)
+
+    if not account.google_calendar_id:
+        # frappe creates the calendar in Google and stores its id on the first call
+        return create_google_calendar_object(google_calendar)
+
+    clients = getattr(_client_pool, "clients", None)
+
+    if clients is None:
+        clients = _client_pool.clients = {}
+
+    key = (frappe.local.site, account.name)
+    client = clients.get(key)
+
+    if client is None or client.modified != account.modified:
+        client = clients[key] = build_google_calendar_client(account)
+
+    # A duplicate request that won a race moved the client to a new connection, see hedged_requests
+    client.service._http = get_current_http(client.service._http)
+
+    # Take over a new token in this thread, the fetch threads must not refresh it from the refresh token
+    if client.expires_at - ACCESS_TOKEN_MIN_VALIDITY <= time.time():
+        access_token = get_access_token(account)
+        client.credentials.token = access_token["access_token"]
+        client.credentials.expiry = datetime.fromtimestamp(access_token["expires_at"], timezone.utc).replace(
+            tzinfo=None
+        )
+        client.expires_at = access_token["expires_at"]
+
+    return client.service, account
+
+
+def build_google_calendar_client(account) -> frappe._dict:
+    """Build a Google Calendar API client for a Google Calendar doc.
+
+    Args:
+    account (Document): Google Calendar doc
+
+    Returns:
+    frappe._dict: modified of the doc, service (Google Calendar API client), credentials and expires_at of the
+    access token, 0 until a token is set
+    """
+    google_settings = frappe.get_cached_doc("Google Settings")
+
+    if not google_settings.enable:
+        frappe.throw(_("Google Calendar Integration is disabled."))
+
+    credentials = Credentials(
+        token=None,
+        refresh_token=account.get_password(fieldname="refresh_token", raise_exception=False),
+        token_uri=GOOGLE_TOKEN_URI,
+        client_id=google_settings.client_id,
+        client_secret=google_settings.get_password(fieldname="client_secret", raise_exception=False),
+        scopes=GOOGLE_CALENDAR_SCOPES,
+    )
+
+    return frappe._dict(
+        modified=account.modified,
+        service=build("calendar", "v3", credentials=credentials, static_discovery=True, cache_discovery=False),
+        credentials=credentials,
+        expires_at=0,
+    )
 
 
 def insert_event_in_google_calendar_override(
@@ -92,15 +184,14 @@ def insert_event_in_google_calendar_override(
         conference_data_version = 1
 
     try:
-        event = (
-            google_calendar.events()
-            .insert(
+        event = execute_google_request(
+            google_calendar.events().insert(
                 calendarId=doc.google_calendar_id,
                 body=event,
                 conferenceDataVersion=conference_data_version,
                 sendUpdates="all",
-            )
-            .execute()
+            ),
+            doc.google_calendar,
         )
 
         if update_doc:
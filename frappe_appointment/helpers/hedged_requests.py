@@ -0,0 +1,210 @@
+import copy
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import frappe
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.http import build_http
+
+from frappe_appointment.helpers.request_deadline import is_interactive_request
+
+HEDGE_LATENCY_KEY_PREFIX = "appointment_google_latency"
+
+# Only reads are sent twice, the response of either copy is the same
+HEDGED_METHODS = ("calendar.events.list", "calendar.freebusy.query")
+
+# A duplicate is sent once a request takes longer than this share of the recent requests of its endpoint
+HEDGE_PERCENTILE = 0.9
+HEDGE_LATENCY_SAMPLES = 200
+HEDGE_MIN_SAMPLES = 20
+
+# The percentile of an endpoint is read from Redis at most this often per worker
+HEDGE_DELAY_CACHE_SECONDS = 10
+
+# Executor running the hedged requests and their duplicates, recreated when the configured size changes
+_hedge_executor = None
+_hedge_executor_workers = 0
+
+# (site, endpoint) -> (expires_at, hedge delay in seconds or None)
+_hedge_delays = {}
+
+
+def is_hedging_enabled() -> bool:
+    """Check if slow Google requests are sent twice, which is only done while a guest waits for the response."""
+    return (
+        bool(frappe.db.get_single_value("Appointment Settings", "hedge_google_requests")) and is_interactive_request()
+    )
+
+
+def get_latency_key(endpoint: str) -> str:
+    return f"{HEDGE_LATENCY_KEY_PREFIX}|{endpoint}"
+
+
+def record_latencies(latencies: list):
+    """Keep the latencies of answered Google requests, the most recent HEDGE_LATENCY_SAMPLES per endpoint.
+
+    Args:
+    latencies (list): (endpoint, seconds) tuples
+    """
+    for endpoint, seconds in latencies:
+        frappe.cache.lpush(get_latency_key(endpoint), round(seconds, 3))
+        frappe.cache.ltrim(get_latency_key(endpoint), 0, HEDGE_LATENCY_SAMPLES - 1)
+
+
+def get_hedge_delay(endpoint: str) -> float | None:
+    """Get the seconds after which a duplicate of a request to the endpoint is sent.
+
+    Args:
+    endpoint (str): API method id, e.g. calendar.events.list
+
+    Returns:
+    float | None: The HEDGE_PERCENTILE latency of the endpoint, None while there are too few samples
+    """
+    key = (frappe.local.site, endpoint)
+    expires_at, hedge_delay = _hedge_delays.get(key, (0, None))
+
+    if expires_at > time.time():
+        return hedge_delay
+
+    latencies = sorted(float(seconds) for seconds in frappe.cache.lrange(get_latency_key(endpoint), 0, -1))
+    hedge_delay = latencies[int(len(latencies) * HEDGE_PERCENTILE)] if len(latencies) >= HEDGE_MIN_SAMPLES else None
+
+    _hedge_delays[key] = (time.time() + HEDGE_DELAY_CACHE_SECONDS, hedge_delay)
+
+    return hedge_delay
+
+
+def get_hedge_delays(google_requests: dict) -> dict:
+    """Get the hedge delay of every request that may be hedged.
+
+    Args:
+    google_requests (dict): key -> googleapiclient HttpRequest
+
+    Returns:
+    dict: key -> hedge delay in seconds, None if no duplicate is sent but the latency is still recorded
+    """
+    if not is_hedging_enabled():
+        return {}
+
+    return {
+        key: get_hedge_delay(google_request.methodId)
+        for key, google_request in google_requests.items()
+        if google_request.methodId in HEDGED_METHODS
+    }
+
+
+def get_hedge_executor(workers: int) -> ThreadPoolExecutor:
+    global _hedge_executor, _hedge_executor_workers
+
+    # A hedged request and its duplicate run side by side for every worker of the calendar fetch, and the losing
+    # copies keep a thread until they time out
+    workers = 4 * workers
+
+    if _hedge_executor is None or _hedge_executor_workers != workers:
+        if _hedge_executor is not None:
+            _hedge_executor.shutdown(wait=False)
+
+        _hedge_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="google_calendar_hedge")
+        _hedge_executor_workers = workers
+
+    return _hedge_executor
+
+
+def get_current_http(http: object) -> object:
+    """Get the http connection that took over from the given one, after a duplicate request on it won.
+
+    Pooled clients keep using the new connection, since the old one is still busy with the slow request.
+    """
+    while getattr(http, "replaced_by", None) is not None:
+        http = http.replaced_by
+
+    return http
+
+
+def set_http_timeout(http: object, timeout: float | None):
+    """Set the socket timeout of the next request on an http connection, unwrapping authorized http wrappers.
+
+    httplib2 only hands its timeout to the connections it opens, and pooled clients keep their connections open
+    across requests, so the open connections and their sockets get the new timeout too.
+    """
+    while http is not None:
+        if hasattr(http, "timeout"):
+            http.timeout = timeout
+
+        for connection in getattr(http, "connections", {}).values():
+            connection.timeout = timeout
+
+            if getattr(connection, "sock", None) is not None:
+                connection.sock.settimeout(timeout)
+
+        http = getattr(http, "http", None)
+
+
+def build_duplicate_http(http: object) -> AuthorizedHttp:
+    """Build a new connection with the credentials and timeout of the given authorized http."""
+    duplicate_http = build_http()
+    duplicate_http.timeout = getattr(http.http, "timeout", None)
+
+    return AuthorizedHttp(http.credentials, http=duplicate_http)
+
+
+def execute_hedged(
+    google_request: object, hedge_delay: float | None, latencies: list, executor: ThreadPoolExecutor
+) -> tuple:
+    """Execute a request, and send a duplicate on a new connection if it does not answer within the hedge delay.
+    The answer that arrives first is used, unless it is an error and the other one still succeeds.
+
+    Runs in the fetch threads, so it must not use frappe.
+
+    Args:
+    google_request (object): googleapiclient HttpRequest
+    hedge_delay (float | None): Seconds after which the duplicate is sent, None to not send one
+    latencies (list): The (endpoint, seconds) of the answer is appended to it, see record_latencies
+    executor (ThreadPoolExecutor): Executor to run the request and its duplicate in
+
+    Returns:
+    tuple: (response, error)
+    """
+    start = time.monotonic()
+
+    if hedge_delay is None:
+        response, err = execute_request(google_request)
+    else:
+        response, err = _execute_with_duplicate(google_request, hedge_delay, executor)
+
+    if err is None:
+        latencies.append((google_request.methodId, time.monotonic() - start))
+
+    return response, err
+
+
+def _execute_with_duplicate(google_request: object, hedge_delay: float, executor: ThreadPoolExecutor) -> tuple:
+    request_future = executor.submit(execute_request, google_request)
+
+    if wait([request_future], timeout=hedge_delay).done:
+        return request_future.result()
+
+    duplicate_request = copy.copy(google_request)
+    duplicate_request.headers = dict(google_request.headers)
+    duplicate_request.http = build_duplicate_http(google_request.http)
+    duplicate_future = executor.submit(execute_request, duplicate_request)
+
+    done, _not_done = wait([request_future, duplicate_future], return_when=FIRST_COMPLETED)
+    answer_future = request_future if request_future in done else duplicate_future
+
+    if answer_future.result()[1] is not None:
+        answer_future = duplicate_future if answer_future is request_future else request_future
+
+    if answer_future is duplicate_future and not request_future.done():
+        # The old connection is still busy with the slow request, so the calendar continues on the new one
+        google_request.http.replaced_by = duplicate_request.http
+        google_request.http = duplicate_request.http
+
+    return answer_future.result()
+
+
+def execute_request(google_request: object) -> tuple:
+    try:
+        return google_request.execute(), None
+    except Exception as err:
+        return None, err
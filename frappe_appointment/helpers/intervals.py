@@ -1,3 +1,8 @@
+from array import array
+
+from frappe_appointment.helpers.utils import epoch_to_utc_datetime
+
+
 def find_intersection_interval(interval1: object, interval2: object):
     """
     Find the intersection of two intervals.
@@ -9,3 +14,98 @@ def find_intersection_interval(interval1: object, interval2: object):
         return None
 
     return (max(start1, start2), min(end1, end2))
+
+
+def union_intervals(intervals, max_gap: int = 0) -> "EpochIntervals":
+    """
+    Merge overlapping intervals, and intervals that are at most `max_gap` apart, into a minimal sorted list of
+    disjoint intervals with a single sweep.
+
+    Args:
+    intervals (iterable): (start, end) pairs in epoch seconds, sorted by start
+    max_gap (int, optional): Gap in seconds up to which neighbouring intervals are merged. Defaults to 0 (touching).
+
+    Returns:
+    EpochIntervals: Disjoint intervals
+    """
+    merged = EpochIntervals()
+    current_start = current_end = None
+
+    for start, end in intervals:
+        if current_end is not None and start <= current_end + max_gap:
+            current_end = max(current_end, end)
+            continue
+
+        if current_end is not None:
+            merged.append(current_start, current_end)
+
+        current_start, current_end = start, end
+
+    if current_end is not None:
+        merged.append(current_start, current_end)
+
+    return merged
+
+
+def largest_gap(intervals, start: int, end: int, buffer: int = 0) -> int:
+    """
+    Get the length of the largest free gap in [start, end] around the given busy intervals, keeping `buffer`
+    seconds free on both sides of every busy interval.
+
+    Args:
+    intervals (iterable): Disjoint (start, end) pairs in epoch seconds, sorted by start
+    start (int): Start of the window in epoch seconds
+    end (int): End of the window in epoch seconds
+    buffer (int, optional): Buffer in seconds around busy intervals. Defaults to 0.
+
+    Returns:
+    int: Length of the largest gap in seconds, 0 if there is none
+    """
+    largest = 0
+    free_from = start
+
+    for busy_start, busy_end in intervals:
+        if busy_start - buffer >= end:
+            break
+
+        largest = max(largest, busy_start - buffer - free_from)
+        free_from = max(free_from, busy_end + buffer)
+
+    return max(largest, end - free_from, 0)
+
+
+class EpochIntervals:
+    """
+    Compact list of [start, end] intervals in epoch seconds, stored as two array columns.
+    """
+
+    __slots__ = ("ends", "starts")
+
+    def __init__(self, intervals=()):
+        self.starts = array("q")
+        self.ends = array("q")
+
+        for start, end in intervals:
+            self.append(start, end)
+
+    def append(self, start: int, end: int):
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends, strict=True)
+
+    def __getitem__(self, index: int):
+        return self.starts[index], self.ends[index]
+
+    def to_slots(self) -> list:
+        """
+        Convert the intervals to the slot dicts of the API response.
+        """
+        return [
+            {"start_time": epoch_to_utc_datetime(start), "end_time": epoch_to_utc_datetime(end)}
+            for start, end in zip(self.starts, self.ends, strict=True)
+        ]
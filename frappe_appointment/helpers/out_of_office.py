@@ -4,10 +4,16 @@ import frappe
 from frappe import _
 from frappe.integrations.doctype.google_calendar.google_calendar import (
     format_date_according_to_google_calendar,
-    get_google_calendar_object,
 )
 from frappe.utils.data import add_days, get_datetime
 
+from frappe_appointment.frappe_appointment.doctype.appointment_time_slot.appointment_time_slot import (
+    get_member_calendars,
+)
+from frappe_appointment.helpers.busy_cache import invalidate_busy_cache
+from frappe_appointment.helpers.google_api_quota import execute_google_request
+from frappe_appointment.helpers.google_calendar import get_google_calendar_object
+
 
 def create_out_of_office_google_calander_event(
     leave_id: str, employee: str, start_date: datetime.date, end_date: datetime.date
@@ -16,7 +22,7 @@ def create_out_of_office_google_calander_event(
     Insert Events in Google Calendar if sync_with_google_calendar is checked.
     """
     try:
-        google_calendar = get_employee_google_calendar(employee)
+        google_calendar, account = get_employee_google_calendar(employee)
 
         if not google_calendar:
             return
@@ -32,9 +38,10 @@ def create_out_of_office_google_calander_event(
             "summary": "Out of Office",
         }
 
-        event = google_calendar.events().insert(calendarId="primary", body=event).execute()
+        event = execute_google_request(google_calendar.events().insert(calendarId="primary", body=event), account.name)
 
         frappe.db.set_value("Leave Application", leave_id, "custom_google_calendar_event_id", event.get("id"))
+        clear_employee_busy_cache(employee, start_date, end_date)
     except Exception as err:
         frappe.log_error(
             _("Google Calendar - Could not insert event in Google Calendar for leave req: {0}.").format(leave_id),
@@ -50,17 +57,25 @@ def delete_out_of_office_google_calendar_event(leave_id: str, employee: str, eve
     if not event_id:
         return
 
-    google_calendar = get_employee_google_calendar(employee)
+    google_calendar, account = get_employee_google_calendar(employee)
 
     if not google_calendar:
         return
 
     try:
-        event = google_calendar.events().get(calendarId="primary", eventId=event_id).execute()
+        event = execute_google_request(
+            google_calendar.events().get(calendarId="primary", eventId=event_id), account.name
+        )
         event["recurrence"] = None
         event["status"] = "cancelled"
 
-        google_calendar.events().update(calendarId="primary", eventId=event_id, body=event).execute()
+        execute_google_request(
+            google_calendar.events().update(calendarId="primary", eventId=event_id, body=event), account.name
+        )
+
+        leave_dates = frappe.db.get_value("Leave Application", leave_id, ["from_date", "to_date"])
+        if leave_dates:
+            clear_employee_busy_cache(employee, *leave_dates)
     except Exception as err:
         frappe.log_error(
             _("Google Calendar - Could not delete event in Google Calendar for leave req: {0}.").format(leave_id),
@@ -70,29 +85,45 @@ def delete_out_of_office_google_calendar_event(leave_id: str, employee: str, eve
 
 def get_employee_google_calendar(employee: str):
     """
-    Get Google Calendar for the employee.
+    Get Google Calendar API object and Google Calendar doc for the employee, (None, None) if there is none.
     """
     installed_apps = frappe.get_installed_apps()
     if "erpnext" not in installed_apps:
-        return
+        return None, None
     if "hrms" not in installed_apps:
-        return
+        return None, None
 
     user_email = frappe.db.get_value("Employee", employee, "user_id")
 
     if not user_email:
-        return
+        return None, None
 
     google_calendar = frappe.db.get_value(
         "Google Calendar", {"user": user_email, "google_calendar_id": user_email}, "name"
     )
 
     if not google_calendar:
-        return
+        return None, None
 
     google_calendar, account = get_google_calendar_object(google_calendar)
 
     if not account.push_to_google_calendar:
+        return None, None
+
+    return google_calendar, account
+
+
+def clear_employee_busy_cache(employee: str, start_date: datetime.date, end_date: datetime.date):
+    """
+    Clear the cached busy intervals of all calendars of the employee's user for the given dates.
+    """
+    user_email = frappe.db.get_value("Employee", employee, "user_id")
+
+    if not user_email:
         return
 
-    return google_calendar
+    google_calendars = get_member_calendars(user_email) + frappe.get_all(
+        "Google Calendar", filters={"user": user_email}, pluck="name"
+    )
+
+    invalidate_busy_cache(google_calendars, start_date, end_date)
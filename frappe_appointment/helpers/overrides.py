@@ -2,6 +2,12 @@ from functools import wraps
 
 import frappe
 
+from frappe_appointment.helpers.request_deadline import (
+    clear_request_deadline,
+    get_request_deadline_seconds,
+    set_request_deadline,
+)
+
 
 def add_response_code(func):
     """Function to add response code to the response"""
@@ -16,3 +22,24 @@ def add_response_code(func):
         return resp
 
     return wrapper
+
+
+def with_request_deadline(fieldname: str):
+    """Run the function within the latency budget configured in the given Appointment Settings field.
+
+    Args:
+    fieldname (str): Appointment Settings field holding the budget in seconds
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            set_request_deadline(get_request_deadline_seconds(fieldname))
+            try:
+                return func(*args, **kwargs)
+            finally:
+                clear_request_deadline()
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,94 @@
+import time
+
+import frappe
+
+LATE_CALENDAR_TREAT_AS_BUSY = "Treat as Busy"
+LATE_CALENDAR_OMIT = "Omit"
+
+
+def is_interactive_request() -> bool:
+    """Check if the Google API is called while answering a web request, rather than from a background job."""
+    return bool(getattr(frappe.local, "request", None))
+
+
+def get_request_deadline_seconds(fieldname: str) -> int:
+    """Get the latency budget of an endpoint from Appointment Settings, 0 if it has none.
+
+    Args:
+    fieldname (str): Appointment Settings field holding the budget in seconds
+    """
+    return int(frappe.db.get_single_value("Appointment Settings", fieldname) or 0)
+
+
+def set_request_deadline(seconds: int):
+    """Start the latency budget of the current request, the calendar fetches stop waiting for Google once it is spent.
+
+    Args:
+    seconds (int): Budget in seconds, 0 to not limit the request
+    """
+    frappe.flags.appointment_deadline = time.time() + seconds if seconds else None
+    frappe.flags.appointment_late_calendars = set()
+
+
+def clear_request_deadline():
+    frappe.flags.appointment_deadline = None
+    frappe.flags.appointment_late_calendars = None
+
+
+def get_remaining_time() -> float | None:
+    """Get the seconds left until the deadline of the current request, None if it has no deadline."""
+    if not frappe.flags.appointment_deadline:
+        return None
+
+    return max(frappe.flags.appointment_deadline - time.time(), 0)
+
+
+def limit_to_deadline(timeout: float | None) -> float | None:
+    """Shorten a timeout so that it ends with the deadline of the current request at the latest.
+
+    Args:
+    timeout (float | None): Timeout in seconds, None for no timeout
+
+    Returns:
+    float | None: The shorter of the timeout and the remaining time, None if neither is set
+    """
+    remaining_time = get_remaining_time()
+
+    if remaining_time is None:
+        return timeout
+
+    # A timeout of 0 means no timeout to sockets, so keep a moment to fail right away
+    remaining_time = max(remaining_time, 0.01)
+
+    return min(timeout, remaining_time) if timeout else remaining_time
+
+
+def is_request_deadline_exceeded() -> bool:
+    remaining_time = get_remaining_time()
+    return remaining_time is not None and remaining_time <= 0
+
+
+def is_deadline_error(err: Exception) -> bool:
+    """Check if a fetch failed because it ran into the deadline of the current request."""
+    if get_remaining_time() is None:
+        return False
+
+    # Fetch timeouts are cut to end with the deadline, so they can fire a moment before it
+    return is_request_deadline_exceeded() or isinstance(err, TimeoutError)
+
+
+def mark_calendar_late(calendar_id: str):
+    """Remember that a calendar did not answer before the deadline of the current request."""
+    if frappe.flags.appointment_late_calendars is not None:
+        frappe.flags.appointment_late_calendars.add(calendar_id)
+
+
+def is_calendar_late(calendar_id: str) -> bool:
+    return bool(frappe.flags.appointment_late_calendars) and calendar_id in frappe.flags.appointment_late_calendars
+
+
+def get_late_calendar_handling() -> str:
+    """Get how linked calendars that did not answer in time are handled: "Treat as Busy" blocks the whole window,
+    "Omit" leaves them out. Either way the response is marked as degraded.
+    """
+    return frappe.db.get_single_value("Appointment Settings", "late_calendar_handling") or LATE_CALENDAR_TREAT_AS_BUSY
@@ -0,0 +1,162 @@
+import threading
+import time
+from collections.abc import Callable
+
+import frappe
+
+SINGLE_FLIGHT_KEY_PREFIX = "appointment_single_flight"
+
+# Fetches of other workers are polled this often, and their results are kept this long for late followers
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+SINGLE_FLIGHT_RESULT_TTL = 30
+
+# Seconds to wait for the fetch of another caller if no calendar fetch timeout is configured
+SINGLE_FLIGHT_DEFAULT_TIMEOUT = 30
+
+# Fetches running in the threads of this worker process, (site, key) -> _Flight
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+# Result of a flight that did not finish, its followers fetch on their own
+_NO_RESULT = object()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = _NO_RESULT
+
+
+def is_cluster_coalescing_enabled() -> bool:
+    """Check if identical fetches are coalesced across all workers of the site, not only within a worker."""
+    return bool(frappe.db.get_single_value("Appointment Settings", "coalesce_fetches_across_workers"))
+
+
+def run_coalesced(keys: list, fetch: Callable[[list], dict], timeout: int | None = None) -> dict:
+    """Fetch the given keys, sharing the results with concurrent callers that ask for the same keys.
+
+    The first caller of a key fetches it and every caller that asks for it while that fetch is in flight waits for
+    its result instead of fetching again. Within a worker this is coordinated in memory; across workers through a
+    lock and a result key in Redis when enabled in Appointment Settings. A caller whose leader fails or does not
+    finish in time fetches the key on its own.
+
+    Args:
+    keys (list): Keys identifying what is fetched, e.g. a calendar and time window
+    fetch (Callable): Fetches a list of keys, returns key -> result. Results are shared, so they must not be
+    modified by the callers, and must be picklable for the result key in Redis
+    timeout (int | None, optional): Seconds to wait for the fetch of another caller
+
+    Returns:
+    dict: key -> result
+    """
+    if not keys:
+        return {}
+
+    site = frappe.local.site
+    timeout = timeout or SINGLE_FLIGHT_DEFAULT_TIMEOUT
+    leading, following = {}, {}
+
+    with _in_flight_lock:
+        for key in keys:
+            if (site, key) in _in_flight:
+                following[key] = _in_flight[(site, key)]
+            else:
+                leading[key] = _in_flight[(site, key)] = _Flight()
+
+    results = {}
+    cluster = bool(leading) and is_cluster_coalescing_enabled()
+
+    try:
+        fetching, waiting = list(leading), []
+
+        if cluster:
+            fetching = [key for key in leading if acquire_flight_lock(key, timeout)]
+            waiting = [key for key in leading if key not in fetching]
+
+        try:
+            if fetching:
+                results.update(fetch(fetching))
+
+                if cluster:
+                    publish_flight_results({key: results[key] for key in fetching if key in results})
+        finally:
+            if cluster:
+                release_flight_locks(fetching)
+
+        if waiting:
+            results.update(wait_for_flight_results(waiting, timeout))
+
+            if missing := [key for key in waiting if key not in results]:
+                results.update(fetch(missing))
+    finally:
+        with _in_flight_lock:
+            for key, flight in leading.items():
+                flight.result = results.get(key, _NO_RESULT)
+                _in_flight.pop((site, key), None)
+                flight.done.set()
+
+    for key, flight in following.items():
+        if flight.done.wait(timeout) and flight.result is not _NO_RESULT:
+            results[key] = flight.result
+
+    if missing := [key for key in following if key not in results]:
+        results.update(fetch(missing))
+
+    return results
+
+
+def get_flight_lock_key(key: str) -> str:
+    return f"{SINGLE_FLIGHT_KEY_PREFIX}|lock|{key}"
+
+
+def get_flight_result_key(key: str) -> str:
+    return f"{SINGLE_FLIGHT_KEY_PREFIX}|result|{key}"
+
+
+def acquire_flight_lock(key: str, timeout: int) -> bool:
+    """Take the Redis lock of a key, it expires on its own if the worker holding it dies."""
+    return bool(frappe.cache.set(frappe.cache.make_key(get_flight_lock_key(key)), 1, nx=True, ex=max(int(timeout), 1)))
+
+
+def release_flight_locks(keys: list):
+    if keys:
+        frappe.cache.delete_value([get_flight_lock_key(key) for key in keys])
+
+
+def publish_flight_results(results: dict):
+    for key, result in results.items():
+        frappe.cache.set_value(get_flight_result_key(key), result, expires_in_sec=SINGLE_FLIGHT_RESULT_TTL)
+
+
+def wait_for_flight_results(keys: list, timeout: int) -> dict:
+    """Wait for the results of fetches that run in other workers.
+
+    Args:
+    keys (list): Keys fetched by other workers
+    timeout (int): Seconds to wait at most
+
+    Returns:
+    dict: key -> result, keys whose fetch failed or did not finish in time are left out
+    """
+    results = {}
+    pending = list(keys)
+    deadline = time.monotonic() + timeout
+
+    while pending and time.monotonic() < deadline:
+        for key in list(pending):
+            # The result is published before the lock is released, so check the lock first
+            is_locked = frappe.cache.exists(get_flight_lock_key(key))
+            # expires=True skips the request local cache, which would keep returning the first miss
+            result = frappe.cache.get_value(get_flight_result_key(key), expires=True)
+
+            if result is not None:
+                results[key] = result
+                pending.remove(key)
+            elif not is_locked:
+                # The other worker gave up without a result
+                pending.remove(key)
+
+        if pending:
+            time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+
+    return results
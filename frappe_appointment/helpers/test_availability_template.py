@@ -0,0 +1,86 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import frappe
+import pytz
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_appointment.helpers.availability_template import (
+    clear_availability_template,
+    get_availability_template_cache_key,
+    get_availability_templates,
+    get_working_hours,
+)
+from frappe_appointment.helpers.utils import weekdays
+
+TEMPLATE_MEMBER = "_test_availability_template_member@example.com"
+
+
+def get_localized_working_hours(day: date, start_time: str, end_time: str, time_zone: str) -> tuple:
+    """Working hours of a date as they were computed before the templates, localizing the times of every date."""
+    local_timezone = pytz.timezone(time_zone)
+
+    return tuple(
+        local_timezone.localize(datetime.strptime(f"{day} {time_str}", "%Y-%m-%d %H:%M:%S")).astimezone(pytz.utc)
+        for time_str in (start_time, end_time)
+    )
+
+
+class TestAvailabilityTemplate(FrappeTestCase):
+    def assert_working_hours_follow_dst(self, template: dict, time_zone: str, dst_change: date):
+        for offset in range(-3, 4):
+            day = dst_change + timedelta(days=offset)
+
+            self.assertEqual(
+                get_working_hours(template, day, weekdays[day.weekday()]),
+                get_localized_working_hours(day, "09:00:00", "17:30:00", time_zone),
+            )
+
+    def test_working_hours_across_dst_changes(self):
+        every_day = {weekday: (9 * 3600, 17 * 3600 + 1800) for weekday in weekdays}
+
+        for time_zone, dst_changes in (
+            ("America/New_York", (date(2024, 3, 10), date(2024, 11, 3))),
+            ("Europe/Berlin", (date(2024, 3, 31), date(2024, 10, 27))),
+            ("Australia/Sydney", (date(2024, 4, 7), date(2024, 10, 6))),
+        ):
+            for dst_change in dst_changes:
+                self.assert_working_hours_follow_dst({"time_zone": time_zone, "days": every_day}, time_zone, dst_change)
+
+    def test_users_without_timezone_follow_the_system_timezone(self):
+        template = {"time_zone": None, "days": {weekday: (9 * 3600, 17 * 3600 + 1800) for weekday in weekdays}}
+
+        with patch(
+            "frappe_appointment.helpers.availability_template.get_system_timezone", return_value="Europe/Berlin"
+        ):
+            self.assert_working_hours_follow_dst(template, "Europe/Berlin", date(2024, 3, 31))
+
+    def test_days_off(self):
+        template = {"time_zone": "Europe/Berlin", "days": {"Monday": (9 * 3600, 17 * 3600)}}
+
+        self.assertIsNone(get_working_hours(template, date(2024, 3, 31), "Sunday"))
+        self.assertIsNotNone(get_working_hours(template, date(2024, 4, 1), "Monday"))
+
+    @patch("frappe_appointment.helpers.availability_template.frappe.db.get_all")
+    def test_templates_are_cached_until_the_availability_changes(self, get_all):
+        get_all.return_value = [
+            frappe._dict(parent=TEMPLATE_MEMBER, day="Monday", start_time="9:00:00", end_time="17:30:00")
+        ]
+        clear_availability_template(TEMPLATE_MEMBER)
+        self.addCleanup(clear_availability_template, TEMPLATE_MEMBER)
+
+        template = {"time_zone": None, "days": {"Monday": (9 * 3600, 17 * 3600 + 1800)}}
+        self.assertEqual(get_availability_templates([TEMPLATE_MEMBER]), {TEMPLATE_MEMBER: template})
+        self.assertEqual(get_availability_templates([TEMPLATE_MEMBER]), {TEMPLATE_MEMBER: template})
+        get_all.assert_called_once()
+
+        # The cached template expires even if a change is missed
+        self.assertGreater(
+            frappe.cache.ttl(frappe.cache.make_key(get_availability_template_cache_key(TEMPLATE_MEMBER))), 0
+        )
+
+        get_all.return_value = []
+        clear_availability_template(TEMPLATE_MEMBER)
+        self.assertEqual(
+            get_availability_templates([TEMPLATE_MEMBER]), {TEMPLATE_MEMBER: {"time_zone": None, "days": {}}}
+        )
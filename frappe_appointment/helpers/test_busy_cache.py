@@ -0,0 +1,85 @@
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytz
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_appointment.frappe_appointment.doctype.appointment_time_slot.appointment_time_slot import CalendarEvent
+from frappe_appointment.helpers.busy_cache import (
+    get_cached_calendar_events,
+    invalidate_busy_cache,
+    invalidate_calendar_busy_cache,
+    set_cached_calendar_events,
+)
+
+TEST_CALENDAR = "_Test Busy Cache Calendar"
+
+
+def get_epoch(hour: int, day: int = 6) -> int:
+    return int(datetime(2024, 5, day, tzinfo=pytz.utc).timestamp()) + hour * 3600
+
+
+def get_window(start_hour: int, end_hour: int, day: int = 6) -> tuple:
+    return (f"2024-05-{day:02d}T{start_hour:02d}:00:00Z", f"2024-05-{day:02d}T{end_hour:02d}:00:00Z")
+
+
+def get_calendar_event(start_hour: int, end_hour: int, day: int = 6) -> CalendarEvent:
+    return CalendarEvent(get_epoch(start_hour, day), get_epoch(end_hour, day), None, None, None)
+
+
+@patch("frappe_appointment.helpers.busy_cache.get_busy_stale_ttl", return_value=0)
+@patch("frappe_appointment.helpers.busy_cache.get_busy_cache_ttl", return_value=300)
+class TestBusyCache(FrappeTestCase):
+    def setUp(self):
+        invalidate_calendar_busy_cache(TEST_CALENDAR)
+
+    def tearDown(self):
+        invalidate_calendar_busy_cache(TEST_CALENDAR)
+
+    def test_window_across_utc_midnight_is_kept_per_day(self, *_mocks):
+        night_event = get_calendar_event(22, 25)
+        set_cached_calendar_events(TEST_CALENDAR, [("2024-05-06T22:00:00Z", "2024-05-07T02:00:00Z")], [night_event])
+
+        self.assertEqual(get_cached_calendar_events(TEST_CALENDAR, [get_window(22, 23)]), [night_event])
+        self.assertEqual(get_cached_calendar_events(TEST_CALENDAR, [get_window(0, 2, day=7)]), [night_event])
+
+        # Dropping one of the days leaves the other one cached
+        invalidate_busy_cache([TEST_CALENDAR], date(2024, 5, 5), date(2024, 5, 5))
+        self.assertIsNone(get_cached_calendar_events(TEST_CALENDAR, [get_window(22, 23)]))
+        self.assertEqual(get_cached_calendar_events(TEST_CALENDAR, [get_window(0, 2, day=7)]), [night_event])
+
+    def test_windows_fetched_separately_add_up(self, *_mocks):
+        morning_event, afternoon_event = get_calendar_event(9, 10), get_calendar_event(13, 14)
+        set_cached_calendar_events(TEST_CALENDAR, [get_window(9, 12)], [morning_event])
+        set_cached_calendar_events(TEST_CALENDAR, [get_window(12, 15)], [afternoon_event])
+
+        self.assertEqual(
+            get_cached_calendar_events(TEST_CALENDAR, [get_window(9, 15)]), [morning_event, afternoon_event]
+        )
+        self.assertEqual(get_cached_calendar_events(TEST_CALENDAR, [get_window(12, 13)]), [])
+
+    def test_partial_coverage_is_a_miss(self, *_mocks):
+        set_cached_calendar_events(TEST_CALENDAR, [get_window(9, 12)], [get_calendar_event(9, 10)])
+
+        self.assertIsNone(get_cached_calendar_events(TEST_CALENDAR, [get_window(11, 13)]))
+        self.assertIsNone(get_cached_calendar_events(TEST_CALENDAR, [get_window(9, 10), get_window(14, 15)]))
+        self.assertIsNone(get_cached_calendar_events(TEST_CALENDAR, [get_window(9, 10, day=7)]))
+
+    def test_invalidation(self, *_mocks):
+        set_cached_calendar_events(TEST_CALENDAR, [get_window(9, 12)], [get_calendar_event(9, 10)])
+        set_cached_calendar_events(TEST_CALENDAR, [get_window(9, 12, day=9)], [get_calendar_event(9, 10, day=9)])
+
+        # The given times can be in any timezone, so the neighbouring days are dropped too
+        invalidate_busy_cache([TEST_CALENDAR], datetime(2024, 5, 7, 10), datetime(2024, 5, 7, 11))
+        self.assertIsNone(get_cached_calendar_events(TEST_CALENDAR, [get_window(9, 12)]))
+        self.assertIsNotNone(get_cached_calendar_events(TEST_CALENDAR, [get_window(9, 12, day=9)]))
+
+        invalidate_calendar_busy_cache(TEST_CALENDAR)
+        self.assertIsNone(get_cached_calendar_events(TEST_CALENDAR, [get_window(9, 12, day=9)]))
+
+    def test_nothing_is_cached_without_ttl(self, get_busy_cache_ttl, _get_busy_stale_ttl):
+        get_busy_cache_ttl.return_value = 0
+        set_cached_calendar_events(TEST_CALENDAR, [get_window(9, 12)], [get_calendar_event(9, 10)])
+
+        get_busy_cache_ttl.return_value = 300
+        self.assertIsNone(get_cached_calendar_events(TEST_CALENDAR, [get_window(9, 12)]))
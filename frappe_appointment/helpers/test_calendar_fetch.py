@@ -0,0 +1,114 @@
+import threading
+from unittest.mock import patch
+
+from frappe.tests.utils import FrappeTestCase
+from googleapiclient.http import DEFAULT_HTTP_TIMEOUT_SEC
+
+from frappe_appointment.helpers.calendar_fetch import execute_google_requests
+from frappe_appointment.helpers.google_api_quota import execute_google_request
+from frappe_appointment.helpers.hedged_requests import get_current_http
+from frappe_appointment.helpers.request_deadline import clear_request_deadline, set_request_deadline
+from frappe_appointment.tests.fake_google import FakeAuthorizedHttp, FakeBatchHttpRequest, FakeGoogleRequest
+
+
+@patch("frappe_appointment.helpers.google_api_quota.get_google_api_quota_settings", return_value=(0, 0, 0))
+@patch("frappe_appointment.helpers.calendar_fetch.get_google_api_quota_settings", return_value=(0, 0, 0))
+@patch("frappe_appointment.helpers.calendar_fetch.get_hedge_delays", return_value={})
+@patch("frappe_appointment.helpers.calendar_fetch.get_calendar_fetch_mode", return_value="Parallel")
+class TestCalendarFetch(FrappeTestCase):
+    def tearDown(self):
+        clear_request_deadline()
+
+    def test_warm_pooled_connection_gets_the_timeout_of_every_call(self, *_mocks):
+        pooled_http = FakeAuthorizedHttp()
+        google_request = FakeGoogleRequest(pooled_http, response={"items": []})
+
+        with patch("frappe_appointment.helpers.calendar_fetch.get_calendar_fetch_settings", return_value=(1, 10)):
+            execute_google_requests({"calendar": google_request})
+
+            # The deadline of the request cuts the timeout of the reused connection
+            set_request_deadline(2)
+            execute_google_requests({"calendar": google_request})
+            clear_request_deadline()
+
+        # A later request on the same connection does not inherit the tight timeout of the fetch before
+        execute_google_request(google_request)
+
+        self.assertEqual(google_request.socket_timeouts[0], 10)
+        self.assertLessEqual(google_request.socket_timeouts[1], 2)
+        self.assertEqual(google_request.socket_timeouts[2], DEFAULT_HTTP_TIMEOUT_SEC)
+        self.assertEqual(pooled_http.http.connections["https:www.googleapis.com"].timeout, DEFAULT_HTTP_TIMEOUT_SEC)
+
+    @patch(
+        "frappe_appointment.helpers.calendar_fetch.build_duplicate_http", side_effect=lambda http: FakeAuthorizedHttp()
+    )
+    def test_timed_out_connection_is_replaced(self, *_mocks):
+        release = threading.Event()
+        slow_request = FakeGoogleRequest(FakeAuthorizedHttp(), response={"items": []}, execute=release.wait)
+        fast_request = FakeGoogleRequest(FakeAuthorizedHttp(), response={"items": []})
+        slow_http, fast_http = slow_request.http, fast_request.http
+
+        try:
+            with patch("frappe_appointment.helpers.calendar_fetch.get_calendar_fetch_settings", return_value=(2, 1)):
+                results = execute_google_requests({"slow": slow_request, "fast": fast_request})
+        finally:
+            release.set()
+
+        self.assertIsInstance(results["slow"][1], TimeoutError)
+        self.assertEqual(results["fast"], ({"items": []}, None))
+
+        # The next fetch of the slow calendar does not queue behind the request still running on its connection
+        self.assertIsNot(get_current_http(slow_http), slow_http)
+        self.assertIs(get_current_http(fast_http), fast_http)
+
+    def test_parallel_results_are_mapped_to_their_keys(self, *_mocks):
+        shared_http = FakeAuthorizedHttp()
+        google_requests = {
+            "first": FakeGoogleRequest(shared_http, response={"items": [1]}),
+            "second": FakeGoogleRequest(shared_http, response={"items": [2]}),
+            "third": FakeGoogleRequest(FakeAuthorizedHttp(), response={"items": [3]}),
+            "failed": FakeGoogleRequest(FakeAuthorizedHttp(), error=ValueError("Not Found")),
+        }
+
+        with patch("frappe_appointment.helpers.calendar_fetch.get_calendar_fetch_settings", return_value=(3, 10)):
+            results = execute_google_requests(google_requests)
+
+        self.assertEqual(results["first"], ({"items": [1]}, None))
+        self.assertEqual(results["second"], ({"items": [2]}, None))
+        self.assertEqual(results["third"], ({"items": [3]}, None))
+
+        # An error only fails its own request
+        self.assertIsNone(results["failed"][0])
+        self.assertIsInstance(results["failed"][1], ValueError)
+
+    @patch("frappe_appointment.helpers.calendar_fetch.BatchHttpRequest", FakeBatchHttpRequest)
+    def test_batch_results_are_mapped_to_their_keys(self, calendar_fetch_mode, *_mocks):
+        calendar_fetch_mode.return_value = "Batch"
+        FakeBatchHttpRequest.sizes = []
+        google_requests = {
+            index: FakeGoogleRequest(FakeAuthorizedHttp(), response={"items": [index]}) for index in range(60)
+        }
+        google_requests["failed"] = FakeGoogleRequest(FakeAuthorizedHttp(), error=ValueError("Not Found"))
+
+        with patch("frappe_appointment.helpers.calendar_fetch.get_calendar_fetch_settings", return_value=(1, 10)):
+            results = execute_google_requests(google_requests)
+
+        self.assertEqual(FakeBatchHttpRequest.sizes, [50, 11])
+        self.assertEqual(results[0], ({"items": [0]}, None))
+        self.assertEqual(results[59], ({"items": [59]}, None))
+        self.assertIsNone(results["failed"][0])
+        self.assertIsInstance(results["failed"][1], ValueError)
+
+    @patch("frappe_appointment.helpers.calendar_fetch.BatchHttpRequest", FakeBatchHttpRequest)
+    def test_failed_batch_fails_only_its_requests(self, calendar_fetch_mode, *_mocks):
+        calendar_fetch_mode.return_value = "Batch"
+        google_requests = {
+            index: FakeGoogleRequest(FakeAuthorizedHttp(), response={"items": [index]}) for index in range(51)
+        }
+        google_requests[0].methodId = "batch.fails"
+
+        with patch("frappe_appointment.helpers.calendar_fetch.get_calendar_fetch_settings", return_value=(1, 10)):
+            results = execute_google_requests(google_requests)
+
+        self.assertTrue(all(isinstance(results[index][1], ConnectionError) for index in range(50)))
+        self.assertEqual(results[50], ({"items": [50]}, None))
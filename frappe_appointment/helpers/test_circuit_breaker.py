@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_appointment.helpers.circuit_breaker import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CIRCUIT_OPEN_SECONDS,
+    allow_calendar_request,
+    get_circuit,
+    get_circuit_key,
+    get_circuit_summary,
+    record_calendar_failure,
+    record_calendar_success,
+)
+
+TEST_CALENDAR = "_Test Circuit Breaker Calendar"
+
+
+@patch("frappe_appointment.helpers.circuit_breaker.frappe.log_error")
+@patch("frappe_appointment.helpers.circuit_breaker.time")
+class TestCircuitBreaker(FrappeTestCase):
+    def setUp(self):
+        frappe.cache.delete_value(get_circuit_key(TEST_CALENDAR))
+
+    def tearDown(self):
+        frappe.cache.delete_value(get_circuit_key(TEST_CALENDAR))
+
+    def test_circuit_opens_probes_and_closes(self, clock, log_error):
+        clock.time.return_value = 1_000_000
+
+        for _attempt in range(CIRCUIT_FAILURE_THRESHOLD - 1):
+            record_calendar_failure(TEST_CALENDAR, "503 Service Unavailable")
+
+        self.assertEqual(get_circuit_summary(TEST_CALENDAR)["state"], CIRCUIT_CLOSED)
+        self.assertTrue(allow_calendar_request(TEST_CALENDAR))
+
+        record_calendar_failure(TEST_CALENDAR, "503 Service Unavailable")
+
+        self.assertEqual(get_circuit_summary(TEST_CALENDAR)["state"], CIRCUIT_OPEN)
+        self.assertFalse(allow_calendar_request(TEST_CALENDAR))
+        log_error.assert_called_once()
+
+        clock.time.return_value += CIRCUIT_OPEN_SECONDS
+
+        # Only a single trial request passes a half-open circuit
+        self.assertEqual(get_circuit_summary(TEST_CALENDAR)["state"], CIRCUIT_HALF_OPEN)
+        self.assertTrue(allow_calendar_request(TEST_CALENDAR))
+        self.assertFalse(allow_calendar_request(TEST_CALENDAR))
+
+        record_calendar_success(TEST_CALENDAR)
+
+        self.assertIsNone(get_circuit(TEST_CALENDAR))
+        self.assertEqual(get_circuit_summary(TEST_CALENDAR)["state"], CIRCUIT_CLOSED)
+        self.assertTrue(allow_calendar_request(TEST_CALENDAR))
+
+    def test_failed_trial_doubles_the_open_time(self, clock, _log_error):
+        clock.time.return_value = 1_000_000
+
+        for _attempt in range(CIRCUIT_FAILURE_THRESHOLD):
+            record_calendar_failure(TEST_CALENDAR, "503 Service Unavailable")
+
+        clock.time.return_value += CIRCUIT_OPEN_SECONDS
+        self.assertTrue(allow_calendar_request(TEST_CALENDAR))
+        record_calendar_failure(TEST_CALENDAR, "503 Service Unavailable")
+
+        self.assertEqual(get_circuit_summary(TEST_CALENDAR)["state"], CIRCUIT_OPEN)
+        self.assertEqual(get_circuit_summary(TEST_CALENDAR)["retry_in"], 2 * CIRCUIT_OPEN_SECONDS)
+
+        clock.time.return_value += CIRCUIT_OPEN_SECONDS
+        self.assertFalse(allow_calendar_request(TEST_CALENDAR))
+
+        clock.time.return_value += CIRCUIT_OPEN_SECONDS
+        self.assertTrue(allow_calendar_request(TEST_CALENDAR))
@@ -0,0 +1,157 @@
+import time
+from unittest.mock import Mock, patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_appointment import hooks
+from frappe_appointment.helpers.google_access_token import (
+    ACCESS_TOKEN_MIN_VALIDITY,
+    clear_access_token,
+    get_access_token,
+    get_access_token_cache_key,
+    get_cached_access_token,
+    refresh_access_token,
+)
+from frappe_appointment.tasks.refresh_google_access_tokens import (
+    ACCESS_TOKEN_REFRESH_BEFORE,
+    refresh_expiring_access_tokens,
+)
+from frappe_appointment.tasks.reminder_google_calendar_auth import google_calendar_authorized
+
+TEST_CALENDAR = "_Test Access Token Calendar"
+GOOGLE_ACCESS_TOKEN_MODULE = "frappe_appointment.helpers.google_access_token"
+
+
+def get_token_response(token_response: dict, status_code: int = 200) -> Mock:
+    response = Mock(status_code=status_code)
+    response.json.return_value = token_response
+
+    if status_code >= 400:
+        response.raise_for_status.side_effect = Exception(f"{status_code} Error")
+
+    return response
+
+
+def get_google_calendar(refresh_token: str | None = "_test_refresh_token") -> frappe._dict:
+    return frappe._dict(
+        name=TEST_CALENDAR,
+        custom_is_google_calendar_authorized=1,
+        get_password=lambda fieldname, raise_exception=True: refresh_token,
+    )
+
+
+@patch(f"{GOOGLE_ACCESS_TOKEN_MODULE}.frappe.enqueue")
+@patch(
+    f"{GOOGLE_ACCESS_TOKEN_MODULE}.frappe.get_cached_doc",
+    return_value=frappe._dict(enable=1, client_id="_test_client", get_password=lambda **kwargs: "_test_secret"),
+)
+@patch(f"{GOOGLE_ACCESS_TOKEN_MODULE}.requests.post")
+class TestGoogleAccessToken(FrappeTestCase):
+    def setUp(self):
+        clear_access_token(TEST_CALENDAR)
+
+    def tearDown(self):
+        clear_access_token(TEST_CALENDAR)
+
+    def test_access_token_is_cached_until_it_expires(self, post, *_mocks):
+        post.return_value = get_token_response({"access_token": "_test_token", "expires_in": 3600})
+        google_calendar = get_google_calendar()
+
+        self.assertEqual(get_access_token(google_calendar)["access_token"], "_test_token")
+        self.assertEqual(get_access_token(google_calendar)["access_token"], "_test_token")
+        post.assert_called_once()
+
+        # A token about to expire is not handed out, a new one is asked for
+        frappe.cache.set_value(
+            get_access_token_cache_key(TEST_CALENDAR),
+            {"access_token": "_test_expiring_token", "expires_at": int(time.time()) + ACCESS_TOKEN_MIN_VALIDITY - 1},
+        )
+        post.return_value = get_token_response({"access_token": "_test_new_token", "expires_in": 3600})
+
+        self.assertEqual(get_access_token(google_calendar)["access_token"], "_test_new_token")
+        self.assertEqual(post.call_count, 2)
+
+    def test_access_token_without_lifetime_is_not_cached(self, post, *_mocks):
+        post.return_value = get_token_response({"access_token": "_test_token", "expires_in": 0})
+
+        self.assertEqual(refresh_access_token(get_google_calendar())["access_token"], "_test_token")
+        self.assertIsNone(get_cached_access_token(TEST_CALENDAR))
+
+    def test_response_without_access_token(self, post, *_mocks):
+        post.return_value = get_token_response({"expires_in": 3600})
+
+        self.assertRaises(frappe.ValidationError, refresh_access_token, get_google_calendar())
+        self.assertIsNone(get_cached_access_token(TEST_CALENDAR))
+
+    def test_revoked_refresh_token_marks_the_calendar_unauthorized(self, post, _get_cached_doc, enqueue):
+        frappe.cache.set_value(
+            get_access_token_cache_key(TEST_CALENDAR), {"access_token": "_test_token", "expires_at": 0}
+        )
+        post.return_value = get_token_response({"error": "invalid_grant"}, status_code=400)
+
+        self.assertRaises(frappe.ValidationError, refresh_access_token, get_google_calendar())
+
+        self.assertIsNone(get_cached_access_token(TEST_CALENDAR))
+        enqueue.assert_called_once()
+        self.assertEqual(enqueue.call_args.kwargs["google_calendar"], TEST_CALENDAR)
+
+    def test_daily_reminder_check_asks_google(self, post, *_mocks):
+        post.return_value = get_token_response({"access_token": "_test_token", "expires_in": 3600})
+        google_calendar = get_google_calendar()
+        get_access_token(google_calendar)
+
+        # The cached token is still valid, but the refresh token has been revoked since
+        post.return_value = get_token_response({"error": "invalid_grant"}, status_code=400)
+
+        self.assertFalse(google_calendar_authorized(google_calendar))
+        self.assertEqual(post.call_count, 2)
+
+
+@patch("frappe_appointment.tasks.refresh_google_access_tokens.refresh_access_token")
+@patch(
+    "frappe_appointment.tasks.refresh_google_access_tokens.frappe.get_doc",
+    side_effect=lambda doctype, name: frappe._dict(name=name),
+)
+@patch(
+    "frappe_appointment.tasks.refresh_google_access_tokens.frappe.get_all",
+    return_value=["_Test Missing Token", "_Test Expiring Token", "_Test Valid Token"],
+)
+class TestRefreshExpiringAccessTokens(FrappeTestCase):
+    def setUp(self):
+        now = int(time.time())
+        clear_access_token("_Test Missing Token")
+        frappe.cache.set_value(
+            get_access_token_cache_key("_Test Expiring Token"),
+            {"access_token": "_test_token", "expires_at": now + ACCESS_TOKEN_REFRESH_BEFORE - 1},
+        )
+        frappe.cache.set_value(
+            get_access_token_cache_key("_Test Valid Token"),
+            {"access_token": "_test_token", "expires_at": now + ACCESS_TOKEN_REFRESH_BEFORE + 600},
+        )
+
+    def tearDown(self):
+        for google_calendar in ("_Test Missing Token", "_Test Expiring Token", "_Test Valid Token"):
+            clear_access_token(google_calendar)
+
+    def test_job_runs_every_five_minutes(self, *_mocks):
+        self.assertIn(
+            "frappe_appointment.tasks.refresh_google_access_tokens.refresh_expiring_access_tokens",
+            hooks.scheduler_events["cron"]["*/5 * * * *"],
+        )
+
+    def test_missing_and_expiring_tokens_are_refreshed(self, _get_all, _get_doc, refresh):
+        refresh_expiring_access_tokens()
+
+        self.assertEqual(
+            [call.args[0].name for call in refresh.call_args_list], ["_Test Missing Token", "_Test Expiring Token"]
+        )
+
+    @patch("frappe_appointment.tasks.refresh_google_access_tokens.frappe.log_error")
+    def test_failed_refresh_does_not_stop_the_job(self, log_error, _get_all, _get_doc, refresh):
+        refresh.side_effect = [Exception("invalid_grant"), {"access_token": "_test_token"}]
+
+        refresh_expiring_access_tokens()
+
+        self.assertEqual(refresh.call_count, 2)
+        log_error.assert_called_once()
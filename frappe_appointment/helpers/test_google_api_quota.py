@@ -0,0 +1,122 @@
+import time
+from email.utils import formatdate
+from unittest.mock import Mock, patch
+
+from frappe.tests.utils import FrappeTestCase
+from googleapiclient.errors import HttpError
+
+from frappe_appointment.helpers.calendar_fetch import execute_google_requests
+from frappe_appointment.helpers.google_api_quota import (
+    GOOGLE_API_BACKOFF_MAX,
+    GoogleAPIQuotaExceeded,
+    execute_google_request,
+    get_retry_delay,
+)
+from frappe_appointment.tests.fake_google import FakeAuthorizedHttp, FakeGoogleRequest, get_http_error
+
+TEST_CALENDAR = "_Test Google API Quota Calendar"
+
+
+@patch("frappe_appointment.helpers.google_api_quota.time.sleep")
+@patch("frappe_appointment.helpers.google_api_quota.get_google_api_quota_settings", return_value=(0, 0, 3))
+class TestGoogleAPIQuota(FrappeTestCase):
+    def get_google_request(self, *answers) -> Mock:
+        return Mock(http=FakeAuthorizedHttp(), execute=Mock(side_effect=answers))
+
+    def test_temporary_errors_are_retried(self, _quota_settings, sleep):
+        google_request = self.get_google_request(get_http_error(503), get_http_error(429), {"items": []})
+
+        self.assertEqual(execute_google_request(google_request), {"items": []})
+        self.assertEqual(google_request.execute.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_retries_are_limited(self, quota_settings, _sleep):
+        quota_settings.return_value = (0, 0, 1)
+        google_request = self.get_google_request(get_http_error(503), get_http_error(503), {"items": []})
+
+        with self.assertRaises(HttpError):
+            execute_google_request(google_request)
+
+        self.assertEqual(google_request.execute.call_count, 2)
+
+    @patch("frappe_appointment.helpers.google_api_quota.random.uniform", return_value=0)
+    def test_retry_waits_as_long_as_google_asks(self, _uniform, _quota_settings, sleep):
+        google_request = self.get_google_request(get_http_error(429, "7"), {"items": []})
+
+        self.assertEqual(execute_google_request(google_request), {"items": []})
+        sleep.assert_called_once_with(7)
+
+    @patch("frappe_appointment.helpers.google_api_quota.random.uniform", return_value=0)
+    @patch("frappe_appointment.helpers.calendar_fetch.get_google_api_quota_settings", return_value=(0, 0, 3))
+    @patch("frappe_appointment.helpers.calendar_fetch.get_calendar_fetch_settings", return_value=(1, 10))
+    @patch("frappe_appointment.helpers.calendar_fetch.get_calendar_fetch_mode", return_value="Parallel")
+    @patch("frappe_appointment.helpers.calendar_fetch.get_hedge_delays", return_value={})
+    def test_retry_of_several_requests_waits_as_long_as_google_asks(self, *mocks):
+        # time.sleep is the same function in both helpers
+        sleep = mocks[-1]
+
+        def answer_after_the_wait():
+            if len(limited_request.socket_timeouts) > 1:
+                limited_request.error = None
+
+        limited_request = FakeGoogleRequest(
+            FakeAuthorizedHttp(), response={"items": []}, error=get_http_error(429, "7"), execute=answer_after_the_wait
+        )
+        google_requests = {
+            "limited": limited_request,
+            "other": FakeGoogleRequest(FakeAuthorizedHttp(), response={"items": [1]}),
+        }
+        results = execute_google_requests(google_requests)
+
+        self.assertEqual(results, {"limited": ({"items": []}, None), "other": ({"items": [1]}, None)})
+        sleep.assert_called_once_with(7)
+
+    def test_other_errors_are_not_retried(self, _quota_settings, sleep):
+        google_request = self.get_google_request(get_http_error(404), {"items": []})
+
+        with self.assertRaises(HttpError):
+            execute_google_request(google_request)
+
+        self.assertEqual(google_request.execute.call_count, 1)
+        sleep.assert_not_called()
+
+    def test_backoff_with_full_jitter(self, *_mocks):
+        for attempt in range(8):
+            delays = [get_retry_delay(get_http_error(503), attempt) for _sample in range(50)]
+            max_delay = min(GOOGLE_API_BACKOFF_MAX, 2**attempt)
+
+            self.assertTrue(all(0 <= delay <= max_delay for delay in delays))
+
+        # Full jitter spreads the retries over the whole range instead of the top of it
+        delays = [get_retry_delay(get_http_error(503), 4) for _sample in range(200)]
+        self.assertLess(min(delays), 8)
+
+    def test_retry_after(self, *_mocks):
+        with patch("frappe_appointment.helpers.google_api_quota.random.uniform", return_value=0):
+            self.assertEqual(get_retry_delay(get_http_error(429, "7"), 0), 7)
+
+            retry_delay = get_retry_delay(get_http_error(503, formatdate(time.time() + 20, usegmt=True)), 0)
+            self.assertTrue(18 <= retry_delay <= 20)
+
+            # A date that is already past does not shorten the backoff
+            self.assertEqual(get_retry_delay(get_http_error(503, formatdate(time.time() - 20, usegmt=True)), 0), 0)
+
+    @patch("frappe_appointment.helpers.google_api_quota._take_tokens_script", return_value="0")
+    def test_requests_within_quota_are_sent(self, take_tokens, quota_settings, _sleep):
+        quota_settings.return_value = (0, 600, 0)
+        google_request = self.get_google_request({"items": []})
+
+        self.assertEqual(execute_google_request(google_request, TEST_CALENDAR), {"items": []})
+        take_tokens.assert_called_once()
+
+    @patch("frappe_appointment.helpers.google_api_quota._take_tokens_script", return_value="120")
+    def test_requests_beyond_quota_are_refused(self, _take_tokens, quota_settings, sleep):
+        quota_settings.return_value = (0, 600, 0)
+        google_request = self.get_google_request({"items": []})
+
+        # The bucket refills later than the caller may wait, so it gives up without waiting
+        with self.assertRaises(GoogleAPIQuotaExceeded):
+            execute_google_request(google_request, TEST_CALENDAR)
+
+        google_request.execute.assert_not_called()
+        sleep.assert_not_called()
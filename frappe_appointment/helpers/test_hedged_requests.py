@@ -0,0 +1,151 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_appointment.helpers import hedged_requests
+from frappe_appointment.helpers.calendar_fetch import execute_google_requests
+from frappe_appointment.helpers.hedged_requests import (
+    HEDGE_MIN_SAMPLES,
+    execute_hedged,
+    get_current_http,
+    get_hedge_delay,
+    get_latency_key,
+    record_latencies,
+)
+from frappe_appointment.tests.fake_google import FakeAuthorizedHttp, FakeGoogleRequest, get_http_error
+
+TEST_ENDPOINT = "_test.calendar.events.list"
+
+
+class ConnectionAnsweredRequest(FakeGoogleRequest):
+    """Request answered by the connection it is sent on, so the duplicate of a hedge gets its own answer."""
+
+    def execute(self):
+        return self.http.answer()
+
+
+def get_connection(answer) -> FakeAuthorizedHttp:
+    http = FakeAuthorizedHttp()
+    http.answer = answer
+    return http
+
+
+def raise_error(err: Exception):
+    raise err
+
+
+class TestHedgedRequests(FrappeTestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.release = threading.Event()
+        self.duplicate_answer = None
+
+        patcher = patch(
+            "frappe_appointment.helpers.hedged_requests.build_duplicate_http",
+            side_effect=lambda http: get_connection(self.duplicate_answer),
+        )
+        self.build_duplicate_http = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        # Lets the slow copies finish, so no thread outlives the test
+        self.release.set()
+        self.executor.shutdown(wait=True)
+
+    def wait_and_answer(self, answer):
+        def slow_answer():
+            self.release.wait(5)
+            return answer() if callable(answer) else answer
+
+        return slow_answer
+
+    def test_primary_answers_before_the_hedge_delay(self):
+        google_request = ConnectionAnsweredRequest(get_connection(lambda: {"items": ["primary"]}))
+        latencies = []
+
+        self.assertEqual(execute_hedged(google_request, 1, latencies, self.executor), ({"items": ["primary"]}, None))
+        self.build_duplicate_http.assert_not_called()
+        self.assertEqual([endpoint for endpoint, _seconds in latencies], ["calendar.events.list"])
+
+    def test_duplicate_answers_first(self):
+        primary_http = get_connection(self.wait_and_answer({"items": ["primary"]}))
+        google_request = ConnectionAnsweredRequest(primary_http)
+        self.duplicate_answer = lambda: {"items": ["duplicate"]}
+
+        self.assertEqual(execute_hedged(google_request, 0.05, [], self.executor), ({"items": ["duplicate"]}, None))
+
+        # The calendar continues on the new connection, the old one is still busy with the slow request
+        self.assertIsNot(google_request.http, primary_http)
+        self.assertIs(get_current_http(primary_http), google_request.http)
+
+    def test_failed_duplicate_waits_for_the_primary(self):
+        primary_http = get_connection(self.wait_and_answer({"items": ["primary"]}))
+        google_request = ConnectionAnsweredRequest(primary_http)
+        self.duplicate_answer = lambda: raise_error(get_http_error(503))
+        threading.Timer(0.2, self.release.set).start()
+
+        self.assertEqual(execute_hedged(google_request, 0.05, [], self.executor), ({"items": ["primary"]}, None))
+        self.assertIs(get_current_http(primary_http), primary_http)
+
+    def test_both_copies_fail(self):
+        primary_http = get_connection(self.wait_and_answer(lambda: raise_error(ConnectionError("Connection reset"))))
+        google_request = ConnectionAnsweredRequest(primary_http)
+        self.duplicate_answer = lambda: raise_error(get_http_error(503))
+        threading.Timer(0.2, self.release.set).start()
+        latencies = []
+
+        response, err = execute_hedged(google_request, 0.05, latencies, self.executor)
+
+        self.assertIsNone(response)
+        self.assertIsNotNone(err)
+        self.assertEqual(latencies, [])
+        self.assertIs(get_current_http(primary_http), primary_http)
+
+    @patch("frappe_appointment.helpers.google_api_quota.get_google_api_quota_settings", return_value=(0, 0, 0))
+    @patch("frappe_appointment.helpers.calendar_fetch.get_google_api_quota_settings", return_value=(0, 0, 0))
+    @patch("frappe_appointment.helpers.calendar_fetch.get_calendar_fetch_mode", return_value="Parallel")
+    @patch("frappe_appointment.helpers.calendar_fetch.get_calendar_fetch_settings", return_value=(2, 10))
+    @patch("frappe_appointment.helpers.calendar_fetch.record_latencies")
+    @patch("frappe_appointment.helpers.calendar_fetch.get_hedge_delays", return_value={"slow": 0.05})
+    def test_calendar_fetch_moves_a_hedged_calendar_to_the_new_connection(self, *_mocks):
+        slow_http = get_connection(self.wait_and_answer({"items": ["primary"]}))
+        google_requests = {
+            "slow": ConnectionAnsweredRequest(slow_http),
+            "fast": ConnectionAnsweredRequest(get_connection(lambda: {"items": ["fast"]})),
+        }
+        self.duplicate_answer = lambda: {"items": ["duplicate"]}
+
+        results = execute_google_requests(google_requests)
+
+        self.assertEqual(results, {"slow": ({"items": ["duplicate"]}, None), "fast": ({"items": ["fast"]}, None)})
+        self.assertIsNot(get_current_http(slow_http), slow_http)
+
+
+class TestHedgeDelay(FrappeTestCase):
+    def setUp(self):
+        frappe.cache.delete_value(get_latency_key(TEST_ENDPOINT))
+        hedged_requests._hedge_delays.clear()
+
+    def tearDown(self):
+        self.setUp()
+
+    def test_no_hedge_without_enough_samples(self):
+        record_latencies([(TEST_ENDPOINT, 0.1)] * (HEDGE_MIN_SAMPLES - 1))
+
+        self.assertIsNone(get_hedge_delay(TEST_ENDPOINT))
+
+    def test_hedge_delay_is_the_percentile_of_recent_latencies(self):
+        record_latencies([(TEST_ENDPOINT, seconds / 10) for seconds in range(1, 21)])
+
+        # 90th percentile of 0.1 ... 2.0 seconds
+        self.assertEqual(get_hedge_delay(TEST_ENDPOINT), 1.9)
+
+        # The delay is kept per worker for a few seconds instead of reading the samples for every request
+        record_latencies([(TEST_ENDPOINT, 10)] * 20)
+        self.assertEqual(get_hedge_delay(TEST_ENDPOINT), 1.9)
+
+        hedged_requests._hedge_delays.clear()
+        self.assertEqual(get_hedge_delay(TEST_ENDPOINT), 10)
@@ -0,0 +1,84 @@
+import threading
+import time
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_appointment.helpers.single_flight import acquire_flight_lock, release_flight_locks, run_coalesced
+
+
+@patch("frappe_appointment.helpers.single_flight.is_cluster_coalescing_enabled", return_value=False)
+class TestSingleFlight(FrappeTestCase):
+    def run_leader(self, fetch) -> tuple:
+        """Start a caller in another thread and wait until its fetch is in flight."""
+        site = frappe.local.site
+        fetching, release = threading.Event(), threading.Event()
+        results = []
+
+        def leader_fetch(keys):
+            fetching.set()
+            release.wait(5)
+            return fetch(keys)
+
+        def lead():
+            frappe.local.site = site
+
+            try:
+                results.append(run_coalesced(["key"], leader_fetch))
+            except Exception as err:
+                results.append(err)
+
+        thread = threading.Thread(target=lead)
+        thread.start()
+        fetching.wait(5)
+
+        return thread, release, results
+
+    def follow(self, release: threading.Event, fetch) -> dict:
+        # The leader finishes while the follower waits for it
+        threading.Timer(0.1, release.set).start()
+        return run_coalesced(["key"], fetch, timeout=5)
+
+    def test_concurrent_callers_share_one_fetch(self, *_mocks):
+        fetched_keys = []
+
+        def fetch(keys):
+            fetched_keys.append(keys)
+            return {key: f"{key} result" for key in keys}
+
+        thread, release, leader_results = self.run_leader(fetch)
+        follower_results = self.follow(release, fetch)
+        thread.join()
+
+        self.assertEqual(fetched_keys, [["key"]])
+        self.assertEqual(leader_results, [{"key": "key result"}])
+        self.assertEqual(follower_results, {"key": "key result"})
+
+    def test_followers_fetch_on_their_own_if_the_leader_fails(self, *_mocks):
+        def failing_fetch(keys):
+            raise ConnectionError("Google Calendar is not reachable")
+
+        thread, release, leader_results = self.run_leader(failing_fetch)
+        follower_results = self.follow(release, lambda keys: {key: f"{key} result" for key in keys})
+        thread.join()
+
+        self.assertIsInstance(leader_results[0], ConnectionError)
+        self.assertEqual(follower_results, {"key": "key result"})
+
+    def test_expired_lock_of_another_worker(self, is_cluster_coalescing_enabled):
+        is_cluster_coalescing_enabled.return_value = True
+
+        # A worker took the lock and died before it published a result
+        acquire_flight_lock("key", 1)
+        start = time.monotonic()
+
+        try:
+            results = run_coalesced(["key"], lambda keys: {key: f"{key} result" for key in keys}, timeout=5)
+        finally:
+            release_flight_locks(["key"])
+
+        self.assertEqual(results, {"key": "key result"})
+
+        # The caller did not wait for its full timeout once the lock was gone
+        self.assertLess(time.monotonic() - start, 5)
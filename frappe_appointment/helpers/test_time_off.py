@@ -0,0 +1,140 @@
+from datetime import date
+from unittest.mock import Mock, patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_appointment.helpers.time_off import get_members_time_off, get_time_off_cache_key, is_member_off
+from frappe_appointment.overrides import employee_override, holiday_list_override, leave_application_override
+
+TIME_OFF_MEMBER = "_test_time_off_member@example.com"
+TIME_OFF_GUEST = "_test_time_off_guest@example.com"
+TIME_OFF_HOLIDAY_LIST = "_Test Time Off Holidays"
+
+
+class TestMemberTimeOff(FrappeTestCase):
+    def setUp(self):
+        self.clear_cache()
+
+        # Records of the HR doctypes, read through a fake frappe.get_all that filters them by date
+        self.employee = frappe._dict(name="_T-EMP-1", company_email=TIME_OFF_MEMBER, holiday_list=TIME_OFF_HOLIDAY_LIST)
+        self.leave_applications = [
+            frappe._dict(employee="_T-EMP-1", from_date=date(2024, 5, 30), to_date=date(2024, 6, 2))
+        ]
+        self.holidays = [date(2024, 5, 15), date(2024, 6, 20)]
+
+        get_all_patcher = patch("frappe_appointment.helpers.time_off.frappe.get_all", side_effect=self.get_all)
+        self.get_all_mock = get_all_patcher.start()
+        self.addCleanup(get_all_patcher.stop)
+
+    def tearDown(self):
+        self.clear_cache()
+
+    def clear_cache(self):
+        frappe.cache.delete_value([get_time_off_cache_key(TIME_OFF_MEMBER), get_time_off_cache_key(TIME_OFF_GUEST)])
+
+    def get_all(self, doctype: str, filters: dict, fields: list) -> list:
+        if doctype == "Employee":
+            return [self.employee]
+
+        if doctype == "Leave Application":
+            last_day, first_day = filters["from_date"][1], filters["to_date"][1]
+            return [
+                leave_application
+                for leave_application in self.leave_applications
+                if leave_application.from_date <= last_day and leave_application.to_date >= first_day
+            ]
+
+        first_day, last_day = filters["holiday_date"][1]
+        return [
+            frappe._dict(parent=self.employee.holiday_list, holiday_date=holiday_date)
+            for holiday_date in self.holidays
+            if first_day <= holiday_date <= last_day
+        ]
+
+    def get_member_time_off(self) -> dict:
+        return get_members_time_off([TIME_OFF_MEMBER], date(2024, 5, 1), date(2024, 5, 31))[TIME_OFF_MEMBER]
+
+    def test_time_off_is_indexed_per_month(self):
+        index = get_members_time_off([TIME_OFF_MEMBER, TIME_OFF_GUEST], date(2024, 5, 10), date(2024, 5, 20))
+
+        self.assertEqual(self.get_all_mock.call_count, 3)
+        self.assertTrue(is_member_off(index[TIME_OFF_MEMBER], date(2024, 5, 15)))
+        self.assertTrue(is_member_off(index[TIME_OFF_MEMBER], date(2024, 5, 31)))
+        self.assertFalse(is_member_off(index[TIME_OFF_MEMBER], date(2024, 5, 29)))
+        self.assertFalse(is_member_off(index[TIME_OFF_GUEST], date(2024, 5, 15)))
+        self.assertIsNone(index[TIME_OFF_GUEST]["employee"])
+
+        # Any other range within the month is answered from the cache
+        get_members_time_off([TIME_OFF_MEMBER, TIME_OFF_GUEST], date(2024, 5, 1), date(2024, 5, 31))
+        self.assertEqual(self.get_all_mock.call_count, 3)
+
+        # A new month is added to the months cached before
+        index = get_members_time_off([TIME_OFF_MEMBER], date(2024, 5, 25), date(2024, 6, 25))
+
+        self.assertEqual(self.get_all_mock.call_count, 6)
+        self.assertEqual(set(index[TIME_OFF_MEMBER]["months"]), {"2024-05", "2024-06"})
+        self.assertTrue(is_member_off(index[TIME_OFF_MEMBER], date(2024, 5, 15)))
+        self.assertTrue(is_member_off(index[TIME_OFF_MEMBER], date(2024, 6, 2)))
+        self.assertTrue(is_member_off(index[TIME_OFF_MEMBER], date(2024, 6, 20)))
+        self.assertFalse(is_member_off(index[TIME_OFF_MEMBER], date(2024, 6, 3)))
+
+    @patch("frappe_appointment.overrides.leave_application_override.frappe.enqueue")
+    @patch("frappe_appointment.overrides.leave_application_override.clear_employee_busy_cache")
+    @patch(
+        "frappe_appointment.overrides.leave_application_override.frappe.get_installed_apps",
+        return_value=["frappe", "erpnext", "hrms"],
+    )
+    @patch("frappe_appointment.helpers.time_off.frappe.db.get_value", return_value=TIME_OFF_MEMBER)
+    def test_leave_application_updates_the_index(self, *_mocks):
+        leave_application = frappe._dict(
+            name="_T-LEAVE-1",
+            employee="_T-EMP-1",
+            from_date=date(2024, 5, 6),
+            to_date=date(2024, 5, 7),
+            status="Approved",
+        )
+        self.assertFalse(is_member_off(self.get_member_time_off(), date(2024, 5, 6)))
+
+        self.leave_applications.append(leave_application)
+        leave_application_override.on_submit(leave_application)
+        self.assertTrue(is_member_off(self.get_member_time_off(), date(2024, 5, 6)))
+
+        self.leave_applications.remove(leave_application)
+        leave_application_override.on_cancel_and_on_trash(leave_application)
+        self.assertFalse(is_member_off(self.get_member_time_off(), date(2024, 5, 6)))
+
+    def test_holiday_list_updates_the_index(self):
+        self.assertFalse(is_member_off(self.get_member_time_off(), date(2024, 5, 1)))
+
+        self.holidays.append(date(2024, 5, 1))
+        holiday_list_override.on_update_and_on_trash(frappe._dict(name=TIME_OFF_HOLIDAY_LIST))
+        self.assertTrue(is_member_off(self.get_member_time_off(), date(2024, 5, 1)))
+
+        self.holidays.remove(date(2024, 5, 15))
+        holiday_list_override.on_update_and_on_trash(frappe._dict(name=TIME_OFF_HOLIDAY_LIST))
+        self.assertFalse(is_member_off(self.get_member_time_off(), date(2024, 5, 15)))
+
+    def test_employee_updates_the_index_of_old_and_new_email(self):
+        get_members_time_off([TIME_OFF_GUEST], date(2024, 5, 1), date(2024, 5, 31))
+        self.assertTrue(is_member_off(self.get_member_time_off(), date(2024, 5, 15)))
+
+        # The employee moves to the guest's email and to a holiday list without holidays
+        self.employee.update(company_email=TIME_OFF_GUEST, holiday_list=None)
+        employee = Mock(company_email=TIME_OFF_GUEST)
+        employee.has_value_changed.side_effect = lambda fieldname: fieldname in ("company_email", "holiday_list")
+        employee.get_doc_before_save.return_value = frappe._dict(company_email=TIME_OFF_MEMBER)
+        employee_override.on_update(employee)
+
+        index = get_members_time_off([TIME_OFF_MEMBER, TIME_OFF_GUEST], date(2024, 5, 1), date(2024, 5, 31))
+        self.assertIsNone(index[TIME_OFF_MEMBER]["employee"])
+        self.assertEqual(index[TIME_OFF_GUEST]["employee"], "_T-EMP-1")
+        self.assertFalse(is_member_off(index[TIME_OFF_GUEST], date(2024, 5, 15)))
+
+        # Changes to other fields keep the index
+        calls = self.get_all_mock.call_count
+        employee.has_value_changed.side_effect = lambda fieldname: fieldname == "designation"
+        employee_override.on_update(employee)
+
+        get_members_time_off([TIME_OFF_MEMBER, TIME_OFF_GUEST], date(2024, 5, 1), date(2024, 5, 31))
+        self.assertEqual(self.get_all_mock.call_count, calls)
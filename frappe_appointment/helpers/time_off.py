@@ -0,0 +1,160 @@
+from datetime import date, timedelta
+
+import frappe
+from frappe.utils import getdate
+
+TIME_OFF_CACHE_KEY_PREFIX = "appointment_member_time_off"
+
+# Employees can change without a hook of this app noticing, e.g. a new company email, so the index is rebuilt daily
+TIME_OFF_CACHE_TTL = 24 * 60 * 60
+
+
+def is_hrms_installed() -> bool:
+    installed_apps = frappe.get_installed_apps()
+    return "erpnext" in installed_apps and "hrms" in installed_apps
+
+
+def get_time_off_cache_key(member: str) -> str:
+    return f"{TIME_OFF_CACHE_KEY_PREFIX}|{member}"
+
+
+def get_month_key(day: date) -> str:
+    return day.strftime("%Y-%m")
+
+
+def get_members_time_off(members: list, start_date: date, end_date: date) -> dict:
+    """Get the approved leaves and holidays of the given users for every month touched by [start_date, end_date].
+
+    The index of a user is kept per month in Redis. The months that are not cached yet are built for all users
+    together, with one query for the employees, one for their leaves and one for the holidays of their holiday
+    lists.
+
+    Args:
+    members (list): User names
+    start_date (date): First date of the range
+    end_date (date): Last date of the range
+
+    Returns:
+    dict: User -> {"employee": Employee name or None, "holiday_list": Holiday List name or None,
+    "months": {"YYYY-MM": set of dates off}}. Users without an employee have no months
+    """
+    start_date, end_date = getdate(start_date), getdate(end_date)
+    months = set()
+    day = start_date
+
+    while day <= end_date:
+        months.add(get_month_key(day))
+        day = (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+    index = {}
+    missing_members = []
+
+    for member in set(members):
+        time_off = frappe.cache.get_value(get_time_off_cache_key(member))
+
+        if time_off is None or (time_off["employee"] and not months.issubset(time_off["months"])):
+            missing_members.append(member)
+
+        index[member] = time_off or {"employee": None, "holiday_list": None, "months": {}}
+
+    if not missing_members:
+        return index
+
+    # Build whole months, so any later range within them is answered from the cache
+    first_day = start_date.replace(day=1)
+    last_day = (end_date.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+    employees = {}
+
+    for employee in frappe.get_all(
+        "Employee",
+        filters={"company_email": ["in", missing_members]},
+        fields=["name", "company_email", "holiday_list"],
+    ):
+        # The first employee of a user is used, like a lookup by company email
+        employees.setdefault(employee.company_email, employee)
+
+    members_by_employee = {}
+    members_by_holiday_list = {}
+
+    for member in missing_members:
+        employee = employees.get(member)
+
+        if not employee:
+            index[member] = {"employee": None, "holiday_list": None, "months": {}}
+            continue
+
+        # Months cached before are kept, unless the employee or their holiday list changed in the meantime
+        cached_months = (
+            index[member]["months"]
+            if (index[member]["employee"], index[member]["holiday_list"]) == (employee.name, employee.holiday_list)
+            else {}
+        )
+        index[member] = {
+            "employee": employee.name,
+            "holiday_list": employee.holiday_list,
+            "months": {**cached_months, **{month: set() for month in months}},
+        }
+        members_by_employee[employee.name] = member
+
+        if employee.holiday_list:
+            members_by_holiday_list.setdefault(employee.holiday_list, []).append(member)
+
+    if members_by_employee:
+        for leave_application in frappe.get_all(
+            "Leave Application",
+            filters={
+                "employee": ["in", list(members_by_employee)],
+                "from_date": ["<=", last_day],
+                "to_date": [">=", first_day],
+                "status": "Approved",
+            },
+            fields=["employee", "from_date", "to_date"],
+        ):
+            day = max(getdate(leave_application.from_date), first_day)
+
+            while day <= min(getdate(leave_application.to_date), last_day):
+                add_day_off(index[members_by_employee[leave_application.employee]], day)
+                day += timedelta(days=1)
+
+    if members_by_holiday_list:
+        for holiday in frappe.get_all(
+            "Holiday",
+            filters={
+                "parent": ["in", list(members_by_holiday_list)],
+                "parenttype": "Holiday List",
+                "holiday_date": ["between", [first_day, last_day]],
+            },
+            fields=["parent", "holiday_date"],
+        ):
+            for member in members_by_holiday_list[holiday.parent]:
+                add_day_off(index[member], getdate(holiday.holiday_date))
+
+    for member in missing_members:
+        frappe.cache.set_value(get_time_off_cache_key(member), index[member], expires_in_sec=TIME_OFF_CACHE_TTL)
+
+    return index
+
+
+def add_day_off(time_off: dict, day: date):
+    time_off["months"][get_month_key(day)].add(day)
+
+
+def is_member_off(time_off: dict, day: date) -> bool:
+    """Check if a user is on an approved leave or has a holiday on a date, see get_members_time_off."""
+    return day in time_off["months"].get(get_month_key(day), ())
+
+
+def clear_member_time_off(members: list):
+    """Drop the cached leaves and holidays of the given users."""
+    frappe.cache.delete_value([get_time_off_cache_key(member) for member in members if member])
+
+
+def clear_employee_time_off(employee: str):
+    """Drop the cached leaves and holidays of the user of an employee."""
+    clear_member_time_off([frappe.db.get_value("Employee", employee, "company_email")])
+
+
+def clear_all_time_off():
+    """Drop the cached leaves and holidays of all users, e.g. after a holiday list changed."""
+    frappe.cache.delete_keys(f"{TIME_OFF_CACHE_KEY_PREFIX}|")
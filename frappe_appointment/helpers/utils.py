@@ -3,7 +3,7 @@ from datetime import datetime, timedelta
 import pytz
 from dateutil import parser
 from frappe.utils import convert_utc_to_system_timezone, get_datetime_str
-from frappe.utils.data import get_date_str, get_system_timezone
+from frappe.utils.data import get_system_timezone
 
 weekdays = [
     "Monday",
@@ -16,51 +16,79 @@ weekdays = [
 ]
 
 
-def get_today_min_max_time(date: datetime):
-    """Retrieve the current day's start and end time in UTC format.
+def get_window_min_max_time(starttime: datetime, endtime: datetime, buffer: int = 0):
+    """Retrieve the start and end time of a time window in UTC format, widened by the buffer on both sides.
 
     Args:
-    date (datetime): date
+    starttime (datetime): Timezone aware window start
+    endtime (datetime): Timezone aware window end
+    buffer (int): Seconds to add on both sides
 
     Returns:
-    list: Date start and end time
+    list: Window start and end time
     """
-    time_min = datetime(date.year, date.month, date.day, 0, 0, 0)
-    time_max = datetime(date.year, date.month, date.day, 23, 59, 59)
+    time_min = (starttime - timedelta(seconds=buffer)).astimezone(pytz.utc).replace(tzinfo=None)
+    time_max = (endtime + timedelta(seconds=buffer)).astimezone(pytz.utc).replace(tzinfo=None)
 
-    time_min_str = time_min.isoformat() + "Z"
-    time_max_str = time_max.isoformat() + "Z"
+    return [time_max.isoformat() + "Z", time_min.isoformat() + "Z"]
 
-    return [time_max_str, time_min_str]
 
-
-def get_utc_datatime_with_time(date: datetime, time: str) -> datetime:
-    """Function to generate a datetime object for a given date and time.
+def convert_timezone_to_utc(date_time: str, time_zone: str) -> datetime:
+    """Helper function to convert a given datetime string to a datetime object with the specified time zone.
 
     Args:
-    date (datetime): Date
-    time (str): Time
+    date_time (str): Datetime string
+    time_zone (str): Time zone
 
     Returns:
-    datetime: Updated datetime object
+    datetime: Datetime object
     """
-    system_timezone = pytz.timezone(get_system_timezone())
-    local_datetime = system_timezone.localize(datetime.strptime(f"{get_date_str(date)} {time}", "%Y-%m-%d %H:%M:%S"))
+    local_datetime = parser.parse(date_time).astimezone(pytz.timezone(time_zone))
     return local_datetime.astimezone(pytz.utc)
 
 
-def convert_timezone_to_utc(date_time: str, time_zone: str) -> datetime:
-    """Helper function to convert a given datetime string to a datetime object with the specified time zone.
+def parse_utc_datetime(date_time: str) -> datetime:
+    """Parse an RFC3339 datetime string with an offset (as returned by Google) into a UTC datetime object.
 
     Args:
-    date_time (str): Datetime string
-    time_zone (str): Time zone
+    date_time (str): Datetime string, e.g. 2024-01-01T10:00:00+05:30 or 2024-01-01T04:30:00Z
 
     Returns:
-    datetime: Datetime object
+    datetime: Datetime object in UTC
     """
-    local_datetime = parser.parse(date_time).astimezone(pytz.timezone(time_zone))
-    return local_datetime.astimezone(pytz.utc)
+    if date_time.endswith("Z"):
+        date_time = date_time[:-1] + "+00:00"
+
+    return datetime.fromisoformat(date_time).astimezone(pytz.utc)
+
+
+def convert_event_time_to_utc(event_time: dict) -> datetime:
+    """Convert the start or end object of a Google event to a UTC datetime object.
+
+    The offset in `dateTime` is used when present, `timeZone` is only needed for datetimes without one.
+
+    Args:
+    event_time (dict): Google event time, e.g. {"dateTime": "2024-01-01T10:00:00+05:30", "timeZone": "Asia/Kolkata"}
+
+    Returns:
+    datetime: Datetime object in UTC
+    """
+    date_time = event_time["dateTime"]
+
+    if date_time.endswith("Z") or date_time[-6] in "+-":
+        return parse_utc_datetime(date_time)
+
+    return convert_timezone_to_utc(date_time, event_time["timeZone"])
+
+
+def datetime_to_epoch(date_time: datetime) -> int:
+    """Convert a timezone aware datetime object to epoch seconds."""
+    return int(date_time.timestamp())
+
+
+def epoch_to_utc_datetime(epoch: int) -> datetime:
+    """Convert epoch seconds to a UTC datetime object."""
+    return datetime.fromtimestamp(epoch, pytz.utc)
 
 
 def convert_datetime_to_utc(date_time: datetime) -> datetime:
@@ -99,31 +127,6 @@ def utc_to_given_time_zone(utc_datetime: datetime, time_zone_offset: str) -> str
     return converted_datetime
 
 
-def compare_end_time_slots(current_slot, next_slot):
-    current_slot, next_slot = get_time_slots_utc(current_slot), get_time_slots_utc(next_slot)
-
-    if current_slot["start_time"] != next_slot["start_time"]:
-        return cmp_items(current_slot["start_time"], next_slot["start_time"])
-
-    return cmp_items(current_slot["end_time"], next_slot["end_time"])
-
-
-def get_time_slots_utc(slot):
-    return {
-        "start_time": get_datetime_str(convert_timezone_to_utc(slot["start"]["dateTime"], slot["start"]["timeZone"])),
-        "end_time": get_datetime_str(convert_timezone_to_utc(slot["end"]["dateTime"], slot["end"]["timeZone"])),
-    }
-
-
-def cmp_items(a, b):
-    if a > b:
-        return 1
-    elif a == b:
-        return 0
-    else:
-        return -1
-
-
 def get_date_start_end_time_for_given_timezone(date_str: str, timezone_offset: str):
     date = datetime.strptime(date_str, "%Y-%m-%d")
     timezone = pytz.FixedOffset(int(timezone_offset))
@@ -133,15 +136,6 @@ def get_date_start_end_time_for_given_timezone(date_str: str, timezone_offset: s
     return start_time, end_time
 
 
-def update_time_of_datetime(dt: datetime, new_time: timedelta):
-    total_seconds = new_time.total_seconds()
-    hours = int(total_seconds // 3600)
-    minutes = int((total_seconds % 3600) // 60)
-    seconds = int(total_seconds % 60)
-
-    return dt.replace(hour=hours, minute=minutes, second=seconds)
-
-
 def duration_to_string(duration):
     seconds = int(duration)
     minutes = seconds // 60
@@ -192,6 +192,13 @@ doc_events = {
         "on_cancel": "frappe_appointment.overrides.leave_application_override.on_cancel_and_on_trash",
         "on_trash": "frappe_appointment.overrides.leave_application_override.on_cancel_and_on_trash",
     },
+    "Holiday List": {  # Holiday List and Employee come with ERPNext, their hooks only run where it is installed
+        "on_update": "frappe_appointment.overrides.holiday_list_override.on_update_and_on_trash",
+        "on_trash": "frappe_appointment.overrides.holiday_list_override.on_update_and_on_trash",
+    },
+    "Employee": {
+        "on_update": "frappe_appointment.overrides.employee_override.on_update",
+    },
 }
 
 # Scheduled Tasks
@@ -201,13 +208,21 @@ scheduler_events = {
     # "all": [
     # 	"frappe_appointment.tasks.all"
     # ],
+    "cron": {
+        "*/2 * * * *": [
+            "frappe_appointment.frappe_appointment.doctype.google_calendar_mirror.google_calendar_mirror.sync_google_calendar_mirrors",
+        ],
+        "*/5 * * * *": [
+            "frappe_appointment.tasks.refresh_google_access_tokens.refresh_expiring_access_tokens",
+        ],
+    },
     "daily": [
         "frappe_appointment.tasks.reminder_google_calendar_auth.send_reminder_mail",
         "frappe_appointment.tasks.verify_availability.verify_appointment_group_members_availabililty",
     ],
-    # "hourly": [
-    # 	"frappe_appointment.tasks.hourly"
-    # ],
+    "hourly": [
+        "frappe_appointment.frappe_appointment.doctype.google_calendar_mirror.google_calendar_mirror.manage_google_calendar_watch_channels",
+    ],
     # "weekly": [
     # 	"frappe_appointment.tasks.weekly"
     # ],
@@ -4,7 +4,6 @@ from frappe.integrations.doctype.google_calendar.google_calendar import (
     format_date_according_to_google_calendar,
     get_attendees,
     get_conference_data,
-    get_google_calendar_object,
     insert_event_in_google_calendar,
     repeat_on_to_google_calendar_recurrence_rule,
 )
@@ -13,6 +12,9 @@ from frappe.utils import (
 )
 from googleapiclient.errors import HttpError
 
+from frappe_appointment.helpers.google_api_quota import execute_google_request
+from frappe_appointment.helpers.google_calendar import get_google_calendar_object
+
 
 def update_event_in_google_calendar_override(doc, method=None):
     """
@@ -38,10 +40,9 @@ def update_event_in_google_calendar_override(doc, method=None):
         return
 
     try:
-        event = (
-            google_calendar.events()
-            .get(calendarId=doc.google_calendar_id, eventId=doc.google_calendar_event_id)
-            .execute()
+        event = execute_google_request(
+            google_calendar.events().get(calendarId=doc.google_calendar_id, eventId=doc.google_calendar_event_id),
+            doc.google_calendar,
         )
 
         event["summary"] = doc.subject
@@ -71,16 +72,15 @@ def update_event_in_google_calendar_override(doc, method=None):
         else:
             event.update({"transparency": "opaque"})
 
-        event = (
-            google_calendar.events()
-            .update(
+        event = execute_google_request(
+            google_calendar.events().update(
                 calendarId=doc.google_calendar_id,
                 eventId=doc.google_calendar_event_id,
                 body=event,
                 conferenceDataVersion=conference_data_version,
                 sendUpdates="all",
-            )
-            .execute()
+            ),
+            doc.google_calendar,
         )
 
         # if add_video_conferencing enabled or disabled during update, overwrite
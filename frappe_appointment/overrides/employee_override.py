@@ -0,0 +1,8 @@
+from frappe_appointment.helpers.time_off import clear_member_time_off
+
+
+def on_update(doc, method=None):
+    # Leaves and holidays are cached per company email, see get_members_time_off
+    if doc.has_value_changed("company_email") or doc.has_value_changed("holiday_list"):
+        doc_before_save = doc.get_doc_before_save()
+        clear_member_time_off([doc.company_email, doc_before_save.company_email if doc_before_save else None])
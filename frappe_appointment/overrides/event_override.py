@@ -7,9 +7,6 @@ import frappe.utils
 import requests
 from frappe import _, clear_messages
 from frappe.desk.doctype.event.event import Event
-from frappe.integrations.doctype.google_calendar.google_calendar import (
-    get_google_calendar_object,
-)
 from frappe.twofactor import decrypt, encrypt
 from frappe.utils import get_datetime, now
 
@@ -22,8 +19,13 @@ from frappe_appointment.frappe_appointment.doctype.appointment_group.appointment
     is_valid_time_slots,
     vaild_date,
 )
+from frappe_appointment.frappe_appointment.doctype.appointment_time_slot.appointment_time_slot import (
+    get_member_calendars,
+)
+from frappe_appointment.helpers.busy_cache import invalidate_busy_cache
 from frappe_appointment.helpers.email import send_email_template_mail
 from frappe_appointment.helpers.google_calendar import (
+    get_google_calendar_object,
     insert_event_in_google_calendar_override,
 )
 from frappe_appointment.helpers.ics_file import add_ics_file_in_attachment
@@ -189,6 +191,7 @@ class EventOverride(Event):
                 self.appointment_group.event_creator if self.appointment_group else self.user_calendar.google_calendar,
                 meet_id,
             )
+        self.clear_busy_interval_cache()
         super().on_trash()
 
     @property
@@ -219,6 +222,36 @@ class EventOverride(Event):
     def on_update(self):
         self.sync_communication()  # Overrided this because we have made reference doctype and name non-mandatory in Event Participants
 
+        doc_before_save = self.get_doc_before_save()
+        if not doc_before_save:
+            self.clear_busy_interval_cache()
+        elif doc_before_save.starts_on != self.starts_on or doc_before_save.ends_on != self.ends_on:
+            self.clear_busy_interval_cache(doc_before_save)
+            self.clear_busy_interval_cache()
+
+    def clear_busy_interval_cache(self, event=None):
+        """Clear the cached busy intervals of all calendars the appointment blocks, for the days it takes place on
+
+        Args:
+        event (object, optional): Event whose time is used, e.g. the version before a reschedule. Defaults to self.
+        """
+        event = event or self
+
+        if self.custom_appointment_group:
+            appointment_group = frappe.get_doc(APPOINTMENT_GROUP, self.custom_appointment_group)
+            members = [member.user for member in appointment_group.members]
+            google_calendars = [self.google_calendar, appointment_group.event_creator]
+        elif self.custom_user_calendar:
+            members = [self.custom_user_calendar]
+            google_calendars = [self.google_calendar]
+        else:
+            return
+
+        for member in members:
+            google_calendars.extend(get_member_calendars(member))
+
+        invalidate_busy_cache(google_calendars, event.starts_on, event.ends_on)
+
     def sync_communication(self):
         if self.event_participants:
             for participant in self.event_participants:
@@ -4,6 +4,9 @@ from frappe.integrations.doctype.google_calendar.google_calendar import (
     authorize_access,
 )
 
+from frappe_appointment.helpers.circuit_breaker import record_calendar_success
+from frappe_appointment.helpers.google_access_token import clear_access_token
+
 
 class GoogleCalendarOverride(GoogleCalendar):
     """Google Calendar DocType overwrite"""
@@ -31,6 +34,9 @@ def google_callback(code=None):
     frappe.db.commit()
 
     authorize_access(google_calendar)
+    clear_access_token(google_calendar)
+    # A calendar cut off for a revoked token is tried again right after it was authorized again
+    record_calendar_success(google_calendar)
 
     refresh_token = frappe.get_value("Google Calendar", google_calendar, "refresh_token")
 
@@ -0,0 +1,5 @@
+from frappe_appointment.helpers.time_off import clear_all_time_off
+
+
+def on_update_and_on_trash(doc, method=None):
+    clear_all_time_off()
@@ -1,9 +1,11 @@
 import frappe
 
 from frappe_appointment.helpers.out_of_office import (
+    clear_employee_busy_cache,
     create_out_of_office_google_calander_event,
     delete_out_of_office_google_calendar_event,
 )
+from frappe_appointment.helpers.time_off import clear_employee_time_off
 
 
 def on_submit(doc, method=None):
@@ -13,6 +15,9 @@ def on_submit(doc, method=None):
     if "hrms" not in installed_apps:
         return
 
+    clear_employee_busy_cache(doc.employee, doc.from_date, doc.to_date)
+    clear_employee_time_off(doc.employee)
+
     if doc.status == "Approved":
         frappe.enqueue(
             create_out_of_office_google_calander_event,
@@ -31,6 +36,9 @@ def on_cancel_and_on_trash(doc, method=None):
     if "hrms" not in installed_apps:
         return
 
+    clear_employee_busy_cache(doc.employee, doc.from_date, doc.to_date)
+    clear_employee_time_off(doc.employee)
+
     frappe.enqueue(
         delete_out_of_office_google_calendar_event,
         queue="long",
@@ -5,4 +5,31 @@ frappe.ui.form.on("Google Calendar", {
       frm.tour.init({ tour_name }).then(() => frm.tour.start());
     }
   },
+  refresh(frm) {
+    if (frm.doc.__islocal) {
+      return;
+    }
+
+    frappe.call({
+      method: "frappe_appointment.api.google_calendar.get_calendar_circuit_states",
+      args: {
+        google_calendars: [frm.doc.name],
+      },
+      callback: function (r) {
+        const circuit = r.message?.[frm.doc.name];
+        if (!circuit || circuit.state === "Closed") {
+          return;
+        }
+
+        frm.dashboard.set_headline_alert(
+          __("Requests to this calendar are failing and are skipped ({0}), next attempt in {1} seconds. Last error: {2}", [
+            circuit.state,
+            circuit.retry_in || 0,
+            circuit.last_error,
+          ]),
+          "red"
+        );
+      },
+    });
+  },
 });
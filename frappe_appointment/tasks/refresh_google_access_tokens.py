@@ -0,0 +1,31 @@
+import time
+
+import frappe
+
+from frappe_appointment.helpers.google_access_token import get_cached_access_token, refresh_access_token
+
+# The job runs every five minutes, so tokens are refreshed a few runs before they would be handed out no more
+ACCESS_TOKEN_REFRESH_BEFORE = 15 * 60
+
+
+def refresh_expiring_access_tokens():
+    """Refresh the access tokens of all authorized Google Calendars which are not cached or expire soon."""
+    google_calendars = frappe.get_all(
+        "Google Calendar", filters={"enable": 1, "custom_is_google_calendar_authorized": 1}, pluck="name"
+    )
+
+    for google_calendar in google_calendars:
+        access_token = get_cached_access_token(google_calendar)
+
+        if access_token and access_token["expires_at"] - ACCESS_TOKEN_REFRESH_BEFORE > time.time():
+            continue
+
+        try:
+            refresh_access_token(frappe.get_doc("Google Calendar", google_calendar))
+        except Exception:
+            frappe.log_error(
+                title="refresh_google_calendar_access_token_failed",
+                message=frappe.get_traceback(),
+                reference_doctype="Google Calendar",
+                reference_name=google_calendar,
+            )
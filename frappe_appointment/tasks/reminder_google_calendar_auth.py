@@ -1,6 +1,7 @@
 import frappe
 
 from frappe_appointment.helpers.email import send_email_template_mail
+from frappe_appointment.helpers.google_access_token import refresh_access_token
 from frappe_appointment.patches.v0_1.reminder_google_calendar_auth_email_template import (
     GOOGLE_CALENDAR_AUTH_EMAIL_TEMPLATE,
 )
@@ -44,9 +45,10 @@ def google_calendar_authorized(google_calendar: object):
         return False
 
     try:
+        # A cached access token stays valid after the refresh token was revoked, so Google is asked for a new one.
         # The given function will throw error in case refresh_toke is invalid
-        token = google_calendar.get_access_token()
-        if not token or token is None:
+        access_token = refresh_access_token(google_calendar)
+        if not access_token or not access_token.get("access_token"):
             return False
         return True
     except Exception:
@@ -0,0 +1,136 @@
+"""Fakes of the Google API client objects the calendar fetches work with, shared by the tests of the app."""
+
+from typing import ClassVar
+
+import frappe
+from googleapiclient.errors import HttpError
+from googleapiclient.http import DEFAULT_HTTP_TIMEOUT_SEC
+
+
+class FakeSocket:
+    def __init__(self, timeout):
+        self.timeout = timeout
+
+    def settimeout(self, timeout):
+        self.timeout = timeout
+
+
+class FakeConnection:
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.sock = FakeSocket(timeout)
+
+
+class FakeHttp:
+    """httplib2.Http with an open connection, the way a pooled client keeps it between requests."""
+
+    def __init__(self, timeout=DEFAULT_HTTP_TIMEOUT_SEC):
+        self.timeout = timeout
+        self.connections = {"https:www.googleapis.com": FakeConnection(timeout)}
+
+    @property
+    def sock(self):
+        return self.connections["https:www.googleapis.com"].sock
+
+
+class FakeAuthorizedHttp:
+    def __init__(self, http=None):
+        self.http = http or FakeHttp()
+        self.credentials = None
+
+
+class FakeGoogleRequest:
+    """googleapiclient HttpRequest that records the socket timeout it was sent with."""
+
+    def __init__(self, http, response=None, error=None, execute=None):
+        self.http = http
+        self.methodId = "calendar.events.list"
+        self.headers = {}
+        self.response = response
+        self.error = error
+        self.socket_timeouts = []
+        self._execute = execute
+
+    def execute(self):
+        self.socket_timeouts.append(self.http.http.sock.timeout)
+
+        if self._execute:
+            self._execute()
+
+        if self.error:
+            raise self.error
+
+        return self.response
+
+
+class FakeBatchHttpRequest:
+    """googleapiclient BatchHttpRequest that answers every request with its own callback, in one round trip."""
+
+    sizes: ClassVar[list] = []
+
+    def __init__(self, callback, batch_uri):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, google_request, request_id):
+        self.requests.append((request_id, google_request))
+
+    def execute(self):
+        FakeBatchHttpRequest.sizes.append(len(self.requests))
+
+        if any(google_request.methodId == "batch.fails" for _request_id, google_request in self.requests):
+            raise ConnectionError("Batch request failed")
+
+        for request_id, google_request in self.requests:
+            response, err = None, None
+
+            try:
+                response = google_request.execute()
+            except Exception as exception:
+                err = exception
+
+            self.callback(request_id, response, err)
+
+
+class FakeEventsRequest(FakeGoogleRequest):
+    """events().list() request of FakeEventsAPI, answered by its sync token when it is executed."""
+
+    def __init__(self, events_api, params):
+        super().__init__(FakeAuthorizedHttp())
+        self.events_api = events_api
+        self.params = params
+
+    def execute(self):
+        response = self.events_api.responses[self.params.get("syncToken")]
+
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+
+class FakeEventsAPI:
+    """events() resource of a Google Calendar API client, answering listings by their sync token."""
+
+    def __init__(self, responses: dict):
+        self.responses = responses
+        self.calls = []
+
+    def events(self):
+        return self
+
+    def list(self, **params):
+        self.calls.append(params)
+        return FakeEventsRequest(self, params)
+
+    def list_next(self, request, response):
+        return None
+
+
+def get_http_error(status: int, retry_after: str | None = None) -> HttpError:
+    resp = frappe._dict(status=status, reason="")
+
+    if retry_after:
+        resp["retry-after"] = retry_after
+
+    return HttpError(resp, b"")